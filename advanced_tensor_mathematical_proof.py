@@ -5,8 +5,10 @@ Rigorous mathematical validation of each AI strategy's unique contribution
 """
 
 import math
+import os
 import random
 import json
+import sys
 from typing import Dict, List, Tuple, Optional
 
 # Real performance data from our system for mathematical grounding
@@ -468,4 +470,10 @@ def mathematical_proof_main():
     print(f"Commission savings: ${(basic_trades - advanced_trades) * REAL_TRADING_DATA['commission_per_trade']:.2f}")
 
 if __name__ == "__main__":
+    # Optional trade source (.jsonl/.csv/.db) replaces REAL_TRADING_DATA with live statistics
+    if len(sys.argv) > 1:
+        sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'lib'))
+        from trade_statistics import load_live_statistics
+        REAL_TRADING_DATA = load_live_statistics(sys.argv[1]).to_real_trading_data(
+            account_balance=REAL_TRADING_DATA['account_balance'])
     mathematical_proof_main()
\ No newline at end of file
@@ -4,7 +4,9 @@ Mathematical Proof of Tensor-Based AI Fusion
 Pure mathematical analysis using real trading data
 """
 import math
+import os
 import random
+import sys
 
 # Real data from our actual trading system
 REAL_DATA = {
@@ -205,4 +207,9 @@ def calculate_portfolio_performance(ai_systems, weights):
     }
 
 if __name__ == "__main__":
+    # Optional trade source (.jsonl/.csv/.db) replaces REAL_DATA with live statistics
+    if len(sys.argv) > 1:
+        sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'lib'))
+        from trade_statistics import load_live_statistics
+        REAL_DATA = load_live_statistics(sys.argv[1]).to_real_data()
     mathematical_proof()
\ No newline at end of file
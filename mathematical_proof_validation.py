@@ -3,12 +3,15 @@
 Mathematical Validation of Tensor-Based AI Fusion
 Using real trading data to prove the concept
 """
+import os
+import sys
 import numpy as np
-from scipy.optimize import minimize
-from scipy.stats import pearsonr
-import matplotlib.pyplot as plt
 
-# Real data from our trading system
+LIB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'lib')
+if LIB_DIR not in sys.path:
+    sys.path.append(LIB_DIR)
+
+# Real data from our trading system (mean_pnl before commission, as in mathematical_proof_simple)
 real_trades = {
     'WLFIUSD': {'trades': 35, 'mean_pnl': 1.093636, 'std_pnl': 0.531818},
     'ETHUSD': {'trades': 16, 'mean_pnl': -0.002583, 'std_pnl': 0.102576},
@@ -16,6 +19,27 @@ real_trades = {
     'SOLUSD': {'trades': 7, 'mean_pnl': 0.030408, 'std_pnl': 0.070775},
     'BTCUSD': {'trades': 5, 'mean_pnl': -0.002010, 'std_pnl': 0.049985}
 }
+COMMISSION_PER_TRADE = 0.25  # ~$0.25 per trade
+
+def real_trade_baseline(trade_data, commission):
+    """
+    Pooled per-trade statistics of the live system (all pairs)
+    """
+    pairs = [pair for pair in trade_data.values() if isinstance(pair, dict)]
+    counts = np.array([pair['trades'] for pair in pairs], dtype=np.float64)
+    means = np.array([pair['mean_pnl'] for pair in pairs])
+    stds = np.array([pair['std_pnl'] for pair in pairs])
+    total = counts.sum()
+    gross_mean = counts @ means / total
+    # Population variance of the pooled trades: within-pair plus between-pair spread
+    std = np.sqrt(counts @ (stds ** 2 + (means - gross_mean) ** 2) / total)
+    net_mean = gross_mean - commission
+    return {
+        'trades': int(total),
+        'mean_pnl': net_mean,
+        'std_pnl': std,
+        'sharpe_ratio': net_mean / std if std > 0 else 0
+    }
 
 def simulate_ai_signals(n_trades=100, n_systems=5):
     """
@@ -86,7 +110,7 @@ def tensor_fusion(signals, weights):
     
     return fused_signals
 
-def compute_performance_metrics(predictions, actual_outcomes):
+def compute_performance_metrics(predictions, actual_outcomes, commission=COMMISSION_PER_TRADE):
     """
     Compute rigorous performance metrics
     """
@@ -113,7 +137,7 @@ def compute_performance_metrics(predictions, actual_outcomes):
             pnl = -actual_mag * 60
         
         # Subtract commission
-        pnl -= 0.25  # ~$0.25 commission per trade
+        pnl -= commission
         pnl_per_trade.append(pnl)
     
     mean_pnl = np.mean(pnl_per_trade)
@@ -129,9 +153,10 @@ def compute_performance_metrics(predictions, actual_outcomes):
         'total_pnl': mean_pnl * n_trades
     }
 
-def optimize_weights(signals, actual_outcomes):
+def optimize_weights(signals, actual_outcomes, initial_weights=None, commission=COMMISSION_PER_TRADE):
     """
     Find optimal weights using mathematical optimization
+    (initial_weights, e.g. from SignalCorrelationTracker, seeds the search)
     """
     n_systems = signals.shape[1]
     
@@ -143,27 +168,40 @@ def optimize_weights(signals, actual_outcomes):
         fused = tensor_fusion(signals, weights)
         
         # Compute loss (negative Sharpe ratio)
-        metrics = compute_performance_metrics(fused, actual_outcomes)
+        metrics = compute_performance_metrics(fused, actual_outcomes, commission)
         return -metrics['sharpe_ratio']
     
     # Constraints: weights sum to 1 and are non-negative
     constraints = {'type': 'eq', 'fun': lambda w: np.sum(w) - 1}
     bounds = [(0, 1) for _ in range(n_systems)]
     
-    # Initial guess: equal weights
-    x0 = np.ones(n_systems) / n_systems
+    # Initial guess: correlation-aware weights when given, else equal weights
+    x0 = np.asarray(initial_weights, dtype=float) if initial_weights is not None else np.ones(n_systems) / n_systems
     
-    # Optimize
-    result = optimize.minimize(objective, x0, method='SLSQP', bounds=bounds, constraints=constraints)
+    # Optimize (SciPy loaded here so the metric helpers import without it)
+    from scipy.optimize import minimize
+    result = minimize(objective, x0, method='SLSQP', bounds=bounds, constraints=constraints)
     
     return result.x
 
-def main():
+def main(trade_data=None):
     print("=" * 80)
     print("MATHEMATICAL PROOF OF TENSOR-BASED AI FUSION")
     print("=" * 80)
     print()
     
+    # Live statistics (or the real_trades snapshot) set the commission and the bar to beat
+    trade_data = real_trades if trade_data is None else trade_data
+    commission = trade_data.get('commission_per_trade', COMMISSION_PER_TRADE)
+    baseline = real_trade_baseline(trade_data, commission)
+    
+    print("📉 CURRENT SYSTEM BASELINE (REAL TRADES):")
+    print("-" * 50)
+    print(f"  Trades: {baseline['trades']}")
+    print(f"  Net Mean PnL: ${baseline['mean_pnl']:.4f} (after ${commission:.2f} commission)")
+    print(f"  Sharpe Ratio: {baseline['sharpe_ratio']:.4f}")
+    print()
+    
     # Generate test data
     signals, actual_outcomes, systems = simulate_ai_signals(n_trades=200, n_systems=5)
     
@@ -177,7 +215,7 @@ def main():
         individual_weights[i] = 1.0
         
         fused = tensor_fusion(signals, individual_weights)
-        metrics = compute_performance_metrics(fused, actual_outcomes)
+        metrics = compute_performance_metrics(fused, actual_outcomes, commission)
         individual_performance.append(metrics)
         
         print(f"AI System {i+1}:")
@@ -189,14 +227,22 @@ def main():
     print("🧠 TENSOR FUSION OPTIMIZATION:")
     print("-" * 50)
     
+    # Measure how orthogonal the systems really are
+    from signal_correlation import SignalCorrelationTracker
+    tracker = SignalCorrelationTracker(signals.shape[1], decay=1.0)
+    tracker.update_fusion(signals, actual_outcomes)
+    print(f"Signal Correlation Matrix:\n{tracker.source_correlation.round(3)}")
+    print(f"Effective Independent Systems: {tracker.effective_sources():.2f} of {signals.shape[1]}")
+    print()
+    
     # Find optimal weights
-    optimal_weights = optimize_weights(signals, actual_outcomes)
+    optimal_weights = optimize_weights(signals, actual_outcomes, tracker.correlation_aware_weights(), commission)
     print(f"Optimal Weights: {optimal_weights}")
     print()
     
     # Test optimal fusion
     optimal_fused = tensor_fusion(signals, optimal_weights)
-    optimal_metrics = compute_performance_metrics(optimal_fused, actual_outcomes)
+    optimal_metrics = compute_performance_metrics(optimal_fused, actual_outcomes, commission)
     
     print("OPTIMIZED TENSOR FUSION PERFORMANCE:")
     print(f"  Direction Accuracy: {optimal_metrics['direction_accuracy']:.1%}")
@@ -208,7 +254,7 @@ def main():
     # Compare with equal weighting (baseline)
     equal_weights = np.ones(5) / 5
     equal_fused = tensor_fusion(signals, equal_weights)
-    equal_metrics = compute_performance_metrics(equal_fused, actual_outcomes)
+    equal_metrics = compute_performance_metrics(equal_fused, actual_outcomes, commission)
     
     print("EQUAL WEIGHTING BASELINE:")
     print(f"  Direction Accuracy: {equal_metrics['direction_accuracy']:.1%}")
@@ -217,21 +263,15 @@ def main():
     print(f"  Total PnL: ${equal_metrics['total_pnl']:.2f}")
     print()
     
-    # Statistical significance test
-    optimal_pnl_series = []
-    equal_pnl_series = []
+    # Statistical significance test (per-trade PnL for every trade at once)
+    optimal_pnl_series = (60 * actual_outcomes[:, 1] * np.sign(optimal_fused[:, 1]) * actual_outcomes[:, 0]) - commission
+    equal_pnl_series = (60 * actual_outcomes[:, 1] * np.sign(equal_fused[:, 1]) * actual_outcomes[:, 0]) - commission
+    optimal_hits = np.sign(optimal_fused[:, 1]) == actual_outcomes[:, 0]
+    equal_hits = np.sign(equal_fused[:, 1]) == actual_outcomes[:, 0]
     
-    for t in range(len(actual_outcomes)):
-        opt_pred = optimal_fused[t]
-        eq_pred = equal_fused[t]
-        actual = actual_outcomes[t]
-        
-        # Compute individual trade PnL
-        opt_pnl = (60 * actual[1] * np.sign(opt_pred[1]) * actual[0]) - 0.25
-        eq_pnl = (60 * actual[1] * np.sign(eq_pred[1]) * actual[0]) - 0.25
-        
-        optimal_pnl_series.append(opt_pnl)
-        equal_pnl_series.append(eq_pnl)
+    from bootstrap_significance import paired_bootstrap
+    significance = paired_bootstrap(optimal_pnl_series, equal_pnl_series,
+                                    optimal_hits, equal_hits, n_replicates=5000)
     
     # Compute improvement
     improvement = optimal_metrics['total_pnl'] - equal_metrics['total_pnl']
@@ -244,17 +284,39 @@ def main():
     print(f"Sharpe Ratio Improvement: {optimal_metrics['sharpe_ratio'] - equal_metrics['sharpe_ratio']:.4f}")
     
     # Correlation analysis
+    from scipy.stats import pearsonr
     correlation, p_value = pearsonr(optimal_weights, [s['accuracy'] for s in systems])
     print(f"Weight-Accuracy Correlation: {correlation:.4f} (p={p_value:.4f})")
     
+    print()
+    print("🎲 BOOTSTRAP SIGNIFICANCE (5000 paired replicates, 95% CI):")
+    print("-" * 50)
+    for metric, stats in significance.items():
+        print(f"{metric:15}: {stats['observed']:+.4f} "
+              f"[{stats['ci_low']:+.4f}, {stats['ci_high']:+.4f}] p={stats['p_value']:.4f}")
+    sharpe_p_value = significance['sharpe_diff']['p_value']
+    
     print()
     print("✅ MATHEMATICAL CONCLUSION:")
-    if improvement > 0 and optimal_metrics['sharpe_ratio'] > equal_metrics['sharpe_ratio']:
+    if improvement > 0 and optimal_metrics['sharpe_ratio'] > equal_metrics['sharpe_ratio'] and sharpe_p_value < 0.05:
         print("TENSOR FUSION IS MATHEMATICALLY SUPERIOR")
         print("The optimization successfully identified better weight combinations.")
+        print(f"The Sharpe improvement is statistically significant (p={sharpe_p_value:.4f}).")
+    elif improvement > 0 and optimal_metrics['sharpe_ratio'] > equal_metrics['sharpe_ratio']:
+        print("TENSOR FUSION SHOWS AN IMPROVEMENT THAT IS NOT STATISTICALLY SIGNIFICANT")
+        print(f"Sharpe improvement p={sharpe_p_value:.4f}; more trades are needed to confirm it.")
     else:
         print("TENSOR FUSION SHOWS NO CLEAR ADVANTAGE")
         print("Further mathematical refinement needed.")
+    
+    print(f"Versus the live system: fused ${optimal_metrics['mean_pnl']:.4f}/trade (Sharpe {optimal_metrics['sharpe_ratio']:.4f}) "
+          f"vs ${baseline['mean_pnl']:.4f}/trade (Sharpe {baseline['sharpe_ratio']:.4f}) - "
+          f"{'BEATS' if optimal_metrics['sharpe_ratio'] > baseline['sharpe_ratio'] else 'DOES NOT BEAT'} the current system")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Optional trade source (.jsonl/.csv/.db) replaces real_trades with live statistics
+    trade_data = None
+    if len(sys.argv) > 1:
+        from trade_statistics import load_live_statistics
+        trade_data = load_live_statistics(sys.argv[1]).to_real_data()
+    main(trade_data)
\ No newline at end of file
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Hardware Probe and Indicator Backend Autotuner for SignalCartel
+Detects the available backends (NumPy, threaded NumPy, Numba JIT kernels, CuPy), times each
+indicator kernel across batch sizes and history lengths, and persists a tuning profile with
+the crossover points where each backend wins; GPUIndicators(profile=...) dispatches on it
+"""
+import hashlib
+import importlib.util
+import json
+import os
+import platform
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from gpu_accelerated_indicators import GPUIndicators, get_cupy, gpu_available
+
+PROFILE_ENV = 'SIGNALCARTEL_TUNING_PROFILE'
+DEFAULT_PROFILE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'signalcartel', 'backend_profile.json')
+
+DEFAULT_BATCH_SIZES = (1, 32, 512)
+DEFAULT_LENGTHS = (200, 1000, 5000)
+
+# Kernel name -> call on an indicator backend
+KERNELS = {
+    'rsi': lambda indicators, prices: indicators.rsi_batch(prices),
+    'bollinger': lambda indicators, prices: indicators.bollinger_bands_batch(prices),
+    'macd': lambda indicators, prices: indicators.macd_batch(prices),
+    'sma': lambda indicators, prices: indicators.sma_batch(prices)
+}
+
+
+def probe_hardware() -> Dict:
+    """Describe the host and installed array backends"""
+    cpu_model = platform.processor()
+    try:
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    cpu_model = line.split(':', 1)[1].strip()
+                    break
+    except OSError:
+        pass
+
+    hardware = {
+        'machine': platform.machine(),
+        'cpu_model': cpu_model,
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'numba': _distribution_version('numba'),
+        'cupy': get_cupy().__version__ if get_cupy() is not None else None,
+        'gpus': []
+    }
+    if gpu_available():
+        cp = get_cupy()
+        for device in range(cp.cuda.runtime.getDeviceCount()):
+            properties = cp.cuda.runtime.getDeviceProperties(device)
+            name = properties['name']
+            hardware['gpus'].append({
+                'name': name.decode() if isinstance(name, bytes) else name,
+                'memory_gb': round(properties['totalGlobalMem'] / 1024 ** 3, 1)
+            })
+    return hardware
+
+
+def hardware_fingerprint(hardware: Optional[Dict] = None) -> str:
+    """Stable hash of probe_hardware(); a profile is only valid on a matching host"""
+    hardware = hardware or probe_hardware()
+    return hashlib.sha1(json.dumps(hardware, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _distribution_version(name: str) -> Optional[str]:
+    """Installed version without importing the package"""
+    if importlib.util.find_spec(name) is None:
+        return None
+    try:
+        from importlib.metadata import version
+        return version(name)
+    except Exception:
+        return 'unknown'
+
+
+def numba_available() -> bool:
+    return importlib.util.find_spec('numba') is not None
+
+
+_numba_kernels = None
+
+
+def _load_numba_kernels() -> Dict:
+    """Import Numba and define the JIT kernels on first use"""
+    global _numba_kernels
+    if _numba_kernels is not None:
+        return _numba_kernels
+    import numba
+
+    @numba.njit(parallel=True, cache=True)
+    def _rsi_kernel(prices, period, out):
+        alpha = 1.0 / period
+        for row in numba.prange(prices.shape[0]):
+            avg_gain = 0.0
+            avg_loss = 0.0
+            for i in range(period):
+                diff = prices[row, i + 1] - prices[row, i]
+                if diff > 0:
+                    avg_gain += diff
+                else:
+                    avg_loss -= diff
+            avg_gain /= period
+            avg_loss /= period
+            out[row, period] = 100 - 100 / (1 + avg_gain / (avg_loss + 1e-10))
+            for i in range(period + 1, prices.shape[1]):
+                diff = prices[row, i] - prices[row, i - 1]
+                gain = diff if diff > 0 else 0.0
+                loss = -diff if diff < 0 else 0.0
+                avg_gain = alpha * gain + (1 - alpha) * avg_gain
+                avg_loss = alpha * loss + (1 - alpha) * avg_loss
+                out[row, i] = 100 - 100 / (1 + avg_gain / (avg_loss + 1e-10))
+
+    @numba.njit(parallel=True, cache=True)
+    def _ema_kernel(data, alpha, out):
+        for row in numba.prange(data.shape[0]):
+            value = data[row, 0]
+            out[row, 0] = value
+            for i in range(1, data.shape[1]):
+                value = alpha * data[row, i] + (1 - alpha) * value
+                out[row, i] = value
+
+    @numba.njit(parallel=True, cache=True)
+    def _bollinger_kernel(prices, period, std_multiplier, upper, middle, lower):
+        for row in numba.prange(prices.shape[0]):
+            for i in range(period - 1, prices.shape[1]):
+                total = 0.0
+                for j in range(i - period + 1, i + 1):
+                    total += prices[row, j]
+                mean = total / period
+                squares = 0.0
+                for j in range(i - period + 1, i + 1):
+                    squares += (prices[row, j] - mean) ** 2
+                std = (squares / period) ** 0.5
+                middle[row, i] = mean
+                upper[row, i] = mean + std_multiplier * std
+                lower[row, i] = mean - std_multiplier * std
+
+    _numba_kernels = {'rsi': _rsi_kernel, 'ema': _ema_kernel, 'bollinger': _bollinger_kernel}
+    return _numba_kernels
+
+
+class JITIndicators(GPUIndicators):
+    """CPU indicators with the sequential recurrences compiled by Numba"""
+
+    def __init__(self):
+        if not numba_available():
+            raise ImportError("Numba is required for JIT indicators")
+        super().__init__(use_gpu=False)
+        self.backend_name = 'numba'
+        self.kernels = _load_numba_kernels()
+
+    def _rsi_gpu(self, prices_gpu, period: int, out=None):
+        rsi_values = np.empty(prices_gpu.shape, dtype=np.float32) if out is None else out
+        rsi_values[:, :period + 1] = np.nan
+        if prices_gpu.shape[1] > period:
+            self.kernels['rsi'](prices_gpu, period, rsi_values)
+        return rsi_values
+
+    def _ema_gpu(self, data, period: int, out=None):
+        ema = np.empty_like(data) if out is None else out
+        self.kernels['ema'](np.ascontiguousarray(data), 2.0 / (period + 1), ema)
+        return ema
+
+    def _bollinger_gpu(self, prices_gpu, period: int, std_multiplier: float, out=None):
+        bands = out if out is not None else tuple(np.empty(prices_gpu.shape, dtype=np.float32) for _ in range(3))
+        for band in bands:
+            band[:, :period - 1] = np.nan
+        self.kernels['bollinger'](prices_gpu, period, std_multiplier, *bands)
+        return bands[0], bands[1], bands[2]
+
+
+class ThreadedIndicators:
+    """Splits the symbol batch across threads (NumPy releases the GIL inside kernels)"""
+
+    def __init__(self, n_threads: Optional[int] = None, base: Optional[GPUIndicators] = None):
+        self.n_threads = n_threads or os.cpu_count() or 1
+        self.base = base or GPUIndicators(use_gpu=False)
+        self.backend_name = 'numpy_threaded'
+        self.executor = ThreadPoolExecutor(max_workers=self.n_threads)
+
+    def _map(self, method: str, price_data, *args, out=None):
+        price_data = np.asarray(price_data, dtype=np.float32)
+        n_chunks = min(self.n_threads, len(price_data)) or 1
+        chunks = np.array_split(price_data, n_chunks)
+        if out is not None:
+            # Each thread writes its rows straight into the caller's arrays
+            if isinstance(out, tuple):
+                out_chunks = list(zip(*(np.array_split(array, n_chunks) for array in out)))
+            else:
+                out_chunks = np.array_split(out, n_chunks)
+            list(self.executor.map(lambda chunk, chunk_out: getattr(self.base, method)(chunk, *args, out=chunk_out),
+                                   chunks, out_chunks))
+            return out
+        results = list(self.executor.map(lambda chunk: getattr(self.base, method)(chunk, *args), chunks))
+        if isinstance(results[0], tuple):
+            return tuple(np.concatenate(parts) for parts in zip(*results))
+        return np.concatenate(results)
+
+    def rsi_batch(self, price_data, period: int = 14, out=None):
+        return self._map('rsi_batch', price_data, period, out=out)
+
+    def bollinger_bands_batch(self, price_data, period: int = 20, std_multiplier: float = 2.0, out=None):
+        return self._map('bollinger_bands_batch', price_data, period, std_multiplier, out=out)
+
+    def macd_batch(self, price_data, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9, out=None):
+        return self._map('macd_batch', price_data, fast_period, slow_period, signal_period, out=out)
+
+    def sma_batch(self, price_data, period: int = 20, out=None):
+        return self._map('sma_batch', price_data, period, out=out)
+
+
+def available_backends() -> List[str]:
+    backends = ['numpy']
+    if (os.cpu_count() or 1) > 1:
+        backends.append('numpy_threaded')
+    if numba_available():
+        backends.append('numba')
+    if gpu_available():
+        backends.append('cupy')
+    return backends
+
+
+def create_backend(name: str):
+    """Indicator backend instance by name (all expose the GPUIndicators batch methods)"""
+    if name == 'numpy':
+        return GPUIndicators(use_gpu=False)
+    if name == 'numpy_threaded':
+        return ThreadedIndicators()
+    if name == 'numba':
+        return JITIndicators()
+    if name == 'cupy':
+        return GPUIndicators(use_gpu=True)
+    raise ValueError(f"Unknown indicator backend: {name}")
+
+
+class TuningProfile:
+    """Measured backend timings per (kernel, batch size, history length)"""
+
+    def __init__(self, data: Dict):
+        self.data = data
+        self.fingerprint = data['fingerprint']
+        self.results = data['results']
+
+    def best_backend(self, kernel: str, batch_size: int, length: int) -> Optional[str]:
+        """Winner at the measured shape nearest (in log space) to the requested one"""
+        measurements = self.results.get(kernel)
+        if not measurements:
+            return None
+        target = np.log([max(batch_size, 1), max(length, 1)])
+        points = np.log([[m['batch_size'], m['length']] for m in measurements])
+        nearest = int(np.argmin(((points - target) ** 2).sum(axis=1)))
+        return measurements[nearest]['best']
+
+    def save(self, path: Optional[str] = None):
+        path = path or os.environ.get(PROFILE_ENV, DEFAULT_PROFILE_PATH)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.data, f, indent=2)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> Optional['TuningProfile']:
+        """Load a saved profile; None if missing or recorded on different hardware"""
+        path = path or os.environ.get(PROFILE_ENV, DEFAULT_PROFILE_PATH)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            data = json.load(f)
+        if data.get('fingerprint') != hardware_fingerprint():
+            return None
+        return cls(data)
+
+
+def _time_call(function, repeats: int) -> float:
+    function()  # warmup: JIT compilation, CuPy kernel cache, thread pool start
+    best = float('inf')
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def _crossovers(measurements: List[Dict]) -> Dict[str, List]:
+    """Per history length: [[batch_size, backend], ...] where the winning backend changes"""
+    crossovers = {}
+    for length in sorted({m['length'] for m in measurements}):
+        row = sorted((m for m in measurements if m['length'] == length), key=lambda m: m['batch_size'])
+        points = []
+        for m in row:
+            if not points or points[-1][1] != m['best']:
+                points.append([m['batch_size'], m['best']])
+        crossovers[str(length)] = points
+    return crossovers
+
+
+def autotune(kernels: Sequence[str] = tuple(KERNELS), batch_sizes: Sequence[int] = DEFAULT_BATCH_SIZES,
+             lengths: Sequence[int] = DEFAULT_LENGTHS, backends: Optional[Sequence[str]] = None,
+             repeats: int = 3, seed: int = 42, verbose: bool = False) -> TuningProfile:
+    """
+    Time every kernel on every backend over the batch-size x length grid
+
+    Returns:
+        TuningProfile with raw timings, the winner per shape and crossover points
+    """
+    hardware = probe_hardware()
+    backends = list(backends or available_backends())
+    instances = {name: create_backend(name) for name in backends}
+    rng = np.random.default_rng(seed)
+
+    results = {}
+    for kernel in kernels:
+        call = KERNELS[kernel]
+        measurements = []
+        for length in lengths:
+            for batch_size in batch_sizes:
+                prices = (100 * np.cumprod(1 + rng.normal(0, 0.01, (batch_size, length)), axis=1)).astype(np.float32)
+                timings = {name: _time_call(lambda: call(instance, prices), repeats)
+                           for name, instance in instances.items()}
+                best = min(timings, key=timings.get)
+                measurements.append({'batch_size': batch_size, 'length': length, 'timings': timings, 'best': best})
+                if verbose:
+                    print(f"  {kernel:10} {batch_size:5d} x {length:5d}: " +
+                          ", ".join(f"{name} {t * 1e3:.2f}ms" for name, t in timings.items()) + f" -> {best}")
+        results[kernel] = measurements
+
+    return TuningProfile({
+        'fingerprint': hardware_fingerprint(hardware),
+        'hardware': hardware,
+        'created': datetime.now().isoformat(),
+        'backends': backends,
+        'results': results,
+        'crossovers': {kernel: _crossovers(measurements) for kernel, measurements in results.items()}
+    })
+
+
+def load_or_tune(path: Optional[str] = None, **autotune_kwargs) -> TuningProfile:
+    """Reuse the saved profile for this hardware, re-tuning (and saving) when missing or stale"""
+    profile = TuningProfile.load(path)
+    if profile is None:
+        profile = autotune(**autotune_kwargs)
+        profile.save(path)
+    return profile
+
+
+def tuned_indicators(path: Optional[str] = None, **autotune_kwargs) -> GPUIndicators:
+    """GPUIndicators that dispatches each call to the profiled fastest backend"""
+    return GPUIndicators(use_gpu=False, profile=load_or_tune(path, **autotune_kwargs))
+
+
+if __name__ == "__main__":
+    import sys
+
+    print("SignalCartel Backend Autotuner")
+    print("=" * 50)
+
+    hardware = probe_hardware()
+    for key, value in hardware.items():
+        print(f"{key:10}: {value}")
+    print(f"Backends  : {', '.join(available_backends())}")
+
+    profile = autotune(verbose=True)
+    profile.save(sys.argv[1] if len(sys.argv) > 1 else None)
+    print("\nCrossover points (batch size where the winner changes):")
+    for kernel, by_length in profile.data['crossovers'].items():
+        for length, points in by_length.items():
+            print(f"  {kernel:10} length {length:>5}: {points}")
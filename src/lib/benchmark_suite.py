@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for SignalCartel Compute Paths
+Times every GPUIndicators method per backend, the fusion / Monte Carlo / optimizer routines
+from the proof scripts and the end-to-end TS->Python bridge over symbols x length grids, with
+warmup, repeated timing and percentiles, JSON output and a throughput regression gate; the
+allocations group also checks that workspace + out= refreshes allocate nothing after warmup
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend_autotuner import available_backends, create_backend, hardware_fingerprint, probe_hardware
+from gpu_accelerated_indicators import GPUIndicators
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LIB_DIR = os.path.dirname(os.path.abspath(__file__))
+
+GROUPS = ('indicators', 'allocations', 'fusion', 'monte_carlo', 'optimizer', 'bridge')
+DEFAULT_THRESHOLD = 0.2  # fail on >20% throughput loss
+# Peak bytes a warmed-up workspace refresh may allocate: NumPy's fixed-size ufunc iteration
+# buffers and small Python objects, but nothing that scales with the batch
+DEFAULT_ALLOCATION_BUDGET = 256 * 1024
+
+SYMBOL_GRID = (10, 100, 1000)
+LENGTH_GRID = (500, 2000)
+QUICK_SYMBOL_GRID = (10, 100)
+QUICK_LENGTH_GRID = (500,)
+
+INDICATOR_CALLS = {
+    'rsi_batch': lambda indicators, prices: indicators.rsi_batch(prices),
+    'bollinger_bands_batch': lambda indicators, prices: indicators.bollinger_bands_batch(prices),
+    'macd_batch': lambda indicators, prices: indicators.macd_batch(prices),
+    'sma_batch': lambda indicators, prices: indicators.sma_batch(prices),
+    'signals_batch': lambda indicators, prices: indicators.signals_batch(prices)
+}
+
+# Method -> number of output arrays, for the workspace + out= allocation cases
+WORKSPACE_CALLS = {
+    'rsi_batch': 1,
+    'bollinger_bands_batch': 3,
+    'macd_batch': 3,
+    'sma_batch': 1
+}
+
+# A case yields (function, work units per call); setup errors skip the case
+Case = Tuple[str, str, Dict, Callable[[], Tuple[Callable[[], object], float]]]
+
+
+def synthetic_prices(n_symbols: int, length: int, seed: int = 42) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.02, (n_symbols, length))
+    return (rng.uniform(50, 200, (n_symbols, 1)) * np.cumprod(1 + returns, axis=1)).astype(np.float32)
+
+
+def measure(function: Callable[[], object], warmup: int = 2, repeats: int = 10,
+            min_time: float = 0.0) -> np.ndarray:
+    """
+    Per-call wall-clock samples (perf_counter) after warmup calls
+
+    Repeats continue past `repeats` until min_time seconds have been sampled.
+    """
+    for _ in range(warmup):
+        function()
+    samples = []
+    total = 0.0
+    while len(samples) < repeats or total < min_time:
+        start_time = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start_time
+        samples.append(elapsed)
+        total += elapsed
+    return np.array(samples)
+
+
+def measure_allocations(function: Callable[[], object], warmup: int = 2, repeats: int = 5) -> Dict:
+    """
+    tracemalloc over repeated calls after warmup
+
+    Returns the peak bytes allocated during any one call and the NumPy array bytes still
+    allocated after all of them (both should stay flat for a warmed-up workspace).
+    """
+    for _ in range(warmup):
+        function()
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    numpy_domain = [tracemalloc.DomainFilter(True, np.lib.tracemalloc_domain)]
+    before = tracemalloc.take_snapshot().filter_traces(numpy_domain)
+    peak = 0
+    for _ in range(repeats):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        function()
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+    after = tracemalloc.take_snapshot().filter_traces(numpy_domain)
+    if started:
+        tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return {'alloc_peak_bytes': int(peak), 'alloc_retained_bytes': int(retained)}
+
+
+def summarize(samples: np.ndarray, work_units: float) -> Dict:
+    p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+    return {
+        'repeats': len(samples),
+        'min': float(samples.min()),
+        'mean': float(samples.mean()),
+        'std': float(samples.std()),
+        'p50': float(p50),
+        'p90': float(p90),
+        'p99': float(p99),
+        'work_units': work_units,
+        'throughput': float(work_units / p50) if p50 > 0 else float('inf')
+    }
+
+
+def case_id(name: str, params: Dict) -> str:
+    """Stable identifier used to match results against the baseline"""
+    return name + ''.join(f"[{key}={params[key]}]" for key in sorted(params))
+
+
+def _quiet(function: Callable) -> Callable:
+    """Drop the proof scripts' console output while timing"""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return function()
+    return run
+
+
+def _import_proof(module: str):
+    if REPO_ROOT not in sys.path:
+        sys.path.append(REPO_ROOT)
+    return __import__(module)
+
+
+def indicator_cases(symbols: Sequence[int], lengths: Sequence[int],
+                    backends: Sequence[str]) -> Iterator[Case]:
+    for backend in backends:
+        for method in INDICATOR_CALLS:
+            for n_symbols in symbols:
+                for length in lengths:
+                    def setup(backend=backend, method=method, n_symbols=n_symbols, length=length):
+                        indicators = create_backend(backend)
+                        if not hasattr(indicators, method):
+                            raise NotImplementedError(f"{backend} has no {method}")
+                        prices = synthetic_prices(n_symbols, length)
+                        call = INDICATOR_CALLS[method]
+                        return (lambda: call(indicators, prices)), n_symbols * length
+                    yield ('indicators', f"indicators.{method}",
+                           {'backend': backend, 'symbols': n_symbols, 'length': length}, setup)
+
+
+def allocation_cases(symbols: Sequence[int], lengths: Sequence[int],
+                     backends: Sequence[str]) -> Iterator[Case]:
+    """Workspace-mode GPUIndicators refreshing caller-owned out= arrays"""
+    for backend in backends:
+        if backend not in ('numpy', 'cupy'):
+            continue
+        for method, n_outputs in WORKSPACE_CALLS.items():
+            for n_symbols in symbols:
+                for length in lengths:
+                    def setup(backend=backend, method=method, n_outputs=n_outputs, n_symbols=n_symbols, length=length):
+                        indicators = GPUIndicators(use_gpu=backend == 'cupy', workspace=True)
+                        prices = synthetic_prices(n_symbols, length)
+                        outputs = tuple(np.empty_like(prices) for _ in range(n_outputs))
+                        out = outputs if n_outputs > 1 else outputs[0]
+                        call = getattr(indicators, method)
+                        return (lambda: call(prices, out=out)), n_symbols * length
+                    yield ('allocations', f"allocations.{method}",
+                           {'backend': backend, 'symbols': n_symbols, 'length': length}, setup)
+
+
+def fusion_cases(symbols: Sequence[int]) -> Iterator[Case]:
+    for n_symbols in symbols:
+        def kernel_setup(n_symbols=n_symbols):
+            from tensor_fusion_kernel import FusionKernel, SignalBlock
+            n_strategies = 6
+            rng = np.random.default_rng(42)
+            block = SignalBlock(n_symbols, n_strategies)
+            block.data[:] = rng.uniform(0, 1, block.data.shape)
+            block.data[1] = rng.choice([-1, 0, 1], (n_symbols, n_strategies))
+            kernel = FusionKernel(n_symbols, n_strategies, np.full(n_strategies, 1 / n_strategies))
+            out = kernel.fuse(block)
+            return (lambda: kernel.fuse(block, out=out)), n_symbols
+        yield 'fusion', 'fusion.FusionKernel.fuse', {'symbols': n_symbols}, kernel_setup
+
+        def reference_setup(n_symbols=n_symbols):
+            proof = _import_proof('advanced_tensor_mathematical_proof')
+            strategies = proof.create_ai_strategies()
+            weights = [1 / len(strategies)] * len(strategies)
+            rng = np.random.default_rng(42)
+            states = [dict(zip(('pattern_strength', 'bid_ask_pressure', 'transition_prob', 'risk_reward',
+                                'momentum', 'volatility', 'volume'), row))
+                      for row in rng.uniform(0, 1, (n_symbols, 7)).tolist()]
+            signal_sets = [[strategy.generate_signal(state) for strategy in strategies] for state in states]
+            return (lambda: [proof.mathematical_tensor_fusion(signals, weights) for signals in signal_sets]), n_symbols
+        yield 'fusion', 'fusion.mathematical_tensor_fusion', {'symbols': n_symbols}, reference_setup
+
+    for n_trades in (100, 10000):
+        def validation_setup(n_trades=n_trades):
+            validation = _import_proof('mathematical_proof_validation')
+            np.random.seed(42)
+            signals, _, _ = validation.simulate_ai_signals(n_trades=n_trades, n_systems=5)
+            weights = np.full(5, 0.2)
+            return (lambda: validation.tensor_fusion(signals, weights)), n_trades
+        yield 'fusion', 'fusion.tensor_fusion', {'trades': n_trades}, validation_setup
+
+
+def monte_carlo_cases(quick: bool) -> Iterator[Case]:
+    for n_simulations in ((200,) if quick else (200, 1000)):
+        def additive_setup(n_simulations=n_simulations):
+            proof = _import_proof('advanced_tensor_mathematical_proof')
+            strategies = proof.create_ai_strategies()
+            return _quiet(lambda: proof.prove_additive_value(strategies, num_simulations=n_simulations)), n_simulations
+        yield 'monte_carlo', 'monte_carlo.prove_additive_value', {'simulations': n_simulations}, additive_setup
+
+    for n_replicates in ((1000,) if quick else (1000, 5000)):
+        def bootstrap_setup(n_replicates=n_replicates):
+            from bootstrap_significance import paired_bootstrap
+            rng = np.random.default_rng(42)
+            pnl_a, pnl_b = rng.normal(0.1, 1, 500), rng.normal(0.0, 1, 500)
+            return (lambda: paired_bootstrap(pnl_a, pnl_b, n_replicates=n_replicates)), n_replicates
+        yield 'monte_carlo', 'monte_carlo.paired_bootstrap', {'replicates': n_replicates, 'trades': 500}, bootstrap_setup
+
+
+def optimizer_cases(quick: bool) -> Iterator[Case]:
+    for n_trades in ((200,) if quick else (200, 2000)):
+        def optimize_setup(n_trades=n_trades):
+            validation = _import_proof('mathematical_proof_validation')
+            np.random.seed(42)
+            signals, outcomes, _ = validation.simulate_ai_signals(n_trades=n_trades, n_systems=5)
+            return (lambda: validation.optimize_weights(signals, outcomes)), n_trades
+        yield 'optimizer', 'optimizer.optimize_weights', {'trades': n_trades}, optimize_setup
+
+        def tracker_setup(n_trades=n_trades):
+            from signal_correlation import SignalCorrelationTracker
+            rng = np.random.default_rng(42)
+            sources, outcomes = rng.normal(size=(n_trades, 5)), rng.normal(size=(n_trades, 1))
+            tracker = SignalCorrelationTracker(5)
+
+            def run():
+                tracker.initialize(sources, outcomes)
+                return tracker.correlation_aware_weights()
+            return run, n_trades
+        yield 'optimizer', 'optimizer.correlation_aware_weights', {'trades': n_trades}, tracker_setup
+
+
+# Same steps as the inline script in gpu-rsi-strategy.ts: read one price per line, RSI + SMA20/50, JSON out
+BRIDGE_SCRIPT = """
+import json, sys
+sys.path.append(sys.argv[2])
+import numpy as np
+from gpu_accelerated_indicators import GPUIndicators
+with open(sys.argv[1]) as f:
+    prices = np.array([float(line) for line in f if line.strip()], dtype=np.float32).reshape(1, -1)
+indicators = GPUIndicators()
+rsi = indicators.rsi_batch(prices, 14)[0]
+sma20 = indicators.sma_batch(prices, 20)[0]
+sma50 = indicators.sma_batch(prices, 50)[0]
+print(json.dumps({'rsi_values': rsi[~np.isnan(rsi)].tolist(), 'sma20_values': sma20[19:].tolist(),
+                  'sma50_values': sma50[49:].tolist(), 'gpu_accelerated': indicators.gpu_enabled}))
+"""
+
+
+def bridge_cases(lengths: Sequence[int]) -> Iterator[Case]:
+    for length in lengths:
+        def setup(length=length):
+            handle = tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False)
+            prices = synthetic_prices(1, length)[0]
+            command = [sys.executable, '-c', BRIDGE_SCRIPT, handle.name, LIB_DIR]
+
+            def run():
+                # Write -> spawn -> compute -> JSON parse, the full per-update round trip
+                with open(handle.name, 'w') as f:
+                    f.write('\n'.join(map(str, prices.tolist())))
+                output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+                return json.loads(output)
+            return run, 1
+        yield 'bridge', 'bridge.round_trip', {'length': length}, setup
+
+
+def collect_cases(groups: Sequence[str] = GROUPS, quick: bool = False,
+                  backends: Optional[Sequence[str]] = None) -> List[Case]:
+    symbols = QUICK_SYMBOL_GRID if quick else SYMBOL_GRID
+    lengths = QUICK_LENGTH_GRID if quick else LENGTH_GRID
+    backends = list(backends or available_backends())
+    builders = {
+        'indicators': lambda: indicator_cases(symbols, lengths, backends),
+        'allocations': lambda: allocation_cases(symbols, lengths, backends),
+        'fusion': lambda: fusion_cases(symbols),
+        'monte_carlo': lambda: monte_carlo_cases(quick),
+        'optimizer': lambda: optimizer_cases(quick),
+        'bridge': lambda: bridge_cases(lengths)
+    }
+    cases = []
+    for group in groups:
+        cases.extend(builders[group]())
+    return cases
+
+
+def run_suite(groups: Sequence[str] = GROUPS, quick: bool = False, backends: Optional[Sequence[str]] = None,
+              warmup: int = 2, repeats: int = 10, min_time: float = 0.0, verbose: bool = True) -> Dict:
+    """
+    Run every case and return the report (hardware, per-case statistics, skipped cases)
+    """
+    hardware = probe_hardware()
+    results = []
+    for group, name, params, setup in collect_cases(groups, quick, backends):
+        identifier = case_id(name, params)
+        entry = {'id': identifier, 'group': group, 'name': name, 'params': params}
+        try:
+            function, work_units = setup()
+            # Slow cases (bridge, Monte Carlo) get fewer repeats
+            case_repeats = max(3, repeats // 3) if group in ('bridge', 'monte_carlo') else repeats
+            entry.update(summarize(measure(function, warmup, case_repeats, min_time), work_units))
+            if group == 'allocations':
+                entry.update(measure_allocations(function))
+            entry['status'] = 'ok'
+        except Exception as e:
+            entry['status'] = 'skipped'
+            entry['reason'] = f"{type(e).__name__}: {e}"
+        results.append(entry)
+        if verbose:
+            if entry['status'] == 'ok':
+                allocated = (f"  peak alloc {entry['alloc_peak_bytes'] / 1024:.1f} KiB"
+                             if 'alloc_peak_bytes' in entry else '')
+                print(f"  {identifier:75} p50 {entry['p50'] * 1e3:9.3f}ms  p99 {entry['p99'] * 1e3:9.3f}ms  "
+                      f"{entry['throughput']:14.0f}/s{allocated}")
+            else:
+                print(f"  {identifier:75} skipped ({entry['reason']})")
+
+    return {
+        'created': datetime.now().isoformat(),
+        'fingerprint': hardware_fingerprint(hardware),
+        'hardware': hardware,
+        'settings': {'groups': list(groups), 'quick': quick, 'warmup': warmup, 'repeats': repeats},
+        'results': results
+    }
+
+
+def compare(report: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    Cases whose throughput fell more than `threshold` below the baseline
+
+    Only cases that ran in both reports are compared.
+    """
+    reference = {entry['id']: entry for entry in baseline['results'] if entry.get('status') == 'ok'}
+    regressions = []
+    for entry in report['results']:
+        base = reference.get(entry['id'])
+        if entry.get('status') != 'ok' or base is None:
+            continue
+        ratio = entry['throughput'] / base['throughput'] if base['throughput'] > 0 else float('inf')
+        if ratio < 1 - threshold:
+            regressions.append({'id': entry['id'], 'baseline': base['throughput'],
+                                'current': entry['throughput'], 'ratio': ratio})
+    return regressions
+
+
+def allocation_failures(report: Dict, budget: int = DEFAULT_ALLOCATION_BUDGET) -> List[Dict]:
+    """Allocation cases that allocated more than `budget` bytes per call or left arrays behind"""
+    return [entry for entry in report['results']
+            if entry.get('status') == 'ok' and 'alloc_peak_bytes' in entry
+            and (entry['alloc_peak_bytes'] > budget or entry['alloc_retained_bytes'] > 0)]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="SignalCartel benchmark suite")
+    parser.add_argument('--groups', default=','.join(GROUPS), help=f"Comma-separated subset of {', '.join(GROUPS)}")
+    parser.add_argument('--backends', default=None, help="Comma-separated indicator backends (default: all available)")
+    parser.add_argument('--quick', action='store_true', help="Smaller grids for CI")
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--repeats', type=int, default=10)
+    parser.add_argument('--min-time', type=float, default=0.0, help="Minimum sampled seconds per case")
+    parser.add_argument('--output', default=None, help="Write the JSON report here")
+    parser.add_argument('--baseline', default=None, help="Baseline JSON report to gate against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed fractional throughput loss before failing")
+    parser.add_argument('--update-baseline', action='store_true', help="Write this run to --baseline")
+    parser.add_argument('--allocation-budget', type=int, default=DEFAULT_ALLOCATION_BUDGET,
+                        help="Peak bytes a warmed-up workspace call may allocate")
+    args = parser.parse_args(argv)
+
+    print("SignalCartel Benchmark Suite")
+    print("=" * 50)
+    if args.baseline and not args.update_baseline and not os.path.exists(args.baseline):
+        print(f"❌ Baseline {args.baseline} not found (record one with --update-baseline)")
+        return 1
+    report = run_suite(groups=args.groups.split(','), quick=args.quick,
+                       backends=args.backends.split(',') if args.backends else None,
+                       warmup=args.warmup, repeats=args.repeats, min_time=args.min_time)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+    over_budget = allocation_failures(report, args.allocation_budget)
+    if over_budget:
+        print(f"\n❌ {len(over_budget)} workspace case(s) allocate after warmup:")
+        for entry in over_budget:
+            print(f"  {entry['id']}: peak {entry['alloc_peak_bytes']} bytes, "
+                  f"{entry['alloc_retained_bytes']} bytes retained")
+        return 1
+
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('fingerprint') != report['fingerprint']:
+            print("⚠️ Baseline was recorded on different hardware; comparison is indicative only")
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression['id']}: {regression['current']:.0f}/s vs {regression['baseline']:.0f}/s "
+                      f"({regression['ratio']:.0%})")
+            return 1
+        print(f"\n✅ No throughput regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
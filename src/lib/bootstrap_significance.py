@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Vectorized Bootstrap Significance Testing for SignalCartel
+Paired/block bootstrap of fusion vs. baseline PnL series as (replicates x trades) index gathers
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+METRICS = ('sharpe_diff', 'mean_pnl_diff', 'accuracy_diff')
+
+
+def bootstrap_indices(rng: np.random.Generator, n_replicates: int, n_trades: int,
+                      block_size: int = 1) -> np.ndarray:
+    """
+    Draw resampling indices for a chunk of replicates
+
+    Args:
+        rng: NumPy random generator
+        n_replicates: Rows to draw
+        n_trades: Length of the series being resampled
+        block_size: 1 for the iid bootstrap, >1 for the circular moving-block bootstrap
+
+    Returns:
+        (n_replicates, n_trades) int array of trade indices
+    """
+    if block_size <= 1:
+        return rng.integers(0, n_trades, size=(n_replicates, n_trades))
+
+    n_blocks = -(-n_trades // block_size)
+    starts = rng.integers(0, n_trades, size=(n_replicates, n_blocks, 1))
+    indices = (starts + np.arange(block_size)) % n_trades
+    return indices.reshape(n_replicates, n_blocks * block_size)[:, :n_trades]
+
+
+def _sharpe(pnl: np.ndarray) -> np.ndarray:
+    """Row-wise mean/std (population std, as in compute_performance_metrics)"""
+    mean = pnl.mean(axis=-1)
+    std = pnl.std(axis=-1)
+    return np.divide(mean, std, out=np.zeros_like(mean), where=std > 0)
+
+
+def _metric_differences(pnl_a: np.ndarray, pnl_b: np.ndarray,
+                        hits_a: np.ndarray, hits_b: np.ndarray) -> np.ndarray:
+    """(3, replicates) array of Sharpe, mean-PnL and accuracy differences (A - B)"""
+    return np.stack([
+        _sharpe(pnl_a) - _sharpe(pnl_b),
+        pnl_a.mean(axis=-1) - pnl_b.mean(axis=-1),
+        hits_a.mean(axis=-1) - hits_b.mean(axis=-1)
+    ])
+
+
+def _bootstrap_chunk(args) -> np.ndarray:
+    pnl_a, pnl_b, hits_a, hits_b, n_replicates, block_size, seed = args
+    rng = np.random.default_rng(seed)
+    idx = bootstrap_indices(rng, n_replicates, pnl_a.shape[0], block_size)
+    # Same indices for both series keeps the trades paired
+    return _metric_differences(pnl_a[idx], pnl_b[idx], hits_a[idx], hits_b[idx])
+
+
+def paired_bootstrap(pnl_a: np.ndarray, pnl_b: np.ndarray,
+                     hits_a: Optional[np.ndarray] = None, hits_b: Optional[np.ndarray] = None,
+                     n_replicates: int = 5000, block_size: int = 1, confidence: float = 0.95,
+                     chunk_size: int = 1000, n_jobs: int = 1, seed: int = 42) -> Dict:
+    """
+    Paired bootstrap of strategy A (e.g. optimal fusion) against baseline B
+
+    Args:
+        pnl_a, pnl_b: Per-trade PnL series over the same trades
+        hits_a, hits_b: Per-trade direction hits (defaults to PnL > 0)
+        n_replicates: Bootstrap replicates
+        block_size: Block length for serially correlated trades (1 = iid)
+        confidence: Two-sided confidence level for the intervals
+        chunk_size: Replicates gathered at once; bounds memory to chunk_size x trades
+        n_jobs: Worker processes (chunks are independent and seeded deterministically)
+        seed: Base seed
+
+    Returns:
+        Dict keyed by metric with observed difference, CI bounds, p-value and P(A > B)
+    """
+    pnl_a = np.ascontiguousarray(pnl_a, dtype=np.float64)
+    pnl_b = np.ascontiguousarray(pnl_b, dtype=np.float64)
+    if pnl_a.shape != pnl_b.shape or pnl_a.ndim != 1:
+        raise ValueError("PnL series must be 1D and of equal length")
+    hits_a = (pnl_a > 0) if hits_a is None else np.asarray(hits_a, dtype=bool)
+    hits_b = (pnl_b > 0) if hits_b is None else np.asarray(hits_b, dtype=bool)
+
+    chunk_sizes = [min(chunk_size, n_replicates - start) for start in range(0, n_replicates, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    tasks = [(pnl_a, pnl_b, hits_a, hits_b, size, block_size, chunk_seed)
+             for size, chunk_seed in zip(chunk_sizes, seeds)]
+
+    if n_jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            chunks: List[np.ndarray] = list(executor.map(_bootstrap_chunk, tasks))
+    else:
+        chunks = [_bootstrap_chunk(task) for task in tasks]
+
+    replicates = np.concatenate(chunks, axis=1)
+    observed = _metric_differences(pnl_a, pnl_b, hits_a, hits_b)
+
+    alpha = 1.0 - confidence
+    lower, upper = np.quantile(replicates, [alpha / 2, 1 - alpha / 2], axis=1)
+    # Centre the bootstrap distribution on zero to approximate the null of no difference
+    centred = np.abs(replicates - observed[:, None])
+    p_values = (np.sum(centred >= np.abs(observed)[:, None], axis=1) + 1) / (replicates.shape[1] + 1)
+    prob_superior = np.mean(replicates > 0, axis=1)
+
+    return {
+        metric: {
+            'observed': float(observed[i]),
+            'ci_low': float(lower[i]),
+            'ci_high': float(upper[i]),
+            'p_value': float(p_values[i]),
+            'prob_superior': float(prob_superior[i])
+        }
+        for i, metric in enumerate(METRICS)
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    print("SignalCartel Bootstrap Significance Test")
+    print("=" * 50)
+
+    rng = np.random.default_rng(42)
+    n_trades = 2000
+    magnitude = rng.lognormal(0, 0.5, n_trades) * 0.02 * 60
+    baseline = np.where(rng.random(n_trades) < 0.55, magnitude, -magnitude) - 0.25
+    fusion = np.where(rng.random(n_trades) < 0.60, magnitude, -magnitude) - 0.25
+
+    start_time = time.perf_counter()
+    results = paired_bootstrap(fusion, baseline, n_replicates=5000)
+    elapsed = time.perf_counter() - start_time
+
+    for metric, stats in results.items():
+        print(f"{metric:15}: {stats['observed']:+.4f} "
+              f"[{stats['ci_low']:+.4f}, {stats['ci_high']:+.4f}] p={stats['p_value']:.4f}")
+    print(f"\n5000 replicates x {n_trades} trades in {elapsed:.3f}s")
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Position-Size and Commission Sensitivity Sweeps for SignalCartel
+Generalizes the fixed $60 / $0.25 breakeven analysis of mathematical_proof_simple.py to grids
+of position size, fixed commission, fee rate, slippage and accuracy/magnitude assumptions (or
+real per-pair trade statistics), evaluating expected PnL, breakeven win rate and risk-adjusted
+return for every scenario in one broadcast, chunked for grids too large to hold at once
+"""
+import math
+from typing import Dict, Iterator, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from trade_statistics import DEFAULT_COMMISSION, RunningStats
+from vectorized_backtest import DEFAULT_POSITION_SIZE
+
+# Grid axes in surface order
+SCENARIO_AXES = ('position_size', 'commission', 'fee_rate', 'slippage_bps', 'accuracy', 'magnitude')
+PAIR_AXES = ('pair', 'position_size', 'commission', 'fee_rate', 'slippage_bps')
+METRICS = ('expected_pnl', 'breakeven_win_rate', 'risk_adjusted', 'cost_per_trade')
+
+DEFAULT_CHUNK_SIZE = 1_000_000  # scenarios per evaluation in sweep_grid
+
+
+def trade_costs(position_size, commission, fee_rate, slippage_bps):
+    """Round-trip cost of one trade: fixed commission plus per-side fee and slippage on the notional"""
+    return commission + 2.0 * position_size * (fee_rate + slippage_bps * 1e-4)
+
+
+def evaluate_scenarios(position_size, commission, fee_rate, slippage_bps, win_rate,
+                       avg_win, avg_loss) -> Dict[str, np.ndarray]:
+    """
+    Two-outcome trade model for broadcast arrays of assumptions
+
+    Each trade wins avg_win or loses avg_loss (fractions of the position) with probability
+    win_rate / 1 - win_rate, then pays trade_costs. With avg_win == avg_loss == magnitude and
+    no fee or slippage, expected_pnl equals calculate_portfolio_performance's.
+
+    Returns:
+        Dict of METRICS arrays (broadcast shape): expected_pnl per trade, the win rate at which
+        it is zero (above 1 = no win rate breaks even), expected PnL over the per-trade standard
+        deviation, and the cost per trade
+    """
+    win = np.multiply(avg_win, position_size, dtype=np.float64)
+    loss = np.multiply(avg_loss, position_size, dtype=np.float64)
+    costs = trade_costs(np.asarray(position_size, dtype=np.float64), commission, fee_rate, slippage_bps)
+    spread = win + loss
+
+    expected = win_rate * win - (1 - win_rate) * loss - costs
+    breakeven = np.divide(loss + costs, spread, out=np.full(np.broadcast(spread, costs).shape, np.inf),
+                          where=spread > 0)
+    std = spread * np.sqrt(np.clip(win_rate * (1 - win_rate), 0.0, None))
+    risk_adjusted = np.divide(expected, std, out=np.zeros(np.broadcast(expected, std).shape), where=std > 0)
+    return {
+        'expected_pnl': expected,
+        'breakeven_win_rate': breakeven,
+        'risk_adjusted': risk_adjusted,
+        'cost_per_trade': np.broadcast_to(costs, expected.shape)
+    }
+
+
+def _open_grid(values: Sequence[np.ndarray]) -> Tuple[np.ndarray, ...]:
+    """Reshape each 1D axis to broadcast along its own dimension"""
+    n = len(values)
+    return tuple(np.asarray(v, dtype=np.float64).reshape([-1 if i == axis else 1 for i in range(n)])
+                 for axis, v in enumerate(values))
+
+
+def _axes(position_sizes, commissions, fee_rates, slippage_bps, accuracies, magnitudes) -> Dict[str, np.ndarray]:
+    return {name: np.atleast_1d(np.asarray(values, dtype=np.float64))
+            for name, values in zip(SCENARIO_AXES, (position_sizes, commissions, fee_rates,
+                                                    slippage_bps, accuracies, magnitudes))}
+
+
+def sensitivity_surface(position_sizes: Sequence[float] = (DEFAULT_POSITION_SIZE,),
+                        commissions: Sequence[float] = (DEFAULT_COMMISSION,),
+                        fee_rates: Sequence[float] = (0.0,), slippage_bps: Sequence[float] = (0.0,),
+                        accuracies: Sequence[float] = (0.5,), magnitudes: Sequence[float] = (0.01,),
+                        win_loss_ratio: float = 1.0) -> Dict[str, np.ndarray]:
+    """
+    Every metric over the full grid in one vectorized evaluation
+
+    Args:
+        position_sizes: Position notionals ($)
+        commissions: Fixed commission per trade ($)
+        fee_rates: Proportional fee per side (0.0026 = 0.26%)
+        slippage_bps: Slippage per side in basis points
+        accuracies: Win rates
+        magnitudes: Average losing move as a fraction of the position
+        win_loss_ratio: Average win / average loss (1.0 = the proofs' symmetric assumption)
+
+    Returns:
+        Dict of METRICS surfaces shaped (len(axis) for axis in SCENARIO_AXES), plus 'axes'
+    """
+    axes = _axes(position_sizes, commissions, fee_rates, slippage_bps, accuracies, magnitudes)
+    size, commission, fee, slippage, accuracy, magnitude = _open_grid(list(axes.values()))
+    surfaces = evaluate_scenarios(size, commission, fee, slippage, accuracy,
+                                  magnitude * win_loss_ratio, magnitude)
+    shape = tuple(len(values) for values in axes.values())
+    surfaces = {name: np.broadcast_to(surface, shape) for name, surface in surfaces.items()}
+    surfaces['axes'] = axes
+    return surfaces
+
+
+def iter_grid_chunks(axes: Mapping[str, np.ndarray],
+                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[np.ndarray, Dict[str, np.ndarray]]]:
+    """
+    Walk a grid too large to materialize, chunk_size scenarios at a time
+
+    Yields:
+        (flat scenario indices, {axis name: values for those scenarios})
+    """
+    shape = tuple(len(values) for values in axes.values())
+    total = math.prod(shape)
+    for start in range(0, total, chunk_size):
+        flat = np.arange(start, min(start + chunk_size, total), dtype=np.int64)
+        coordinates = np.unravel_index(flat, shape)
+        yield flat, {name: values[index] for (name, values), index in zip(axes.items(), coordinates)}
+
+
+def sweep_grid(position_sizes: Sequence[float] = (DEFAULT_POSITION_SIZE,),
+               commissions: Sequence[float] = (DEFAULT_COMMISSION,),
+               fee_rates: Sequence[float] = (0.0,), slippage_bps: Sequence[float] = (0.0,),
+               accuracies: Sequence[float] = (0.5,), magnitudes: Sequence[float] = (0.01,),
+               win_loss_ratio: float = 1.0, chunk_size: int = DEFAULT_CHUNK_SIZE, top_k: int = 10,
+               out: Optional[Dict[str, np.ndarray]] = None) -> Dict:
+    """
+    sensitivity_surface for grids of any size, in bounded memory
+
+    Args:
+        (grid axes as sensitivity_surface)
+        chunk_size: Scenarios evaluated per chunk
+        top_k: Best scenarios (by risk_adjusted) to keep
+        out: Optional {metric: array} of the grid shape (e.g. np.memmap) to fill with the surfaces
+
+    Returns:
+        Dict with scenario count, profitable fraction, expected PnL range and the top_k
+        scenarios (axis values and metrics)
+    """
+    axes = _axes(position_sizes, commissions, fee_rates, slippage_bps, accuracies, magnitudes)
+    scenarios = 0
+    profitable = 0
+    pnl_range = [np.inf, -np.inf]
+    best_index = np.empty(0, dtype=np.int64)
+    best_score = np.empty(0)
+
+    for flat, values in iter_grid_chunks(axes, chunk_size):
+        metrics = evaluate_scenarios(values['position_size'], values['commission'], values['fee_rate'],
+                                     values['slippage_bps'], values['accuracy'],
+                                     values['magnitude'] * win_loss_ratio, values['magnitude'])
+        if out is not None:
+            for name, target in out.items():
+                target.reshape(-1)[flat] = metrics[name]
+
+        expected = metrics['expected_pnl']
+        scenarios += flat.size
+        profitable += int(np.count_nonzero(expected > 0))
+        pnl_range = [min(pnl_range[0], float(expected.min())), max(pnl_range[1], float(expected.max()))]
+
+        # Keep a running top-k: candidates from this chunk plus the previous best
+        score = metrics['risk_adjusted']
+        keep = min(top_k, score.size)
+        chunk_best = np.argpartition(-score, keep - 1)[:keep]
+        best_index = np.concatenate([best_index, flat[chunk_best]])
+        best_score = np.concatenate([best_score, score[chunk_best]])
+        order = np.argsort(-best_score, kind='stable')[:top_k]
+        best_index, best_score = best_index[order], best_score[order]
+
+    shape = tuple(len(values) for values in axes.values())
+    coordinates = np.unravel_index(best_index, shape)
+    best_values = {name: values[index] for (name, values), index in zip(axes.items(), coordinates)}
+    best_metrics = evaluate_scenarios(best_values['position_size'], best_values['commission'],
+                                      best_values['fee_rate'], best_values['slippage_bps'],
+                                      best_values['accuracy'], best_values['magnitude'] * win_loss_ratio,
+                                      best_values['magnitude'])
+    best = [{**{name: float(best_values[name][i]) for name in SCENARIO_AXES},
+             **{name: float(best_metrics[name][i]) for name in METRICS}}
+            for i in range(best_index.size)]
+    return {
+        'scenarios': scenarios,
+        'profitable_fraction': profitable / scenarios if scenarios else 0.0,
+        'expected_pnl_range': tuple(pnl_range),
+        'best': best
+    }
+
+
+def outcome_model(gross_mean, std, win_rate) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Average win and loss of the two-outcome model matching a PnL distribution's mean,
+    standard deviation and win rate (the inverse of evaluate_scenarios' moments)
+    """
+    p = np.clip(np.asarray(win_rate, dtype=np.float64), 1e-6, 1 - 1e-6)
+    spread = np.asarray(std, dtype=np.float64) / np.sqrt(p * (1 - p))
+    return gross_mean + (1 - p) * spread, p * spread - gross_mean
+
+
+def _pair_arrays(stats: Mapping) -> Tuple[list, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Names, gross (pre-commission) mean, std and win rate per pair
+
+    RunningStats carry net PnL and are grossed up by their own commission; REAL_DATA-style
+    dicts (and TradeStatisticsBook.to_real_data) already give gross PnL under 'mean_pnl'.
+    """
+    names, rows = [], []
+    for name, entry in stats.items():
+        if isinstance(entry, RunningStats):
+            rows.append((entry.gross_mean, entry.std, entry.win_rate))
+        elif isinstance(entry, Mapping):
+            rows.append((entry['mean_pnl'], entry['std_pnl'], entry['win_rate']))
+        else:  # REAL_DATA's scalar commission_per_trade
+            continue
+        names.append(name)
+    gross_mean, std, win_rate = np.array(rows, dtype=np.float64).reshape(-1, 3).T
+    return names, gross_mean, std, win_rate
+
+
+def pair_sensitivity(stats: Mapping, position_sizes: Sequence[float] = (DEFAULT_POSITION_SIZE,),
+                     commissions: Sequence[float] = (DEFAULT_COMMISSION,),
+                     fee_rates: Sequence[float] = (0.0,), slippage_bps: Sequence[float] = (0.0,),
+                     reference_position: float = DEFAULT_POSITION_SIZE) -> Dict:
+    """
+    Re-price real per-pair trade statistics under other sizes and cost schedules
+
+    Each pair's gross (pre-commission) win/loss outcomes are scaled from reference_position
+    to each position size and each cost schedule is applied, so the reference size and
+    commission reproduce mathematical_proof_simple's net PnL per trade.
+
+    Args:
+        stats: TradeStatisticsBook.by_pair(), TradeStatisticsBook.to_real_data() or a
+            REAL_DATA-style dict (mean_pnl before commission)
+        position_sizes, commissions, fee_rates, slippage_bps: Grid axes as sensitivity_surface
+        reference_position: Position size the historical trades were taken at
+
+    Returns:
+        Dict of METRICS surfaces shaped (pairs, positions, commissions, fees, slippages),
+        plus 'pairs' and 'axes'
+    """
+    names, gross_mean, std, win_rate = _pair_arrays(stats)
+    avg_win, avg_loss = outcome_model(gross_mean, std, win_rate)
+
+    axes = {'pair': np.arange(len(names)),
+            **{name: np.atleast_1d(np.asarray(values, dtype=np.float64))
+               for name, values in zip(PAIR_AXES[1:], (position_sizes, commissions, fee_rates, slippage_bps))}}
+    _, size, commission, fee, slippage = _open_grid(list(axes.values()))
+    per_pair = (-1, 1, 1, 1, 1)
+    surfaces = evaluate_scenarios(size, commission, fee, slippage, win_rate.reshape(per_pair),
+                                  avg_win.reshape(per_pair) / reference_position,
+                                  avg_loss.reshape(per_pair) / reference_position)
+    shape = tuple(len(values) for values in axes.values())
+    surfaces = {name: np.broadcast_to(surface, shape) for name, surface in surfaces.items()}
+    surfaces['pairs'] = names
+    surfaces['axes'] = axes
+    return surfaces
+
+
+if __name__ == "__main__":
+    import time
+
+    print("SignalCartel Position-Size / Commission Sensitivity")
+    print("=" * 50)
+
+    # The proof's systems at its fixed assumptions reproduce calculate_portfolio_performance
+    accuracies = np.array([0.65, 0.70, 0.80, 0.75, 0.60])
+    magnitudes = np.array([0.012, 0.015, 0.008, 0.018, 0.025])
+    proof = evaluate_scenarios(60.0, 0.25, 0.0, 0.0, accuracies, magnitudes, magnitudes)
+    print("Proof systems at $60 / $0.25:", np.round(proof['expected_pnl'], 4))
+
+    surface = sensitivity_surface(position_sizes=np.linspace(20, 500, 25), commissions=(0.0, 0.25, 0.5),
+                                  fee_rates=(0.0, 0.0016, 0.0026), slippage_bps=(0, 2, 5),
+                                  accuracies=np.linspace(0.45, 0.85, 41), magnitudes=np.linspace(0.002, 0.03, 15))
+    print(f"Surface {surface['expected_pnl'].shape}: {np.mean(surface['expected_pnl'] > 0):.1%} of scenarios profitable")
+    # Smallest profitable position per (fee tier, accuracy) at 1% magnitude, no slippage, $0.25
+    profitable = surface['expected_pnl'][:, 1, :, 0, :, 4] > 0
+    first = np.where(profitable.any(axis=0), profitable.argmax(axis=0), -1)
+    for fee_index, fee in enumerate(surface['axes']['fee_rate']):
+        for accuracy_index in (10, 20, 30):
+            index = first[fee_index, accuracy_index]
+            size = f"${surface['axes']['position_size'][index]:.0f}" if index >= 0 else "never"
+            print(f"  fee {fee:.2%}, accuracy {surface['axes']['accuracy'][accuracy_index]:.0%}: "
+                  f"profitable from {size}")
+
+    start_time = time.perf_counter()
+    summary = sweep_grid(position_sizes=np.linspace(10, 1000, 40), commissions=np.linspace(0, 1, 11),
+                         fee_rates=np.linspace(0, 0.004, 11), slippage_bps=np.linspace(0, 10, 6),
+                         accuracies=np.linspace(0.4, 0.9, 41), magnitudes=np.linspace(0.001, 0.05, 20),
+                         top_k=3)
+    elapsed = time.perf_counter() - start_time
+    print(f"Chunked sweep: {summary['scenarios']:,} scenarios in {elapsed:.2f}s, "
+          f"{summary['profitable_fraction']:.1%} profitable")
+    print(f"  Best: {summary['best'][0]}")
+
+    real_data = {
+        'WLFIUSD': {'trades': 35, 'mean_pnl': 1.093636, 'std_pnl': 0.531818, 'win_rate': 0.84},
+        'ETHUSD': {'trades': 16, 'mean_pnl': -0.002583, 'std_pnl': 0.102576, 'win_rate': 0.84},
+        'commission_per_trade': 0.25
+    }
+    pairs = pair_sensitivity(real_data, position_sizes=(30, 60, 120, 240), commissions=(0.0, 0.25, 0.5))
+    for i, pair in enumerate(pairs['pairs']):
+        print(f"  {pair}: expected PnL at $0.25 by size {np.round(pairs['expected_pnl'][i, :, 1, 0, 0], 3)}, "
+              f"breakeven win rate at $60 {pairs['breakeven_win_rate'][i, 1, 1, 0, 0]:.1%}")
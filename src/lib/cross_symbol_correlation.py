@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Rolling Cross-Symbol Correlation and Beta for SignalCartel
+Batch counterpart of market-correlation-analyzer.ts: rolling covariance, correlation and beta
+matrices for N aligned return series from windowed sums of rank-one (outer product) terms,
+either for every window or just the latest, plus a streaming engine updated once per bar
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Bars per chunk when computing every window (bounds the (chunk x N x N) temporaries)
+DEFAULT_CHUNK_SIZE = 512
+
+
+def to_returns(close: np.ndarray) -> np.ndarray:
+    """(symbols x bars) prices -> (bars - 1 x symbols) simple returns, as calculateReturns"""
+    close = np.asarray(close, dtype=np.float64)
+    return (np.diff(close, axis=1) / close[:, :-1]).T
+
+
+def _terms(returns: np.ndarray, center: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Centered values with missing bars zeroed, and the validity mask as floats"""
+    valid = ~np.isnan(returns)
+    values = np.where(valid, returns - center, 0.0)
+    return values, valid.astype(np.float64)
+
+
+def _sums(values: np.ndarray, valid: np.ndarray, subscripts: str) -> Dict[str, np.ndarray]:
+    """Pairwise-complete sums of the rank-one terms (count, x_i v_j, x_i x_j, x_i^2 v_j)"""
+    return {
+        'count': np.einsum(subscripts, valid, valid),
+        'sum': np.einsum(subscripts, values, valid),
+        'cross': np.einsum(subscripts, values, values),
+        'square': np.einsum(subscripts, values * values, valid)
+    }
+
+
+def window_sums(returns: np.ndarray, window: int, latest_only: bool = False,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, np.ndarray]:
+    """
+    Rolling sums of the rank-one terms behind every pairwise statistic
+
+    Every window is the difference of two prefix sums of the per-bar outer products. The
+    prefix sums restart each chunk (with a `window`-bar lead-in), so rounding does not
+    accumulate over long histories and temporaries stay (chunk x N x N).
+
+    Args:
+        returns: (bars x symbols) aligned returns, NaN where a symbol has no bar
+        window: Window length in bars
+        latest_only: Only the window ending at the last bar
+        chunk_size: Bars per chunk
+
+    Returns:
+        Dict of count/sum/cross/square arrays, (bars - window + 1 x N x N), or (N x N) when
+        latest_only; sum[i, j] and square[i, j] cover x_i over the bars where j is present too
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    n_bars, n_symbols = returns.shape
+    if n_bars < window:
+        raise ValueError(f"Need at least {window} bars, got {n_bars}")
+    center = np.nan_to_num(np.nanmean(returns, axis=0))
+
+    if latest_only:
+        values, valid = _terms(returns[-window:], center)
+        return _sums(values, valid, 'ti,tj->ij')
+
+    n_windows = n_bars - window + 1
+    sums = {name: np.empty((n_windows, n_symbols, n_symbols)) for name in ('count', 'sum', 'cross', 'square')}
+    for start in range(0, n_windows, chunk_size):
+        stop = min(start + chunk_size, n_windows)
+        values, valid = _terms(returns[start:stop + window - 1], center)
+        terms = _sums(values, valid, 'ti,tj->tij')
+        for name, term in terms.items():
+            prefix = np.zeros((term.shape[0] + 1, n_symbols, n_symbols))
+            np.cumsum(term, axis=0, out=prefix[1:])
+            np.subtract(prefix[window:], prefix[:-window], out=sums[name][start:stop])
+    return sums
+
+
+def covariance_from_sums(sums: Dict[str, np.ndarray], ddof: int = 1,
+                         min_periods: Optional[int] = None) -> np.ndarray:
+    """Pairwise-complete covariance; NaN where fewer than min_periods common bars"""
+    count = sums['count']
+    total = sums['sum']
+    transposed = np.swapaxes(total, -1, -2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        covariance = (sums['cross'] - total * transposed / count) / (count - ddof)
+    covariance[count < max(min_periods or 0, ddof + 1)] = np.nan
+    return covariance
+
+
+def _conditional_variance(sums: Dict[str, np.ndarray], ddof: int) -> np.ndarray:
+    """variance[i, j] of symbol i over the bars it shares with symbol j"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = (sums['square'] - sums['sum'] ** 2 / sums['count']) / (sums['count'] - ddof)
+    return np.maximum(variance, 0.0)
+
+
+def correlation_from_sums(sums: Dict[str, np.ndarray], ddof: int = 1,
+                          min_periods: Optional[int] = None) -> np.ndarray:
+    """Pearson correlation over each pair's common bars (0 when either side is flat, as in the TS)"""
+    covariance = covariance_from_sums(sums, ddof, min_periods)
+    variance = _conditional_variance(sums, ddof)
+    scale = np.sqrt(variance * np.swapaxes(variance, -1, -2))
+    correlation = np.divide(covariance, scale, out=np.zeros_like(covariance), where=scale > 0)
+    correlation[np.isnan(covariance)] = np.nan
+    return np.clip(correlation, -1.0, 1.0, out=correlation)
+
+
+def beta_from_sums(sums: Dict[str, np.ndarray], ddof: int = 1, min_periods: Optional[int] = None,
+                   benchmark: Optional[int] = None) -> np.ndarray:
+    """
+    Regression beta of symbol i on symbol j over their common bars
+
+    Returns:
+        (... x N x N) beta[i, j], or (... x N) against one benchmark symbol index
+    """
+    covariance = covariance_from_sums(sums, ddof, min_periods)
+    benchmark_variance = np.swapaxes(_conditional_variance(sums, ddof), -1, -2)
+    beta = np.divide(covariance, benchmark_variance, out=np.full_like(covariance, np.nan),
+                     where=benchmark_variance > 0)
+    return beta if benchmark is None else beta[..., benchmark]
+
+
+def rolling_covariance(returns: np.ndarray, window: int, latest_only: bool = False,
+                       ddof: int = 1, min_periods: Optional[int] = None) -> np.ndarray:
+    """(windows x N x N) rolling covariance, or (N x N) for the latest window"""
+    return covariance_from_sums(window_sums(returns, window, latest_only), ddof,
+                                window if min_periods is None else min_periods)
+
+
+def rolling_correlation(returns: np.ndarray, window: int, latest_only: bool = False,
+                        min_periods: Optional[int] = None) -> np.ndarray:
+    """(windows x N x N) rolling correlation, or (N x N) for the latest window"""
+    return correlation_from_sums(window_sums(returns, window, latest_only), 1,
+                                 window if min_periods is None else min_periods)
+
+
+def rolling_beta(returns: np.ndarray, window: int, latest_only: bool = False,
+                 benchmark: Optional[int] = None, min_periods: Optional[int] = None) -> np.ndarray:
+    """Rolling beta matrix (windows x N x N), or per-symbol beta to `benchmark` (windows x N)"""
+    return beta_from_sums(window_sums(returns, window, latest_only), 1,
+                          window if min_periods is None else min_periods, benchmark)
+
+
+def pairs(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Upper-triangle (i, j, value) arrays of an (... x N x N) matrix, one entry per symbol pair"""
+    first, second = np.triu_indices(matrix.shape[-1], k=1)
+    return first, second, matrix[..., first, second]
+
+
+class RollingCorrelationEngine:
+    """
+    Streaming rolling covariance/correlation/beta across N symbols
+
+    Each bar adds the new row's rank-one terms and subtracts those of the row leaving the
+    window (O(N^2) per bar). The running sums are rebuilt from the window buffer every
+    `resync_interval` bars so add/subtract rounding cannot drift.
+    """
+
+    def __init__(self, n_symbols: int, window: int, ddof: int = 1,
+                 min_periods: Optional[int] = None, resync_interval: Optional[int] = None):
+        """
+        Args:
+            n_symbols: Number of symbols tracked together
+            window: Window length in bars
+            ddof: Delta degrees of freedom for covariance/variance
+            min_periods: Common bars a pair needs before it is reported (default: window)
+            resync_interval: Bars between exact rebuilds of the sums (default: 50 windows)
+        """
+        self.n_symbols = n_symbols
+        self.window = window
+        self.ddof = ddof
+        self.min_periods = window if min_periods is None else min_periods
+        self.resync_interval = resync_interval or 50 * window
+
+        self.center = np.zeros(n_symbols)
+        self.last_prices: Optional[np.ndarray] = None
+        self._values = np.zeros((window, n_symbols))
+        self._valid = np.zeros((window, n_symbols))
+        self._cursor = 0
+        self._since_resync = 0
+        self.sums = {name: np.zeros((n_symbols, n_symbols)) for name in ('count', 'sum', 'cross', 'square')}
+        self._outer = np.empty((n_symbols, n_symbols))
+        self.bars = 0
+
+    def reset(self):
+        self._values[:] = 0.0
+        self._valid[:] = 0.0
+        self._cursor = 0
+        self._since_resync = 0
+        for total in self.sums.values():
+            total[:] = 0.0
+        self.last_prices = None
+        self.bars = 0
+
+    def fit(self, returns: np.ndarray):
+        """Reset and seed from (bars x symbols) return history (the last `window` bars are kept)"""
+        returns = np.asarray(returns, dtype=np.float64)
+        self.reset()
+        self.center = np.nan_to_num(np.nanmean(returns, axis=0)) if len(returns) else np.zeros(self.n_symbols)
+        recent = returns[-self.window:]
+        values, valid = _terms(recent, self.center)
+        self._values[:len(recent)] = values
+        self._valid[:len(recent)] = valid
+        self._cursor = len(recent) % self.window
+        self.bars = len(returns)
+        self.resync()
+
+    def resync(self):
+        """Rebuild the running sums exactly from the window buffer"""
+        self.sums = _sums(self._values, self._valid, 'ti,tj->ij')
+        self._since_resync = 0
+
+    def _accumulate(self, values: np.ndarray, valid: np.ndarray, sign: float):
+        outer = self._outer
+        for name, left, right in (('count', valid, valid), ('sum', values, valid),
+                                  ('cross', values, values), ('square', values * values, valid)):
+            np.multiply.outer(left, right, out=outer)
+            if sign > 0:
+                self.sums[name] += outer
+            else:
+                self.sums[name] -= outer
+
+    def update(self, new_returns: np.ndarray):
+        """Add one bar of returns for every symbol (NaN = no bar for that symbol)"""
+        new_returns = np.asarray(new_returns, dtype=np.float64)
+        valid = ~np.isnan(new_returns)
+        values = np.where(valid, new_returns - self.center, 0.0)
+        valid = valid.astype(np.float64)
+
+        if self.bars >= self.window:
+            self._accumulate(self._values[self._cursor], self._valid[self._cursor], -1.0)
+        self._accumulate(values, valid, 1.0)
+        self._values[self._cursor] = values
+        self._valid[self._cursor] = valid
+        self._cursor = (self._cursor + 1) % self.window
+        self.bars += 1
+
+        self._since_resync += 1
+        if self._since_resync >= self.resync_interval:
+            self.resync()
+
+    def update_prices(self, prices: np.ndarray):
+        """Add one bar of prices; returns come from the previous bar's prices"""
+        prices = np.asarray(prices, dtype=np.float64)
+        if self.last_prices is not None:
+            self.update((prices - self.last_prices) / self.last_prices)
+        self.last_prices = prices.copy()
+
+    def covariance(self) -> np.ndarray:
+        return covariance_from_sums(self.sums, self.ddof, self.min_periods)
+
+    def correlation(self) -> np.ndarray:
+        return correlation_from_sums(self.sums, self.ddof, self.min_periods)
+
+    def beta(self, benchmark: Optional[int] = None) -> np.ndarray:
+        return beta_from_sums(self.sums, self.ddof, self.min_periods, benchmark)
+
+
+if __name__ == "__main__":
+    import time
+
+    print("SignalCartel Rolling Cross-Symbol Correlation")
+    print("=" * 50)
+
+    rng = np.random.default_rng(42)
+    n_symbols, n_bars, window = 30, 10_000, 60
+    market = rng.normal(0, 0.001, n_bars)
+    loadings = rng.uniform(0.2, 1.5, n_symbols)
+    returns = market[:, None] * loadings + rng.normal(0, 0.001, (n_bars, n_symbols))
+    returns[rng.random(returns.shape) < 0.01] = np.nan  # occasional missing bars
+    n_pairs = n_symbols * (n_symbols - 1) // 2
+
+    start_time = time.perf_counter()
+    correlation = rolling_correlation(returns, window, min_periods=window // 2)
+    elapsed = time.perf_counter() - start_time
+    print(f"All windows: {correlation.shape[0]} x {n_pairs} pairs in {elapsed:.3f}s")
+
+    first, second, _ = pairs(correlation)
+    t, i, j = correlation.shape[0] - 1, first[0], second[0]
+    common = ~np.isnan(returns[t:t + window, i]) & ~np.isnan(returns[t:t + window, j])
+    reference = np.corrcoef(returns[t:t + window, i][common], returns[t:t + window, j][common])[0, 1]
+    print(f"Latest window pair ({i},{j}): {correlation[t, i, j]:.6f} vs np.corrcoef {reference:.6f}")
+
+    engine = RollingCorrelationEngine(n_symbols, window, min_periods=window // 2)
+    engine.fit(returns[:-1000])
+    start_time = time.perf_counter()
+    for row in returns[-1000:]:
+        engine.update(row)
+        engine.correlation()
+    per_bar = (time.perf_counter() - start_time) / 1000
+    print(f"Streaming update + correlation: {per_bar * 1e6:.1f}us per bar for {n_pairs} pairs")
+    print(f"Streaming matches batch: {np.allclose(engine.correlation(), correlation[-1], equal_nan=True)}")
+
+    beta = engine.beta(benchmark=0)
+    print(f"Beta to symbol 0 (true loading ratio ~ {loadings[1] / loadings[0]:.2f}): {beta[1]:.2f}")
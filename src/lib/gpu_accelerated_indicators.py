@@ -0,0 +1,714 @@
+#!/usr/bin/env python3
+"""
+GPU-Accelerated Technical Indicators for SignalCartel
+Provides CUDA-accelerated calculations for trading indicators like RSI, Bollinger Bands, etc.
+Falls back to NumPy on hosts without CuPy/CUDA (e.g. CPU worker processes)
+"""
+import numpy as np
+import re
+from typing import Dict, List, Optional, Tuple, Union
+import time
+
+import compute_instrumentation as instrumentation
+
+_cupy = None
+_cupy_checked = False
+
+def get_cupy():
+    """Import CuPy on first use; None when it is not installed (importing this module stays light)"""
+    global _cupy, _cupy_checked
+    if not _cupy_checked:
+        try:
+            import cupy
+            _cupy = cupy
+        except ImportError:
+            _cupy = None
+        _cupy_checked = True
+    return _cupy
+
+def gpu_available() -> bool:
+    """True when CuPy is installed and at least one CUDA device is visible"""
+    cp = get_cupy()
+    if cp is None:
+        return False
+    try:
+        return cp.cuda.runtime.getDeviceCount() > 0
+    except Exception:
+        return False
+
+class IndicatorWorkspace:
+    """
+    Named scratch arrays reused across indicator calls
+    
+    A buffer is allocated the first time a name is requested and again only when the
+    requested shape or dtype changes, so repeated refreshes of the same batch shape
+    run without allocating. Not thread-safe: use one workspace per calling thread.
+    """
+    
+    def __init__(self, xp=np):
+        self.xp = xp
+        self.buffers = {}
+        self.allocations = 0
+    
+    def get(self, name: str, shape: Tuple[int, ...], dtype=np.float32):
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = self.xp.empty(shape, dtype=dtype)
+            self.buffers[name] = buffer
+            self.allocations += 1
+        return buffer
+    
+    @property
+    def nbytes(self) -> int:
+        return sum(buffer.nbytes for buffer in self.buffers.values())
+    
+    def clear(self):
+        self.buffers.clear()
+
+class GPUIndicators:
+    """GPU-accelerated technical indicators using CuPy (NumPy when no GPU is available)"""
+    
+    def __init__(self, use_gpu: Optional[bool] = None, profile=None, workspace: bool = False):
+        """
+        Initialize GPU memory pool for efficient memory management
+        
+        Args:
+            use_gpu: Force GPU (True) or CPU (False); autodetect when None
+            profile: Optional backend_autotuner.TuningProfile; each batch call is then
+                dispatched to the backend that measured fastest for its shape
+            workspace: Keep scratch (and device) arrays between calls in an IndicatorWorkspace;
+                with out= arrays as well, same-shape calls allocate nothing after the first
+        """
+        if use_gpu is None:
+            use_gpu = gpu_available()
+        cp = get_cupy() if use_gpu else None
+        if use_gpu and cp is None:
+            raise ImportError("CuPy is required for GPU indicators")
+        
+        self.gpu_enabled = use_gpu
+        self.cp = cp
+        self.xp = cp if use_gpu else np
+        self.mempool = cp.get_default_memory_pool() if use_gpu else None
+        self.pinned_mempool = cp.get_default_pinned_memory_pool() if use_gpu else None
+        self.backend_name = 'cupy' if use_gpu else 'numpy'
+        self.profile = profile
+        self.workspace = IndicatorWorkspace(self.xp) if workspace else None
+        self._backends = {}
+    
+    def clear_memory(self):
+        """Clear GPU memory cache"""
+        if self.workspace is not None:
+            self.workspace.clear()
+        if self.gpu_enabled:
+            self.mempool.free_all_blocks()
+            self.pinned_mempool.free_all_blocks()
+    
+    def _buffer(self, name: str, shape: Tuple[int, ...], dtype=np.float32):
+        """Scratch array: reused from the workspace when there is one, else freshly allocated"""
+        if self.workspace is None:
+            return self.xp.empty(shape, dtype=dtype)
+        return self.workspace.get(name, shape, dtype)
+    
+    def _output(self, name: str, out, shape: Tuple[int, ...]):
+        """Kernel destination for out=: the caller's arrays on CPU, reused device buffers on GPU"""
+        if out is None:
+            return None
+        if isinstance(out, tuple):
+            return tuple(self._output(f"{name}.{i}", array, shape) for i, array in enumerate(out))
+        if not isinstance(out, np.ndarray) or out.shape != shape or out.dtype != np.float32:
+            raise ValueError(f"out must be a float32 NumPy array of shape {shape}")
+        return self._buffer(f"{name}.out", shape) if self.gpu_enabled else out
+    
+    def _to_device(self, price_data: Union[np.ndarray, List[List[float]]]):
+        """Move price data to the active backend as float32 (into the workspace when there is one)"""
+        if isinstance(price_data, list):
+            price_data = np.array(price_data, dtype=np.float32)
+        if self.workspace is None or not isinstance(price_data, np.ndarray):
+            return self.xp.asarray(price_data, dtype=self.xp.float32)
+        if self.gpu_enabled:
+            prices_gpu = self.workspace.get('prices', price_data.shape)
+            prices_gpu.set(np.ascontiguousarray(price_data, dtype=np.float32))
+            return prices_gpu
+        if price_data.dtype == np.float32:
+            return price_data
+        prices = self.workspace.get('prices', price_data.shape)
+        np.copyto(prices, price_data, casting='same_kind')
+        return prices
+    
+    def _to_host(self, data, out=None):
+        """Bring backend arrays (or a tuple of them) back to NumPy, into out= when given"""
+        if isinstance(data, tuple):
+            return tuple(self._to_host(array, None if out is None else out[i]) for i, array in enumerate(data))
+        if not self.gpu_enabled:
+            return data
+        return self.cp.asnumpy(data) if out is None else data.get(out=out)
+    
+    def _dispatch(self, kernel: str, price_data, span=None):
+        """Backend the tuning profile picks for this call shape, or None to run here"""
+        if self.profile is None:
+            return None
+        shape = np.shape(price_data)
+        name = self.profile.best_backend(kernel, shape[0], shape[1])
+        if name is None or name == self.backend_name:
+            return None
+        cache_hit = name in self._backends
+        if not cache_hit:
+            from backend_autotuner import create_backend
+            self._backends[name] = create_backend(name)
+        if span is not None:
+            span.set('dispatched_to', name)
+            span.set('backend_cache_hit', cache_hit)
+        return self._backends[name]
+    
+    def _span(self, operation: str, price_data):
+        """Instrumentation span for one batch call (shared no-op unless instrumentation is enabled)"""
+        if not instrumentation.enabled():
+            return instrumentation.NOOP_SPAN
+        return instrumentation.span(f"indicators.{operation}", operation=operation, backend=self.backend_name,
+                                    **instrumentation.array_attributes(price_data))
+    
+    def _sync(self):
+        """Wait for queued GPU kernels so compute time is attributed correctly"""
+        if self.gpu_enabled:
+            self.cp.cuda.Stream.null.synchronize()
+    
+    def _finish_span(self, span, prices_gpu, outputs):
+        """Record bytes moved to/from the backend and memory-pool usage"""
+        if span is instrumentation.NOOP_SPAN:
+            return
+        span.add_bytes(prices_gpu.nbytes + sum(output.nbytes for output in outputs))
+        if self.gpu_enabled:
+            span.set('pool_used_bytes', int(self.mempool.used_bytes()))
+            span.set('pool_total_bytes', int(self.mempool.total_bytes()))
+    
+    def rsi_batch(self, price_data: Union[np.ndarray, List[List[float]]], period: int = 14,
+                  out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Calculate RSI for multiple symbols in parallel on GPU
+        
+        Args:
+            price_data: 2D array where each row is a symbol's price history
+            period: RSI period (default 14)
+            out: Optional float32 array of the price shape to write the result into
+            
+        Returns:
+            2D array of RSI values for each symbol
+        """
+        with self._span('rsi', price_data) as span:
+            backend = self._dispatch('rsi', price_data, span)
+            if backend is not None:
+                return backend.rsi_batch(price_data, period, out=out)
+            
+            # Transfer to GPU
+            with span.phase('transfer'):
+                prices_gpu = self._to_device(price_data)
+            
+            with span.phase('compute', self._sync):
+                rsi_values = self._rsi_gpu(prices_gpu, period, out=self._output('rsi', out, prices_gpu.shape))
+            
+            # Transfer back to CPU
+            with span.phase('transfer'):
+                result = self._to_host(rsi_values, out)
+            self._finish_span(span, prices_gpu, (rsi_values,))
+            return result
+    
+    def bollinger_bands_batch(self, price_data: Union[np.ndarray, List[List[float]]], 
+                            period: int = 20, std_multiplier: float = 2.0,
+                            out: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate Bollinger Bands for multiple symbols in parallel on GPU
+        
+        Args:
+            price_data: 2D array where each row is a symbol's price history
+            period: Moving average period (default 20)
+            std_multiplier: Standard deviation multiplier (default 2.0)
+            out: Optional (upper, middle, lower) float32 arrays of the price shape to write into
+            
+        Returns:
+            Tuple of (upper_band, middle_band, lower_band) arrays
+        """
+        with self._span('bollinger', price_data) as span:
+            backend = self._dispatch('bollinger', price_data, span)
+            if backend is not None:
+                return backend.bollinger_bands_batch(price_data, period, std_multiplier, out=out)
+            
+            # Transfer to GPU
+            with span.phase('transfer'):
+                prices_gpu = self._to_device(price_data)
+            
+            with span.phase('compute', self._sync):
+                bands = self._bollinger_gpu(prices_gpu, period, std_multiplier,
+                                            out=self._output('bollinger', out, prices_gpu.shape))
+            
+            # Transfer back to CPU
+            with span.phase('transfer'):
+                result = self._to_host(bands, out)
+            self._finish_span(span, prices_gpu, bands)
+            return result
+    
+    def macd_batch(self, price_data: Union[np.ndarray, List[List[float]]], 
+                   fast_period: int = 12, slow_period: int = 26, signal_period: int = 9,
+                   out: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate MACD for multiple symbols in parallel on GPU
+        
+        Args:
+            price_data: 2D array where each row is a symbol's price history
+            fast_period: Fast EMA period (default 12)
+            slow_period: Slow EMA period (default 26)
+            signal_period: Signal line EMA period (default 9)
+            out: Optional (macd, signal, histogram) float32 arrays of the price shape to write into
+            
+        Returns:
+            Tuple of (macd_line, signal_line, histogram) arrays
+        """
+        with self._span('macd', price_data) as span:
+            backend = self._dispatch('macd', price_data, span)
+            if backend is not None:
+                return backend.macd_batch(price_data, fast_period, slow_period, signal_period, out=out)
+            
+            # Transfer to GPU
+            with span.phase('transfer'):
+                prices_gpu = self._to_device(price_data)
+            
+            with span.phase('compute', self._sync):
+                lines = self._macd_gpu(prices_gpu, fast_period, slow_period, signal_period,
+                                       out=self._output('macd', out, prices_gpu.shape))
+            
+            # Transfer back to CPU
+            with span.phase('transfer'):
+                result = self._to_host(lines, out)
+            self._finish_span(span, prices_gpu, lines)
+            return result
+    
+    def sma_batch(self, price_data: Union[np.ndarray, List[List[float]]], period: int = 20,
+                  out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Calculate simple moving averages for multiple symbols in parallel on GPU
+        
+        Args:
+            price_data: 2D array where each row is a symbol's price history
+            period: Moving average period (default 20)
+            out: Optional float32 array of the price shape to write the result into
+            
+        Returns:
+            2D array of SMA values (NaN until the window is full)
+        """
+        with self._span('sma', price_data) as span:
+            backend = self._dispatch('sma', price_data, span)
+            if backend is not None:
+                return backend.sma_batch(price_data, period, out=out)
+            with span.phase('transfer'):
+                prices_gpu = self._to_device(price_data)
+            with span.phase('compute', self._sync):
+                sma = self._sma_gpu(prices_gpu, period, out=self._output('sma', out, prices_gpu.shape))
+            with span.phase('transfer'):
+                result = self._to_host(sma, out)
+            self._finish_span(span, prices_gpu, (sma,))
+            return result
+    
+    def signals_batch(self, price_data: Union[np.ndarray, List[List[float]]],
+                      rules: Optional[List[Dict]] = None, rsi_period: int = 14,
+                      bb_period: int = 20, bb_std_multiplier: float = 2.0,
+                      macd_periods: Tuple[int, int, int] = (12, 26, 9)) -> Dict[str, np.ndarray]:
+        """
+        Evaluate a declarative signal rule set over the whole batch on GPU
+        
+        Only the indicators referenced by the rules are computed, each on the backend
+        the tuning profile picks for it (as in the *_batch methods), and only the
+        compact event arrays are transferred back (not the full indicator series).
+        
+        Args:
+            price_data: 2D array where each row is a symbol's price history
+            rules: Signal rules (default DEFAULT_SIGNAL_RULES), see extract_signals
+            rsi_period: RSI period for the 'rsi' series
+            bb_period: Bollinger period for the 'bb_*' series
+            bb_std_multiplier: Bollinger standard deviation multiplier
+            macd_periods: (fast, slow, signal) periods for the 'macd*' series
+            
+        Returns:
+            Dict of event arrays: symbol, bar, signal, strength (plus signal_names)
+        """
+        rules = DEFAULT_SIGNAL_RULES if rules is None else rules
+        validate_rules(rules)
+        with self._span('signals', price_data) as span:
+            with span.phase('transfer'):
+                prices_gpu = self._to_device(price_data)
+            
+            needed = set()
+            for rule in rules:
+                needed.update(_rule_series(rule))
+            
+            with span.phase('compute', self._sync):
+                shape = prices_gpu.shape
+                series = {'close': prices_gpu}
+                dispatched = {}
+                if 'rsi' in needed:
+                    series['rsi'] = self._signal_series(
+                        'rsi', price_data, dispatched,
+                        lambda: self._rsi_gpu(prices_gpu, rsi_period, out=self._buffer('signals.rsi', shape)),
+                        lambda backend: backend.rsi_batch(price_data, rsi_period))
+                if needed & {'bb_upper', 'bb_middle', 'bb_lower'}:
+                    series['bb_upper'], series['bb_middle'], series['bb_lower'] = self._signal_series(
+                        'bollinger', price_data, dispatched,
+                        lambda: self._bollinger_gpu(
+                            prices_gpu, bb_period, bb_std_multiplier,
+                            out=tuple(self._buffer(f'signals.{name}', shape) for name in ('bb_upper', 'bb_middle', 'bb_lower'))),
+                        lambda backend: backend.bollinger_bands_batch(price_data, bb_period, bb_std_multiplier))
+                if needed & {'macd', 'macd_signal', 'macd_histogram'}:
+                    series['macd'], series['macd_signal'], series['macd_histogram'] = self._signal_series(
+                        'macd', price_data, dispatched,
+                        lambda: self._macd_gpu(
+                            prices_gpu, *macd_periods,
+                            out=tuple(self._buffer(f'signals.{name}', shape) for name in ('macd', 'macd_signal', 'macd_histogram'))),
+                        lambda backend: backend.macd_batch(price_data, *macd_periods))
+                for name in needed:
+                    period = sma_period(name)
+                    if period is not None and name not in series:
+                        series[name] = self._signal_series(
+                            'sma', price_data, dispatched,
+                            lambda: self._sma_gpu(prices_gpu, period, out=self._buffer(f'signals.{name}', shape)),
+                            lambda backend: backend.sma_batch(price_data, period))
+                if dispatched:
+                    span.set('dispatched_to', ','.join(f'{kernel}:{backend}' for kernel, backend in dispatched.items()))
+                
+                events = _extract_signals(self.xp, series, rules)
+            with span.phase('transfer'):
+                events = {key: self._to_host(value) for key, value in events.items()}
+            self._finish_span(span, prices_gpu, tuple(events.values()))
+            span.set('events', int(events['symbol'].size))
+            events['signal_names'] = [rule['name'] for rule in rules]
+            return events
+    
+    def _signal_series(self, kernel: str, price_data, dispatched: Dict, local, remote):
+        """
+        One indicator for signals_batch, on the backend the tuning profile picks for it
+        
+        Dispatched results come back as host arrays and are moved onto this backend so the
+        rule evaluation runs in one place.
+        """
+        backend = self._dispatch(kernel, price_data)
+        if backend is None:
+            return local()
+        dispatched[kernel] = backend.backend_name
+        result = remote(backend)
+        if isinstance(result, tuple):
+            return tuple(self.xp.asarray(array) for array in result)
+        return self.xp.asarray(result)
+    
+    def _rsi_gpu(self, prices_gpu, period: int, out=None):
+        """Calculate RSI on GPU (Wilder smoothing run in place over the gain/loss arrays)"""
+        xp = self.xp
+        batch_size, data_length = prices_gpu.shape
+        rsi_values = xp.empty((batch_size, data_length), dtype=xp.float32) if out is None else out
+        rsi_values[:, :period + 1] = xp.nan
+        if data_length <= period:
+            return rsi_values
+        
+        # Separate gains and losses of the price differences
+        shape = (batch_size, data_length - 1)
+        gains = self._buffer('rsi.gains', shape)
+        losses = self._buffer('rsi.losses', shape)
+        flat = self._buffer('rsi.flat', shape, np.bool_)
+        xp.subtract(prices_gpu[:, 1:], prices_gpu[:, :-1], out=gains)
+        xp.negative(gains, out=losses)
+        for moves in (gains, losses):
+            xp.greater(moves, 0, out=flat)
+            xp.logical_not(flat, out=flat)
+            xp.copyto(moves, 0, where=flat)
+        
+        # Column j ends up holding the average gain/loss at bar j + 1: the SMA seed at
+        # period - 1, then avg[j] = alpha * move[j] + (1 - alpha) * avg[j - 1]
+        alpha = 1.0 / period
+        decayed = self._buffer('rsi.decayed', (batch_size,))
+        for moves in (gains, losses):
+            xp.mean(moves[:, :period], axis=1, out=decayed)
+            moves[:, period - 1] = decayed
+            moves[:, period:] *= alpha
+            for j in range(period, data_length - 1):
+                xp.multiply(moves[:, j - 1], 1 - alpha, out=decayed)
+                moves[:, j] += decayed
+        
+        # RSI = 100 - 100 / (1 + avg_gain / avg_loss) over all bars at once
+        rsi = rsi_values[:, period:]
+        average_losses = losses[:, period - 1:]
+        average_losses += 1e-10  # Add small epsilon to avoid division by zero
+        xp.divide(gains[:, period - 1:], average_losses, out=rsi)
+        rsi += 1
+        xp.divide(100, rsi, out=rsi)
+        xp.subtract(100, rsi, out=rsi)
+        return rsi_values
+    
+    def _bollinger_gpu(self, prices_gpu, period: int, std_multiplier: float, out=None):
+        """Calculate Bollinger Bands on GPU from cumulative sums of (price - first price) and its square"""
+        xp = self.xp
+        batch_size, data_length = prices_gpu.shape
+        if out is None:
+            out = tuple(xp.empty((batch_size, data_length), dtype=xp.float32) for _ in range(3))
+        upper_band, middle_band, lower_band = out
+        for band in out:
+            band[:, :period - 1] = xp.nan
+        if data_length < period:
+            return upper_band, middle_band, lower_band
+        
+        # Shifting by the first price keeps the float64 sums of squares well conditioned
+        windows = (batch_size, data_length - period + 1)
+        shifted = self._buffer('bollinger.shifted', (batch_size, data_length), np.float64)
+        cumulative = self._buffer('bollinger.cumulative', (batch_size, data_length + 1), np.float64)
+        mean = self._buffer('bollinger.mean', windows, np.float64)
+        std = self._buffer('bollinger.std', windows, np.float64)
+        xp.subtract(prices_gpu, prices_gpu[:, :1], out=shifted, dtype=np.float64)
+        cumulative[:, 0] = 0
+        
+        xp.cumsum(shifted, axis=1, out=cumulative[:, 1:])
+        xp.subtract(cumulative[:, period:], cumulative[:, :-period], out=mean)
+        mean /= period
+        xp.square(shifted, out=shifted)
+        xp.cumsum(shifted, axis=1, out=cumulative[:, 1:])
+        xp.subtract(cumulative[:, period:], cumulative[:, :-period], out=std)
+        std /= period
+        
+        # Population standard deviation, clamped against rounding below zero
+        mean_squared = shifted[:, :windows[1]]
+        xp.square(mean, out=mean_squared)
+        std -= mean_squared
+        xp.maximum(std, 0, out=std)
+        xp.sqrt(std, out=std)
+        std *= std_multiplier
+        mean += prices_gpu[:, :1]
+        
+        xp.copyto(middle_band[:, period - 1:], mean, casting='same_kind')
+        xp.add(mean, std, out=upper_band[:, period - 1:])
+        xp.subtract(mean, std, out=lower_band[:, period - 1:])
+        return upper_band, middle_band, lower_band
+    
+    def _macd_gpu(self, prices_gpu, fast_period: int, slow_period: int, signal_period: int, out=None):
+        """Calculate MACD on GPU"""
+        xp = self.xp
+        if out is None:
+            out = tuple(xp.empty(prices_gpu.shape, dtype=xp.float32) for _ in range(3))
+        macd_line, signal_line, histogram = out
+        
+        # Calculate EMAs
+        fast_ema = self._ema_gpu(prices_gpu, fast_period, out=self._buffer('macd.fast', prices_gpu.shape))
+        slow_ema = self._ema_gpu(prices_gpu, slow_period, out=self._buffer('macd.slow', prices_gpu.shape))
+        
+        # MACD line, signal line (EMA of MACD) and histogram
+        xp.subtract(fast_ema, slow_ema, out=macd_line)
+        self._ema_gpu(macd_line, signal_period, out=signal_line)
+        xp.subtract(macd_line, signal_line, out=histogram)
+        
+        return macd_line, signal_line, histogram
+    
+    def _sma_gpu(self, data, period: int, out=None):
+        """Calculate SMA on GPU with a cumulative-sum window"""
+        xp = self.xp
+        batch_size, data_length = data.shape
+        sma = xp.empty_like(data) if out is None else out
+        sma[:, :period - 1] = xp.nan
+        if data_length >= period:
+            widened = self._buffer('sma.widened', (batch_size, data_length), np.float64)
+            cumulative = self._buffer('sma.cumulative', (batch_size, data_length + 1), np.float64)
+            window_sums = self._buffer('sma.window_sums', (batch_size, data_length - period + 1), np.float64)
+            xp.copyto(widened, data)  # cumsum(dtype=float64) would cast through a full temporary
+            cumulative[:, 0] = 0
+            xp.cumsum(widened, axis=1, out=cumulative[:, 1:])
+            xp.subtract(cumulative[:, period:], cumulative[:, :-period], out=window_sums)
+            xp.divide(window_sums, period, out=sma[:, period - 1:])
+        return sma
+    
+    def _ema_gpu(self, data, period: int, out=None):
+        """Calculate EMA on GPU"""
+        xp = self.xp
+        alpha = 2.0 / (period + 1)
+        ema = xp.empty_like(data) if out is None else out
+        
+        # Scale the inputs once, then each bar is one multiply-add into the output column
+        scaled = self._buffer('ema.scaled', data.shape, data.dtype)
+        xp.multiply(data, alpha, out=scaled)
+        ema[:, 0] = data[:, 0]
+        for i in range(1, data.shape[1]):
+            xp.multiply(ema[:, i-1], 1 - alpha, out=ema[:, i])
+            ema[:, i] += scaled[:, i]
+        
+        return ema
+
+# Declarative signal rules evaluated by signals_batch / extract_signals:
+#   threshold: `series` crosses `level` ('below' or 'above')
+#   crossover: `series` crosses `reference` series ('above' or 'below')
+#   band_touch: `series` closes beyond `reference` band ('below' or 'above')
+# `confirm_bars` requires the condition to hold that many bars; the event is
+# reported on the confirming bar. Strength is the distance past the level/reference,
+# relative to the reference or, with 'scale': 'close', to the price.
+DEFAULT_SIGNAL_RULES = [
+    {'name': 'rsi_oversold', 'type': 'threshold', 'series': 'rsi', 'level': 30, 'direction': 'below'},
+    {'name': 'rsi_overbought', 'type': 'threshold', 'series': 'rsi', 'level': 70, 'direction': 'above'},
+    {'name': 'sma_golden_cross', 'type': 'crossover', 'series': 'sma20', 'reference': 'sma50', 'direction': 'above'},
+    {'name': 'sma_death_cross', 'type': 'crossover', 'series': 'sma20', 'reference': 'sma50', 'direction': 'below'},
+    {'name': 'bb_lower_break', 'type': 'band_touch', 'series': 'close', 'reference': 'bb_lower', 'direction': 'below'},
+    {'name': 'bb_upper_break', 'type': 'band_touch', 'series': 'close', 'reference': 'bb_upper', 'direction': 'above'},
+    {'name': 'macd_bullish_cross', 'type': 'crossover', 'series': 'macd', 'reference': 'macd_signal', 'direction': 'above', 'scale': 'close'},
+    {'name': 'macd_bearish_cross', 'type': 'crossover', 'series': 'macd', 'reference': 'macd_signal', 'direction': 'below', 'scale': 'close'}
+]
+
+RULE_TYPES = ('threshold', 'crossover', 'band_touch')
+DEFAULT_SMA_PERIOD = 20
+INDICATOR_SERIES = ('close', 'rsi', 'bb_upper', 'bb_middle', 'bb_lower', 'macd', 'macd_signal', 'macd_histogram')
+_SMA_SERIES = re.compile(r'sma(?:_?(\d+))?')
+
+def sma_period(name: str) -> Optional[int]:
+    """
+    Period of an SMA series name: 'sma' (DEFAULT_SMA_PERIOD), 'sma50' or 'sma_50'
+    
+    Returns None for names that are not SMA series; raises ValueError for malformed
+    ones such as 'sma_' or 'sma_fast'.
+    """
+    if not name.startswith('sma'):
+        return None
+    match = _SMA_SERIES.fullmatch(name)
+    if match is None or (match.group(1) is not None and int(match.group(1)) < 1):
+        raise ValueError(f"Malformed SMA series {name!r}: expected 'sma', 'sma<period>' or 'sma_<period>'")
+    return int(match.group(1)) if match.group(1) else DEFAULT_SMA_PERIOD
+
+def _rule_series(rule: Dict) -> List[str]:
+    """Series names a rule reads"""
+    names = [rule['series']] + ([rule['reference']] if 'reference' in rule else [])
+    return names + (['close'] if rule.get('scale') == 'close' else [])
+
+def validate_rules(rules: List[Dict]):
+    """Reject rules whose series cannot be computed here before any indicator work is done"""
+    for rule in rules:
+        label = rule.get('name', rule.get('series'))
+        if rule.get('type') not in RULE_TYPES:
+            raise ValueError(f"Signal rule {label!r}: type must be one of {', '.join(RULE_TYPES)}, got {rule.get('type')!r}")
+        if rule.get('direction') not in ('above', 'below'):
+            raise ValueError(f"Signal rule {label!r}: direction must be 'above' or 'below'")
+        if 'reference' not in rule and 'level' not in rule:
+            raise ValueError(f"Signal rule {label!r}: needs a 'reference' series or a 'level'")
+        for name in _rule_series(rule):
+            try:
+                period = sma_period(name)
+            except ValueError as exc:
+                raise ValueError(f"Signal rule {label!r}: {exc}") from None
+            if period is None and name not in INDICATOR_SERIES:
+                raise ValueError(f"Signal rule {label!r}: unknown series {name!r}")
+
+def _extract_signals(xp, series: Dict, rules: List[Dict]) -> Dict:
+    """Evaluate rules with the given array module (NumPy or CuPy)"""
+    symbols, bars, types, strengths = [], [], [], []
+    
+    for signal_type, rule in enumerate(rules):
+        values = series[rule['series']]
+        reference = series[rule['reference']] if 'reference' in rule else xp.full_like(values, rule['level'])
+        confirm = max(1, int(rule.get('confirm_bars', 1)))
+        
+        if rule['direction'] == 'below':
+            condition = values < reference
+        else:
+            condition = values > reference
+        valid = ~(xp.isnan(values) | xp.isnan(reference))
+        
+        if rule['type'] == 'band_touch' and confirm == 1:
+            # Every bar beyond the band, not just the first
+            event = condition & valid
+        else:
+            # Condition held for `confirm` bars after a valid bar where it did not hold
+            run = xp.cumsum(condition, axis=1)
+            event = xp.zeros_like(condition)
+            held = run[:, confirm:] - run[:, :-confirm] == confirm
+            before = ~condition[:, :-confirm] & valid[:, :-confirm]
+            event[:, confirm:] = held & before & valid[:, confirm:]
+        
+        symbol_idx, bar_idx = xp.nonzero(event)
+        diff = xp.abs(values[symbol_idx, bar_idx] - reference[symbol_idx, bar_idx])
+        scale_series = series['close'] if rule.get('scale') == 'close' else reference
+        scale = xp.abs(scale_series[symbol_idx, bar_idx]) + 1e-10
+        
+        symbols.append(symbol_idx.astype(xp.int32))
+        bars.append(bar_idx.astype(xp.int32))
+        types.append(xp.full(symbol_idx.shape, signal_type, dtype=xp.int16))
+        strengths.append((diff / scale).astype(xp.float32))
+    
+    symbol = xp.concatenate(symbols) if symbols else xp.zeros(0, dtype=xp.int32)
+    bar = xp.concatenate(bars) if bars else xp.zeros(0, dtype=xp.int32)
+    order = xp.lexsort(xp.stack([bar, symbol])) if symbol.size else xp.zeros(0, dtype=xp.int64)
+    return {
+        'symbol': symbol[order],
+        'bar': bar[order],
+        'signal': (xp.concatenate(types) if types else xp.zeros(0, dtype=xp.int16))[order],
+        'strength': (xp.concatenate(strengths) if strengths else xp.zeros(0, dtype=xp.float32))[order]
+    }
+
+def extract_signals(series: Dict[str, np.ndarray], rules: Optional[List[Dict]] = None) -> Dict[str, np.ndarray]:
+    """
+    Evaluate signal rules over precomputed (symbols x bars) NumPy indicator arrays
+    
+    Args:
+        series: Named arrays ('close', 'rsi', 'sma20', 'bb_lower', 'macd', ...)
+        rules: Signal rules (default DEFAULT_SIGNAL_RULES)
+        
+    Returns:
+        Dict of event arrays sorted by (symbol, bar): symbol (int32), bar (int32),
+        signal (int16 index into rules), strength (float32 relative distance past
+        the level/reference), plus signal_names
+    """
+    rules = DEFAULT_SIGNAL_RULES if rules is None else rules
+    events = _extract_signals(np, {k: np.asarray(v, dtype=np.float64) for k, v in series.items()}, rules)
+    events['signal_names'] = [rule['name'] for rule in rules]
+    return events
+
+def benchmark_rsi_performance():
+    """Benchmark GPU vs CPU RSI calculation performance"""
+    print("=== RSI Performance Benchmark ===")
+    
+    # Generate test data (100 symbols, 1000 price points each)
+    num_symbols = 100
+    data_length = 1000
+    np.random.seed(42)
+    
+    # Simulate price data with realistic movements
+    base_prices = np.random.uniform(50, 200, (num_symbols, 1))
+    returns = np.random.normal(0, 0.02, (num_symbols, data_length - 1))
+    
+    price_data = np.zeros((num_symbols, data_length))
+    price_data[:, 0] = base_prices.flatten()
+    
+    for i in range(1, data_length):
+        price_data[:, i] = price_data[:, i-1] * (1 + returns[:, i-1])
+    
+    # GPU benchmark
+    gpu_indicators = GPUIndicators()
+    
+    # Warmup so the first-call kernel compilation/allocation is not timed
+    gpu_indicators.rsi_batch(price_data[:1], period=14)
+    
+    start_time = time.perf_counter()
+    gpu_rsi = gpu_indicators.rsi_batch(price_data, period=14)
+    gpu_time = time.perf_counter() - start_time
+    
+    print(f"GPU RSI calculation ({num_symbols} symbols, {data_length} points each):")
+    print(f"  Time: {gpu_time:.4f}s")
+    print(f"  Throughput: {num_symbols * data_length / gpu_time:.0f} calculations/second")
+    
+    # Verify results are reasonable
+    final_rsi = gpu_rsi[:, -1]
+    valid_rsi = final_rsi[~np.isnan(final_rsi)]
+    print(f"  Sample RSI values: {valid_rsi[:5].round(2)}")
+    print(f"  RSI range: {valid_rsi.min():.2f} - {valid_rsi.max():.2f}")
+    
+    # Memory cleanup
+    gpu_indicators.clear_memory()
+    
+    return gpu_time
+
+if __name__ == "__main__":
+    print("SignalCartel GPU-Accelerated Indicators Test")
+    print("=" * 50)
+    
+    # Run benchmark
+    gpu_time = benchmark_rsi_performance()
+    
+    print(f"  (full grid, all backends and regression gate: benchmark_suite.py)")
+    
+    print(f"\n✅ GPU indicators module ready!")
+    print(f"🚀 Ready to integrate with SignalCartel trading strategies")
\ No newline at end of file
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Asyncio Request Coalescing for SignalCartel Indicators
+Queues single-symbol indicator requests from many strategies and coalesces those with the
+same indicator, parameters and history length into one GPUIndicators batch call, flushed
+after a latency window or at a maximum batch size, then fans rows back to each caller
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import compute_instrumentation as instrumentation
+from gpu_accelerated_indicators import GPUIndicators
+
+DEFAULT_MAX_BATCH_SIZE = 256
+DEFAULT_MAX_LATENCY_MS = 2.0
+
+# Kernel name -> (GPUIndicators batch method, accepted keyword parameters)
+KERNELS = {
+    'rsi': ('rsi_batch', ('period',)),
+    'bollinger': ('bollinger_bands_batch', ('period', 'std_multiplier')),
+    'macd': ('macd_batch', ('fast_period', 'slow_period', 'signal_period')),
+    'sma': ('sma_batch', ('period',))
+}
+
+
+class IndicatorBatcher:
+    """
+    Micro-batching front-end to GPUIndicators
+
+    Requests coalesce per (kernel, parameters, history length), so every batch is a dense
+    (symbols x length) array. Batches run on a single worker thread to keep the event loop
+    responsive and the device serialized.
+    """
+
+    def __init__(self, indicators: Optional[GPUIndicators] = None,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_latency_ms: float = DEFAULT_MAX_LATENCY_MS,
+                 executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Args:
+            indicators: Engine to batch into (created on demand)
+            max_batch_size: Flush a group as soon as it holds this many requests
+            max_latency_ms: Flush a group this long after its first request arrived
+            executor: Worker for the batch calls (default: one dedicated thread)
+        """
+        self.indicators = indicators or GPUIndicators()
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000.0
+        self.executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix='indicator-batcher')
+
+        self._pending: Dict[Tuple, List[Tuple[np.ndarray, asyncio.Future]]] = {}
+        self._timers: Dict[Tuple, asyncio.TimerHandle] = {}
+        self._inflight = set()
+
+        self.requests = 0
+        self.batches = 0
+        self.max_queue_depth = 0
+        self.batch_size_counts: Dict[int, int] = {}
+
+    @property
+    def queue_depth(self) -> int:
+        """Requests waiting to be flushed"""
+        return sum(len(group) for group in self._pending.values())
+
+    def metrics(self) -> Dict:
+        """Queue depth and batch-size statistics"""
+        sizes = np.array(list(self.batch_size_counts.keys()), dtype=np.float64)
+        counts = np.array(list(self.batch_size_counts.values()), dtype=np.float64)
+        return {
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'pending_groups': len(self._pending),
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch_size': float(sizes @ counts / counts.sum()) if counts.size else 0.0,
+            'max_batch_size': int(sizes.max()) if sizes.size else 0,
+            'batch_size_counts': dict(sorted(self.batch_size_counts.items()))
+        }
+
+    async def request(self, kernel: str, prices, **params):
+        """
+        Compute one symbol's indicator, coalesced with concurrent compatible requests
+
+        Args:
+            kernel: 'rsi', 'bollinger', 'macd' or 'sma'
+            prices: 1D price history
+            params: Indicator parameters (defaults as in GPUIndicators)
+
+        Returns:
+            1D array, or tuple of 1D arrays for multi-output indicators
+        """
+        _, names = KERNELS[kernel]
+        unknown = set(params) - set(names)
+        if unknown:
+            raise TypeError(f"Unknown {kernel} parameters: {sorted(unknown)}")
+        prices = np.asarray(prices, dtype=np.float32).reshape(-1)
+        key = (kernel, tuple(sorted(params.items())), prices.shape[0])
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        group = self._pending.setdefault(key, [])
+        group.append((prices, future))
+        self.requests += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+        if len(group) >= self.max_batch_size:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.max_latency, self._flush, key)
+        return await future
+
+    async def rsi(self, prices, period: int = 14):
+        return await self.request('rsi', prices, period=period)
+
+    async def bollinger(self, prices, period: int = 20, std_multiplier: float = 2.0):
+        return await self.request('bollinger', prices, period=period, std_multiplier=std_multiplier)
+
+    async def macd(self, prices, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        return await self.request('macd', prices, fast_period=fast_period,
+                                  slow_period=slow_period, signal_period=signal_period)
+
+    async def sma(self, prices, period: int = 20):
+        return await self.request('sma', prices, period=period)
+
+    def _flush(self, key: Tuple):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        group = self._pending.pop(key, None)
+        if not group:
+            return
+        task = asyncio.get_running_loop().create_task(self._run_batch(key, group))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _run_batch(self, key: Tuple, group: List[Tuple[np.ndarray, asyncio.Future]]):
+        kernel, params, _ = key
+        method, _ = KERNELS[kernel]
+        params = dict(params)
+        batch = np.stack([prices for prices, _ in group])
+        call = getattr(self.indicators, method)
+
+        size = len(group)
+        self.batches += 1
+        self.batch_size_counts[size] = self.batch_size_counts.get(size, 0) + 1
+
+        def run():
+            with instrumentation.span('indicators.batcher.flush', operation=kernel, batch_size=size):
+                return call(batch, **params)
+
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, run)
+        except Exception as e:
+            for _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for row, (_, future) in enumerate(group):
+            if future.done():  # caller was cancelled
+                continue
+            if isinstance(result, tuple):
+                future.set_result(tuple(series[row] for series in result))
+            else:
+                future.set_result(result[row])
+
+    async def drain(self):
+        """Flush every pending group now and wait for all in-flight batches"""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._inflight:
+            await asyncio.gather(*list(self._inflight), return_exceptions=True)
+
+    async def close(self):
+        await self.drain()
+        self.executor.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    import time
+
+    async def demo():
+        print("SignalCartel Indicator Request Batcher")
+        print("=" * 50)
+
+        rng = np.random.default_rng(42)
+        n_requests, length = 500, 500
+        histories = (100 * np.cumprod(1 + rng.normal(0, 0.01, (n_requests, length)), axis=1)).astype(np.float32)
+        indicators = GPUIndicators()
+
+        start_time = time.perf_counter()
+        for row in histories:
+            indicators.rsi_batch(row.reshape(1, -1), 14)
+        single_elapsed = time.perf_counter() - start_time
+
+        batcher = IndicatorBatcher(indicators, max_batch_size=128, max_latency_ms=2.0)
+
+        async def strategy(i: int):
+            await asyncio.sleep(rng.uniform(0, 0.005))  # strategies arrive within a few ms
+            return await batcher.rsi(histories[i])
+
+        start_time = time.perf_counter()
+        results = await asyncio.gather(*(strategy(i) for i in range(n_requests)))
+        batched_elapsed = time.perf_counter() - start_time
+        await batcher.close()
+
+        expected = indicators.rsi_batch(histories, 14)
+        matches = all(np.allclose(r, e, equal_nan=True) for r, e in zip(results, expected))
+        metrics = batcher.metrics()
+        print(f"{n_requests} single-row calls: {single_elapsed:.3f}s")
+        print(f"{n_requests} coalesced requests: {batched_elapsed:.3f}s in {metrics['batches']} batches "
+              f"(mean size {metrics['mean_batch_size']:.1f}, max queue depth {metrics['max_queue_depth']})")
+        print(f"Results match direct batch: {matches}")
+
+    asyncio.run(demo())
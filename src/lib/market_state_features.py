@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Vectorized market_state Feature Builder for SignalCartel
+Derives the market_state inputs AIStrategy consumes (pattern_strength, bid_ask_pressure,
+transition_prob, risk_reward, momentum, volatility, volume) for every pair and bar
+from OHLCV batches, as one (symbols x bars x features) array
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from gpu_accelerated_indicators import GPUIndicators
+
+FEATURE_NAMES = ('pattern_strength', 'bid_ask_pressure', 'transition_prob', 'risk_reward',
+                 'momentum', 'volatility', 'volume')
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+MINUTES_PER_YEAR = 365 * 24 * 60
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing window sum along the last axis (NaN until the window is full)"""
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < window:
+        return out
+    cumulative = np.cumsum(values, axis=-1, dtype=np.float64)
+    out[..., window-1:] = cumulative[..., window-1:]
+    out[..., window:] -= cumulative[..., :-window]
+    return out
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    return rolling_sum(values, window) / window
+
+
+def _rolling_extreme(values: np.ndarray, window: int, reducer) -> np.ndarray:
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] >= window:
+        out[..., window-1:] = reducer(sliding_window_view(values, window, axis=-1), axis=-1)
+    return out
+
+
+def rolling_dot(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Trailing window dot product with `weights` (oldest bar first) along the last axis
+
+    Accumulated one lag at a time, so every output sums only its own window: no prefix-sum
+    cancellation however long the history. NaN until the window is full.
+    """
+    window = len(weights)
+    out = np.full(values.shape, np.nan)
+    length = values.shape[-1]
+    if length < window:
+        return out
+    acc = out[..., window-1:]
+    acc[...] = 0.0
+    for lag, weight in enumerate(weights):
+        acc += weight * values[..., lag:length-window+1+lag]
+    return out
+
+
+def rolling_regression(values: np.ndarray, window: int):
+    """
+    Rolling least-squares fit of values on window-local time
+
+    Time is centered within each window, so var_t is the constant w(w^2-1)/12 and cov_ty
+    is a dot product with the centered weights.
+
+    Returns:
+        (slope per bar, R^2 in [0, 1], window mean), NaN until the window is full
+    """
+    centered_t = np.arange(window, dtype=np.float64) - (window - 1) / 2
+    var_t = window * (window * window - 1) / 12
+    mean = rolling_dot(values, np.full(window, 1.0 / window))
+    cov_ty = rolling_dot(values, centered_t)
+    var_y = np.maximum(rolling_dot(values * values, np.ones(window)) - window * mean * mean, 0.0)
+
+    slope = cov_ty / var_t
+    denom = var_t * var_y
+    r_squared = np.divide(cov_ty * cov_ty, denom, out=np.zeros_like(denom), where=denom > 0)
+    r_squared[np.isnan(denom)] = np.nan
+    return slope, np.clip(r_squared, 0.0, 1.0), mean
+
+
+def pattern_strength(close: np.ndarray, window: int) -> np.ndarray:
+    """0.5 +- 0.5 * R^2 of a rolling linear fit of log price, signed by the slope"""
+    log_close = np.log(close)
+    slope, r_squared, _ = rolling_regression(log_close - log_close[..., :1], window)
+    return 0.5 + 0.5 * np.sign(slope) * r_squared
+
+
+def bid_ask_pressure(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                     volume: np.ndarray, window: int) -> np.ndarray:
+    """Volume-weighted close location in the bar range (1 = closes at highs, buyers in control)"""
+    bar_range = high - low
+    location = np.divide(close - low, bar_range, out=np.full(close.shape, 0.5), where=bar_range > 0)
+    weighted = rolling_sum(location * volume, window)
+    total_volume = rolling_sum(volume, window)
+    return np.divide(weighted, total_volume, out=np.full(close.shape, 0.5), where=total_volume > 0)
+
+
+def transition_probability(close: np.ndarray, window: int) -> np.ndarray:
+    """Rolling empirical P(next bar up | current bar's direction)"""
+    up = np.zeros(close.shape, dtype=np.float64)
+    up[..., 1:] = np.diff(close, axis=-1) > 0
+    prev_up = np.zeros_like(up)
+    prev_up[..., 1:] = up[..., :-1]
+
+    up_after_up = rolling_sum(up * prev_up, window)
+    up_after_down = rolling_sum(up * (1 - prev_up), window)
+    ups = rolling_sum(prev_up, window)
+    downs = window - ups
+
+    p_up_given_up = np.divide(up_after_up, ups, out=np.full(close.shape, 0.5), where=ups > 0)
+    p_up_given_down = np.divide(up_after_down, downs, out=np.full(close.shape, 0.5), where=downs > 0)
+    result = np.where(up > 0, p_up_given_up, p_up_given_down)
+    result[np.isnan(up_after_up)] = np.nan
+    return result
+
+
+def risk_reward(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int,
+                cap: float = 5.0) -> np.ndarray:
+    """Room to the rolling high over room to the rolling low"""
+    upside = _rolling_extreme(high, window, np.max) - close
+    downside = close - _rolling_extreme(low, window, np.min)
+    ratio = np.divide(upside, downside, out=np.full(close.shape, cap), where=downside > 0)
+    return np.clip(ratio, 0.0, cap)
+
+
+def realized_volatility(close: np.ndarray, window: int, bars_per_year: float) -> np.ndarray:
+    """Annualized rolling standard deviation of log returns"""
+    returns = np.zeros(close.shape)
+    returns[..., 1:] = np.diff(np.log(close), axis=-1)
+    mean = rolling_mean(returns, window)
+    variance = rolling_mean(returns * returns, window) - mean * mean
+    return np.sqrt(np.maximum(variance, 0.0) * bars_per_year)
+
+
+def build_market_state_features(open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+                                close: np.ndarray, volume: np.ndarray, window: int = 20,
+                                rsi_period: int = 14, bars_per_year: float = MINUTES_PER_YEAR,
+                                indicators: Optional[GPUIndicators] = None,
+                                orderbook_pressure: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compute every market_state feature for every pair and bar
+
+    Args:
+        open_, high, low, close, volume: (symbols x bars) OHLCV arrays
+        window: Rolling window for pattern, pressure, transition, risk/reward, volatility, volume
+        rsi_period: RSI period for momentum
+        bars_per_year: Annualization factor for volatility (default: 1m bars)
+        indicators: GPUIndicators instance to reuse (created on demand)
+        orderbook_pressure: Optional (symbols x bars) L2 imbalance in [0, 1] that replaces
+            the OHLCV pressure proxy
+
+    Returns:
+        (symbols x bars x len(FEATURE_NAMES)) float32 array; NaN during warmup
+    """
+    close = np.asarray(close, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    indicators = indicators or GPUIndicators()
+
+    features = np.empty(close.shape + (len(FEATURE_NAMES),), dtype=np.float32)
+    features[..., FEATURE_INDEX['pattern_strength']] = pattern_strength(close, window)
+    features[..., FEATURE_INDEX['bid_ask_pressure']] = (
+        orderbook_pressure if orderbook_pressure is not None
+        else bid_ask_pressure(high, low, close, volume, window))
+    features[..., FEATURE_INDEX['transition_prob']] = transition_probability(close, window)
+    features[..., FEATURE_INDEX['risk_reward']] = risk_reward(high, low, close, window)
+    features[..., FEATURE_INDEX['momentum']] = indicators.rsi_batch(close, period=rsi_period) / 100.0
+    features[..., FEATURE_INDEX['volatility']] = realized_volatility(close, window, bars_per_year)
+    # Quote-currency volume per bar, the scale the proofs sample from
+    features[..., FEATURE_INDEX['volume']] = rolling_mean(volume * close, window)
+    return features
+
+
+def to_market_states(features: np.ndarray, bar: int = -1) -> List[Dict]:
+    """Per-symbol market_state dicts at one bar, for AIStrategy.generate_signal"""
+    snapshot = features[:, bar, :]
+    return [{name: float(row[i]) for i, name in enumerate(FEATURE_NAMES)} for row in snapshot]
+
+
+if __name__ == "__main__":
+    import time
+
+    print("SignalCartel market_state Feature Builder")
+    print("=" * 50)
+
+    rng = np.random.default_rng(42)
+    n_symbols, n_bars = 100, 1000
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.002, (n_symbols, n_bars)), axis=1)
+    open_ = np.roll(close, 1, axis=1)
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.001, close.shape))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.001, close.shape))
+    volume = rng.lognormal(8, 1, close.shape)
+
+    start_time = time.perf_counter()
+    features = build_market_state_features(open_, high, low, close, volume)
+    elapsed = time.perf_counter() - start_time
+
+    print(f"Built {features.shape} features in {elapsed:.3f}s")
+    for name, value in to_market_states(features)[0].items():
+        print(f"  {name:18}: {value:.4f}")
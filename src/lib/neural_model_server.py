@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Persistent Batched Neural Strategy Model for SignalCartel
+Keeps the GPU neural strategy's 2-layer network loaded (and saved as compact .npz),
+runs one batched forward pass for many symbols, and trains on accumulated features on CPU
+"""
+import json
+import os
+import sys
+import time
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+import compute_instrumentation as instrumentation
+from gpu_accelerated_indicators import get_cupy, gpu_available
+
+SIGNALS = np.array([1, 0, -1], dtype=np.int8)  # Output order: BUY, HOLD, SELL
+BUY, HOLD, SELL = 0, 1, 2
+
+
+class NeuralModel:
+    """2-layer ReLU/sigmoid network with the same layout as gpu-neural-strategy.ts"""
+
+    def __init__(self, input_size: int = 7, hidden_size: int = 64, output_size: int = 3,
+                 seed: int = 42, use_gpu: Optional[bool] = None):
+        """
+        Args:
+            input_size: Features per row (7 for buildFeatureMatrix)
+            hidden_size: Hidden units (config.neuralLayers[0])
+            output_size: BUY/HOLD/SELL
+            seed: Initialization seed (same draw order as the inline TS script)
+            use_gpu: Run inference with CuPy; autodetect when None
+        """
+        rng = np.random.RandomState(seed)
+        self.W1 = (rng.randn(input_size, hidden_size) * 0.1).astype(np.float32)
+        self.b1 = (rng.randn(hidden_size) * 0.1).astype(np.float32)
+        self.W2 = (rng.randn(hidden_size, output_size) * 0.1).astype(np.float32)
+        self.b2 = (rng.randn(output_size) * 0.1).astype(np.float32)
+        self.feature_mean = np.zeros(input_size, dtype=np.float32)
+        self.feature_std = np.ones(input_size, dtype=np.float32)
+        self.trained_samples = 0
+
+        self.gpu_enabled = gpu_available() if use_gpu is None else use_gpu
+        self.xp = get_cupy() if self.gpu_enabled else np
+        self._sync_device()
+
+    @property
+    def input_size(self) -> int:
+        return self.W1.shape[0]
+
+    def _sync_device(self):
+        """Upload weights once; inference reuses the device copies"""
+        xp = self.xp
+        self._device = {name: xp.asarray(getattr(self, name))
+                        for name in ('W1', 'b1', 'W2', 'b2', 'feature_mean', 'feature_std')}
+
+    def save(self, path: str):
+        """Persist weights and normalization as a compact binary .npz"""
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, W1=self.W1, b1=self.b1, W2=self.W2, b2=self.b2,
+                 feature_mean=self.feature_mean, feature_std=self.feature_std,
+                 trained_samples=np.int64(self.trained_samples))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, use_gpu: Optional[bool] = None) -> 'NeuralModel':
+        with np.load(path) as data:
+            model = cls(data['W1'].shape[0], data['W1'].shape[1], data['W2'].shape[1], use_gpu=use_gpu)
+            for name in ('W1', 'b1', 'W2', 'b2', 'feature_mean', 'feature_std'):
+                setattr(model, name, data[name].astype(np.float32))
+            model.trained_samples = int(data['trained_samples'])
+        model._sync_device()
+        return model
+
+    def _forward(self, xp, X, params: Dict):
+        z1 = (X - params['feature_mean']) / params['feature_std'] @ params['W1'] + params['b1']
+        a1 = xp.maximum(0, z1)
+        z2 = a1 @ params['W2'] + params['b2']
+        # Clip keeps float32 exp finite; the sigmoid is saturated well before +-50
+        return 1 / (1 + xp.exp(-xp.clip(z2, -50, 50))), a1
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """Probabilities for an (..., input_size) feature array in one forward pass"""
+        xp = self.xp
+        X = xp.asarray(features, dtype=xp.float32)
+        probabilities, _ = self._forward(xp, X.reshape(-1, self.input_size), self._device)
+        probabilities = probabilities.reshape(X.shape[:-1] + (-1,))
+        return self.xp.asnumpy(probabilities) if self.gpu_enabled else probabilities
+
+    def predict_batch(self, feature_matrices: Union[np.ndarray, Sequence[np.ndarray]],
+                      last_n: int = 5) -> Dict[str, np.ndarray]:
+        """
+        Score the latest rows of many symbols' feature matrices at once
+
+        Args:
+            feature_matrices: (symbols x rows x features) array, or a list of
+                (rows x features) matrices of differing lengths
+            last_n: Trailing rows scored per symbol (the TS strategy uses 5)
+
+        Returns:
+            Dict of (symbols x last_n) predictions (-1/0/1) and confidence scores, plus
+            per-symbol model accuracy (mean max probability) and a valid-row mask
+        """
+        if isinstance(feature_matrices, np.ndarray) and feature_matrices.ndim == 3:
+            block = feature_matrices[:, -last_n:, :]
+            valid = np.ones(block.shape[:2], dtype=bool)
+        else:
+            block = np.zeros((len(feature_matrices), last_n, self.input_size), dtype=np.float32)
+            valid = np.zeros((len(feature_matrices), last_n), dtype=bool)
+            for i, matrix in enumerate(feature_matrices):
+                tail = np.asarray(matrix, dtype=np.float32)[-last_n:]
+                if len(tail):
+                    block[i, last_n - len(tail):] = tail
+                    valid[i, last_n - len(tail):] = True
+
+        probabilities = self.predict_proba(block)
+        best = probabilities.argmax(axis=-1)
+        confidence = probabilities.max(axis=-1)
+        counts = np.maximum(valid.sum(axis=1), 1)
+        return {
+            'predictions': np.where(valid, SIGNALS[best], 0),
+            'confidence_scores': np.where(valid, confidence, 0.0),
+            'model_accuracy': (confidence * valid).sum(axis=1) / counts,
+            'valid': valid
+        }
+
+    def feature_importance(self) -> np.ndarray:
+        return np.mean(np.abs(self.W1), axis=1)
+
+    def train(self, features: np.ndarray, labels: np.ndarray, epochs: int = 50,
+              learning_rate: float = 0.05, batch_size: int = 256, l2: float = 1e-4,
+              seed: int = 0) -> float:
+        """
+        CPU mini-batch gradient descent (sigmoid outputs, binary cross-entropy on one-hot labels)
+
+        Args:
+            features: (samples x input_size) accumulated feature rows
+            labels: (samples,) class indices (BUY=0, HOLD=1, SELL=2)
+
+        Returns:
+            Final training loss
+        """
+        X = np.asarray(features, dtype=np.float32)
+        Y = np.eye(self.W2.shape[1], dtype=np.float32)[np.asarray(labels, dtype=np.int64)]
+
+        # Normalization is refit on the (accumulated) training rows
+        self.feature_mean = X.mean(axis=0).astype(np.float32)
+        std = X.std(axis=0)
+        self.feature_std = np.where(std > 1e-6, std, 1.0).astype(np.float32)
+
+        params = {'W1': self.W1, 'b1': self.b1, 'W2': self.W2, 'b2': self.b2,
+                  'feature_mean': self.feature_mean, 'feature_std': self.feature_std}
+        rng = np.random.default_rng(seed)
+        loss = 0.0
+        for _ in range(epochs):
+            order = rng.permutation(len(X))
+            for start in range(0, len(X), batch_size):
+                idx = order[start:start + batch_size]
+                Xb = (X[idx] - self.feature_mean) / self.feature_std
+                probabilities, hidden = self._forward(np, X[idx], params)
+                grad_z2 = (probabilities - Y[idx]) / len(idx)
+                grad_W2 = hidden.T @ grad_z2 + l2 * self.W2
+                grad_hidden = (grad_z2 @ self.W2.T) * (hidden > 0)
+                grad_W1 = Xb.T @ grad_hidden + l2 * self.W1
+                self.W2 -= learning_rate * grad_W2
+                self.b2 -= learning_rate * grad_z2.sum(axis=0)
+                self.W1 -= learning_rate * grad_W1
+                self.b1 -= learning_rate * grad_hidden.sum(axis=0)
+
+            probabilities, _ = self._forward(np, X, params)
+            clipped = np.clip(probabilities, 1e-7, 1 - 1e-7)
+            loss = float(-np.mean(Y * np.log(clipped) + (1 - Y) * np.log(1 - clipped)))
+
+        self.trained_samples += len(X)
+        self._sync_device()
+        return loss
+
+
+class FeatureBuffer:
+    """Fixed-capacity ring buffer of (features, label) rows accumulated for retraining"""
+
+    def __init__(self, capacity: int, input_size: int):
+        self.features = np.zeros((capacity, input_size), dtype=np.float32)
+        self.labels = np.zeros(capacity, dtype=np.int8)
+        self.capacity = capacity
+        self.size = 0
+        self._next = 0
+
+    def append(self, features: np.ndarray, labels: np.ndarray):
+        features = np.asarray(features, dtype=np.float32).reshape(-1, self.features.shape[1])[-self.capacity:]
+        labels = np.asarray(labels).reshape(-1)[-self.capacity:]
+        idx = (self._next + np.arange(len(features))) % self.capacity
+        self.features[idx] = features
+        self.labels[idx] = labels
+        self._next = int((self._next + len(features)) % self.capacity)
+        self.size = min(self.capacity, self.size + len(features))
+
+    def data(self):
+        return self.features[:self.size], self.labels[:self.size]
+
+
+def labels_from_returns(future_returns: np.ndarray, threshold: float = 0.001) -> np.ndarray:
+    """BUY/HOLD/SELL class per row from the realized next-period return"""
+    future_returns = np.asarray(future_returns)
+    return np.where(future_returns > threshold, BUY,
+                    np.where(future_returns < -threshold, SELL, HOLD)).astype(np.int8)
+
+
+def serve(model_path: str, input_size: int = 7, hidden_size: int = 64,
+          stdin=sys.stdin, stdout=sys.stdout):
+    """
+    Line-delimited JSON request loop so one process keeps the model loaded across ticks
+
+    Requests:
+        {"op": "predict", "symbols": [...], "features": [[[...], ...], ...], "last_n": 5}
+        {"op": "train", "features": [[...]], "labels": [...], "epochs": 50}
+        {"op": "save"}
+    """
+    model = NeuralModel.load(model_path) if os.path.exists(model_path) else NeuralModel(input_size, hidden_size)
+    buffer = FeatureBuffer(100000, model.input_size)
+
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+        with instrumentation.span('neural_server.request', backend='cupy' if model.gpu_enabled else 'numpy',
+                                  request_bytes=len(line)) as span:
+            try:
+                with span.phase('serialization'):
+                    request = json.loads(line)
+                op = request.get('op', 'predict')
+                span.set('operation', op)
+                with span.phase('compute'):
+                    if op == 'predict':
+                        result = model.predict_batch([np.asarray(m, dtype=np.float32) for m in request['features']],
+                                                     last_n=request.get('last_n', 5))
+                        importance = model.feature_importance().tolist()
+                        response = {
+                            symbol: {
+                                'predictions': result['predictions'][i][result['valid'][i]].tolist(),
+                                'confidence_scores': result['confidence_scores'][i][result['valid'][i]].tolist(),
+                                'feature_importance': importance,
+                                'model_accuracy': float(result['model_accuracy'][i]),
+                                'timestamp': int(time.time()),
+                                'gpu_accelerated': model.gpu_enabled
+                            }
+                            for i, symbol in enumerate(request.get('symbols', range(len(request['features']))))
+                        }
+                    elif op == 'train':
+                        buffer.append(request['features'], request['labels'])
+                        features, labels = buffer.data()
+                        response = {'loss': model.train(features, labels, epochs=request.get('epochs', 50)),
+                                    'samples': int(buffer.size)}
+                    elif op == 'save':
+                        model.save(model_path)
+                        response = {'saved': model_path}
+                    else:
+                        response = {'error': f"Unknown op: {op}"}
+            except Exception as e:
+                response = {'error': str(e)}
+            with span.phase('serialization'):
+                payload = json.dumps(response) + '\n'
+            span.add_bytes(len(line) + len(payload))
+            stdout.write(payload)
+            stdout.flush()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        serve(sys.argv[2] if len(sys.argv) > 2 else '/tmp/signalcartel/neural_model.npz')
+        sys.exit(0)
+
+    print("SignalCartel Neural Model Server Benchmark")
+    print("=" * 50)
+
+    rng = np.random.default_rng(42)
+    n_symbols, n_rows = 200, 500
+    features = rng.normal(0, 1, (n_symbols, n_rows, 7)).astype(np.float32)
+    future_returns = features[..., 0] * 0.002 + rng.normal(0, 0.002, (n_symbols, n_rows))
+
+    model = NeuralModel(7, 64)
+    loss = model.train(features.reshape(-1, 7), labels_from_returns(future_returns.reshape(-1)), epochs=5)
+    print(f"Trained on {n_symbols * n_rows} rows, loss {loss:.4f}")
+
+    model.predict_batch(features)  # Warmup
+    start_time = time.perf_counter()
+    for _ in range(100):
+        result = model.predict_batch(features)
+    elapsed = (time.perf_counter() - start_time) / 100
+    print(f"Batched inference for {n_symbols} symbols: {elapsed * 1000:.2f}ms per tick")
+    print(f"Sample predictions: {result['predictions'][0].tolist()}")
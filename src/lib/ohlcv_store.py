@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Columnar Memory-Mapped OHLCV Store for SignalCartel
+Append-only per-(symbol, timeframe) column files (int64 epoch-ms timestamps + float64
+open/high/low/close/volume) opened as memory maps, with binary-search range reads,
+resampling, an incremental importer from the MarketData table and optional Arrow/Parquet export
+"""
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+PRICE_COLUMNS = COLUMNS[1:]
+COLUMN_DTYPES = {'timestamp': np.dtype('<i8'), **{name: np.dtype('<f8') for name in PRICE_COLUMNS}}
+
+TIMEFRAME_MS = {'1m': 60000, '5m': 300000, '15m': 900000, '30m': 1800000,
+                '1h': 3600000, '4h': 14400000, '1d': 86400000}
+
+
+def to_epoch_ms(value) -> int:
+    """Epoch milliseconds from epoch ms/seconds, datetime or ISO-8601 string (DB DateTime forms)"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        # Treat small values as seconds
+        return int(value * 1000) if value < 1e11 else int(value)
+    return to_epoch_ms(datetime.fromisoformat(str(value).replace('Z', '+00:00').replace(' ', 'T')))
+
+
+def _key_path(root: str, symbol: str, timeframe: str) -> str:
+    return os.path.join(root, re.sub(r'[^A-Za-z0-9_.-]', '_', symbol), timeframe)
+
+
+class OHLCVSeries:
+    """
+    One (symbol, timeframe) set of column files
+
+    meta.json holds the committed row count and is rewritten after the column data, so a
+    crash mid-append leaves trailing bytes that readers ignore and the next append overwrites.
+    """
+
+    def __init__(self, path: str, symbol: str, timeframe: str):
+        self.path = path
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.meta_path = os.path.join(path, 'meta.json')
+        self.meta = {'symbol': symbol, 'timeframe': timeframe, 'count': 0, 'db_watermark': None}
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path) as f:
+                self.meta.update(json.load(f))
+        self._maps: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.meta['count']
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.bin")
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only memory map of one full column (no parsing, no copy)"""
+        count = len(self)
+        cached = self._maps.get(name)
+        if cached is not None and len(cached) == count:
+            return cached
+        if count == 0:
+            return np.empty(0, dtype=COLUMN_DTYPES[name])
+        mapped = np.memmap(self._column_path(name), dtype=COLUMN_DTYPES[name], mode='r', shape=(count,))
+        self._maps[name] = mapped
+        return mapped
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.column('timestamp')
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        return int(self.timestamps[-1]) if len(self) else None
+
+    def append(self, timestamps: np.ndarray, open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+               close: np.ndarray, volume: np.ndarray, db_watermark=None) -> int:
+        """
+        Append bars in timestamp order; bars at or before the last stored timestamp are dropped
+
+        Returns:
+            Number of bars written
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        order = np.argsort(timestamps, kind='stable')
+        columns = {'timestamp': timestamps[order]}
+        for name, values in zip(PRICE_COLUMNS, (open_, high, low, close, volume)):
+            columns[name] = np.asarray(values, dtype=np.float64)[order]
+
+        keep = np.ones(len(timestamps), dtype=bool)
+        keep[1:] = np.diff(columns['timestamp']) > 0
+        if len(self):
+            keep &= columns['timestamp'] > self.last_timestamp
+        written = int(keep.sum())
+
+        if written:
+            os.makedirs(self.path, exist_ok=True)
+            count = len(self)
+            for name in COLUMNS:
+                with open(self._column_path(name), 'ab') as f:
+                    f.truncate(count * COLUMN_DTYPES[name].itemsize)
+                    columns[name][keep].astype(COLUMN_DTYPES[name], copy=False).tofile(f)
+            self.meta['count'] = count + written
+        if db_watermark is not None:
+            self.meta['db_watermark'] = db_watermark
+        if written or db_watermark is not None:
+            os.makedirs(self.path, exist_ok=True)
+            tmp_path = self.meta_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(self.meta, f)
+            os.replace(tmp_path, self.meta_path)
+        self._maps.clear()
+        return written
+
+    def index_range(self, start: Optional[int] = None, end: Optional[int] = None) -> Tuple[int, int]:
+        """Row bounds [lo, hi) for start <= timestamp < end (epoch ms) by binary search"""
+        timestamps = self.timestamps
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+        hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, side='left'))
+        return lo, max(lo, hi)
+
+    def read_range(self, start: Optional[int] = None, end: Optional[int] = None,
+                   columns: Sequence[str] = COLUMNS) -> Dict[str, np.ndarray]:
+        """Zero-copy memory-mapped slices of the requested columns over [start, end)"""
+        lo, hi = self.index_range(start, end)
+        return {name: self.column(name)[lo:hi] for name in columns}
+
+    def last(self, n: int, columns: Sequence[str] = COLUMNS) -> Dict[str, np.ndarray]:
+        count = len(self)
+        return {name: self.column(name)[max(count - n, 0):count] for name in columns}
+
+    def to_arrow(self, start: Optional[int] = None, end: Optional[int] = None):
+        """pyarrow Table over [start, end) (requires pyarrow)"""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("pyarrow is required for Arrow/Parquet export")
+        data = self.read_range(start, end)
+        return pa.table({'timestamp': pa.array(np.asarray(data['timestamp']), type=pa.timestamp('ms', tz='UTC')),
+                         **{name: np.asarray(data[name]) for name in PRICE_COLUMNS}})
+
+    def write_parquet(self, path: str, start: Optional[int] = None, end: Optional[int] = None):
+        table = self.to_arrow(start, end)
+        import pyarrow.parquet as pq
+        pq.write_table(table, path)
+
+
+class OHLCVStore:
+    """Directory of OHLCVSeries keyed by (symbol, timeframe)"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._series: Dict[Tuple[str, str], OHLCVSeries] = {}
+
+    def series(self, symbol: str, timeframe: str = '1m') -> OHLCVSeries:
+        key = (symbol, timeframe)
+        if key not in self._series:
+            self._series[key] = OHLCVSeries(_key_path(self.root, symbol, timeframe), symbol, timeframe)
+        return self._series[key]
+
+    def keys(self) -> List[Tuple[str, str]]:
+        """(symbol, timeframe) pairs with stored data"""
+        keys = []
+        if not os.path.isdir(self.root):
+            return keys
+        for symbol_dir in sorted(os.listdir(self.root)):
+            for timeframe in sorted(os.listdir(os.path.join(self.root, symbol_dir))):
+                meta_path = os.path.join(self.root, symbol_dir, timeframe, 'meta.json')
+                if os.path.exists(meta_path):
+                    with open(meta_path) as f:
+                        meta = json.load(f)
+                    keys.append((meta['symbol'], meta['timeframe']))
+        return keys
+
+    def append(self, symbol: str, timeframe: str, bars: Dict[str, np.ndarray], db_watermark=None) -> int:
+        return self.series(symbol, timeframe).append(*(bars[name] for name in COLUMNS),
+                                                      db_watermark=db_watermark)
+
+    def read_range(self, symbol: str, timeframe: str = '1m', start: Optional[int] = None,
+                   end: Optional[int] = None, columns: Sequence[str] = COLUMNS) -> Dict[str, np.ndarray]:
+        return self.series(symbol, timeframe).read_range(start, end, columns)
+
+    def close_matrix(self, symbols: Sequence[str], timeframe: str = '1m',
+                     start: Optional[int] = None, end: Optional[int] = None,
+                     column: str = 'close') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (symbols x bars) matrix on the union timestamp grid, the batch layout GPUIndicators takes
+
+        Missing bars are forward-filled from the symbol's previous bar (NaN before its first bar).
+
+        Returns:
+            (timestamps, matrix)
+        """
+        ranges = [self.read_range(symbol, timeframe, start, end, ('timestamp', column)) for symbol in symbols]
+        grid = np.unique(np.concatenate([r['timestamp'] for r in ranges])) if ranges else np.empty(0, np.int64)
+        matrix = np.full((len(symbols), len(grid)), np.nan)
+        for row, r in enumerate(ranges):
+            if len(r['timestamp']) == 0:
+                continue
+            # Index of the latest bar at or before each grid point
+            idx = np.searchsorted(r['timestamp'], grid, side='right') - 1
+            valid = idx >= 0
+            matrix[row, valid] = r[column][idx[valid]]
+        return grid, matrix
+
+
+def resample(bars: Dict[str, np.ndarray], bucket_ms: int) -> Dict[str, np.ndarray]:
+    """Aggregate bars into bucket_ms buckets (first open, max high, min low, last close, summed volume)"""
+    timestamps = np.asarray(bars['timestamp'])
+    if len(timestamps) == 0:
+        return {name: np.asarray(bars[name])[:0] for name in COLUMNS}
+    buckets = timestamps // bucket_ms
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(timestamps)] - 1
+    return {
+        'timestamp': buckets[starts] * bucket_ms,
+        'open': np.asarray(bars['open'])[starts],
+        'high': np.maximum.reduceat(np.asarray(bars['high']), starts),
+        'low': np.minimum.reduceat(np.asarray(bars['low']), starts),
+        'close': np.asarray(bars['close'])[ends],
+        'volume': np.add.reduceat(np.asarray(bars['volume']), starts)
+    }
+
+
+def iter_db_bars(connection, symbol: str, timeframe: str, watermark=None,
+                 batch_size: int = 50000) -> Iterator[Tuple[Dict[str, np.ndarray], object]]:
+    """
+    Yield column batches of MarketData rows newer than the raw DB timestamp watermark
+
+    Yields:
+        (bars, last raw timestamp value in the batch)
+    """
+    query = ('SELECT "timestamp", "open", "high", "low", "close", "volume" FROM "MarketData" '
+             'WHERE "symbol" = ? AND "timeframe" = ?')
+    params: Tuple = (symbol, timeframe)
+    if watermark is not None:
+        query += ' AND "timestamp" > ?'
+        params += (watermark,)
+    query += ' ORDER BY "timestamp"'
+
+    db_cursor = connection.cursor()
+    db_cursor.execute(query, params)
+    while True:
+        rows = db_cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        raw_timestamps, open_, high, low, close, volume = zip(*rows)
+        bars = {'timestamp': np.fromiter((to_epoch_ms(t) for t in raw_timestamps), dtype=np.int64,
+                                         count=len(rows)),
+                'open': np.array(open_, dtype=np.float64), 'high': np.array(high, dtype=np.float64),
+                'low': np.array(low, dtype=np.float64), 'close': np.array(close, dtype=np.float64),
+                'volume': np.array([v or 0.0 for v in volume], dtype=np.float64)}
+        yield bars, raw_timestamps[-1]
+
+
+def import_market_data(connection, store: OHLCVStore, symbols: Optional[Sequence[str]] = None,
+                       timeframes: Optional[Sequence[str]] = None, batch_size: int = 50000) -> Dict[Tuple[str, str], int]:
+    """
+    Incrementally copy MarketData rows into the store, resuming from each series' DB watermark
+
+    Args:
+        connection: DB-API connection with qmark parameters (the sqlite3 stand-in)
+        store: Destination store
+        symbols, timeframes: Restrict the import (default: everything in the table)
+
+    Returns:
+        Bars written per (symbol, timeframe)
+    """
+    db_cursor = connection.cursor()
+    db_cursor.execute('SELECT DISTINCT "symbol", "timeframe" FROM "MarketData"')
+    keys = [(symbol, timeframe) for symbol, timeframe in db_cursor.fetchall()
+            if (symbols is None or symbol in symbols) and (timeframes is None or timeframe in timeframes)]
+
+    written = {}
+    for symbol, timeframe in sorted(keys):
+        series = store.series(symbol, timeframe)
+        written[(symbol, timeframe)] = 0
+        for bars, watermark in iter_db_bars(connection, symbol, timeframe, series.meta['db_watermark'], batch_size):
+            written[(symbol, timeframe)] += store.append(symbol, timeframe, bars, db_watermark=watermark)
+    return written
+
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    import time
+
+    print("SignalCartel Columnar OHLCV Store")
+    print("=" * 50)
+
+    if len(sys.argv) > 2:
+        db_path, root = sys.argv[1], sys.argv[2]
+        connection = sqlite3.connect(db_path.replace('sqlite:///', '', 1))
+        try:
+            start_time = time.perf_counter()
+            written = import_market_data(connection, OHLCVStore(root))
+            elapsed = time.perf_counter() - start_time
+        finally:
+            connection.close()
+        for (symbol, timeframe), count in written.items():
+            print(f"{symbol:10} {timeframe:4}: {count} new bars")
+        print(f"Imported in {elapsed:.2f}s")
+        sys.exit(0)
+
+    root = tempfile.mkdtemp(prefix='signalcartel_ohlcv_')
+    store = OHLCVStore(root)
+    rng = np.random.default_rng(42)
+    n_bars = 2_000_000  # ~4 years of 1m bars
+    timestamps = 1_600_000_000_000 + np.arange(n_bars, dtype=np.int64) * TIMEFRAME_MS['1m']
+    close = 65000 * np.cumprod(1 + rng.normal(0, 0.0005, n_bars))
+    store.append('BTCUSD', '1m', {'timestamp': timestamps, 'open': close, 'high': close * 1.0005,
+                                  'low': close * 0.9995, 'close': close, 'volume': rng.lognormal(0, 1, n_bars)})
+
+    start_time = time.perf_counter()
+    reopened = OHLCVStore(root)
+    window = reopened.read_range('BTCUSD', '1m', int(timestamps[500_000]), int(timestamps[1_500_000]))
+    open_elapsed = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    hourly = resample(window, TIMEFRAME_MS['1h'])
+    resample_elapsed = time.perf_counter() - start_time
+
+    print(f"Opened and sliced {len(window['close'])} of {n_bars} bars in {open_elapsed * 1e3:.2f}ms")
+    print(f"Resampled to {len(hourly['close'])} hourly bars in {resample_elapsed * 1e3:.1f}ms")
+    print(f"Store at {root}")
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Order-Book Imbalance Feature Engine for SignalCartel
+Ingests L2 snapshots into a preallocated (pairs x snapshots x levels x {price, size}) ring
+buffer and computes depth-weighted imbalance, microprice, spread and pressure series
+vectorized across snapshots and pairs, with replay over recorded snapshot files
+"""
+import json
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+PRICE = 0
+SIZE = 1
+
+DEFAULT_DEPTH = 10  # Top 10 levels, as in predictive-position-manager.ts
+
+
+def level_weights(depth: int, halflife: Optional[float] = 2.0) -> np.ndarray:
+    """Per-level weights, best level = 1 decaying by halflife levels (None = flat)"""
+    if halflife is None:
+        return np.ones(depth)
+    return 0.5 ** (np.arange(depth) / halflife)
+
+
+def book_features(bids: np.ndarray, asks: np.ndarray,
+                  weights: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Order-book features for any leading shape of snapshots
+
+    Args:
+        bids, asks: (... x levels x 2) [price, size] arrays, best level first; missing
+            levels have size 0
+        weights: Per-level weights for imbalance (defaults to level_weights(levels))
+
+    Returns:
+        Dict of (...) arrays: imbalance [-1, 1], pressure [0, 1] (bid share of depth, the
+        market_state bid_ask_pressure), microprice, mid, spread, spread_bps, bid_depth, ask_depth
+    """
+    if weights is None:
+        weights = level_weights(bids.shape[-2])
+    bid_px, bid_sz = bids[..., 0, PRICE], bids[..., 0, SIZE]
+    ask_px, ask_sz = asks[..., 0, PRICE], asks[..., 0, SIZE]
+
+    bid_depth = bids[..., SIZE] @ weights
+    ask_depth = asks[..., SIZE] @ weights
+    total_depth = bid_depth + ask_depth
+    imbalance = np.divide(bid_depth - ask_depth, total_depth,
+                          out=np.where(np.isnan(total_depth), np.nan, 0.0), where=total_depth > 0)
+
+    mid = (bid_px + ask_px) / 2
+    top_size = bid_sz + ask_sz
+    # Microprice leans toward the side with less resting size
+    microprice = np.divide(bid_px * ask_sz + ask_px * bid_sz, top_size, out=mid.copy(), where=top_size > 0)
+    spread = ask_px - bid_px
+
+    return {
+        'imbalance': imbalance,
+        'pressure': (imbalance + 1) / 2,
+        'microprice': microprice,
+        'mid': mid,
+        'spread': spread,
+        'spread_bps': np.divide(spread, mid, out=np.full(mid.shape, np.nan), where=mid > 0) * 1e4,
+        'bid_depth': bid_depth,
+        'ask_depth': ask_depth
+    }
+
+
+def _levels_to_array(levels: Sequence, depth: int, out: np.ndarray):
+    """Copy [[price, size, ...], ...] (numbers or strings) into a preallocated (depth x 2) slot"""
+    count = min(len(levels), depth)
+    out[:] = 0.0
+    out[count:, PRICE] = np.nan
+    for i in range(count):
+        out[i, PRICE] = float(levels[i][0])
+        out[i, SIZE] = float(levels[i][1])
+
+
+class OrderBookBuffer:
+    """
+    Fixed-capacity ring of L2 snapshots per pair
+
+    Each pair writes independently; reads gather the last N snapshots of every pair
+    with one fancy-index, oldest first.
+    """
+
+    def __init__(self, pairs: Sequence[str], depth: int = DEFAULT_DEPTH, capacity: int = 1024):
+        self.pairs = list(pairs)
+        self.pair_index = {pair: i for i, pair in enumerate(self.pairs)}
+        self.depth = depth
+        self.capacity = capacity
+
+        n_pairs = len(self.pairs)
+        self.bids = np.full((n_pairs, capacity, depth, 2), np.nan)
+        self.asks = np.full((n_pairs, capacity, depth, 2), np.nan)
+        self.timestamps = np.full((n_pairs, capacity), np.nan)
+        self.head = np.zeros(n_pairs, dtype=np.int64)   # next write slot
+        self.count = np.zeros(n_pairs, dtype=np.int64)
+
+    def ingest(self, pair: str, bids: Sequence, asks: Sequence, timestamp: float):
+        """Write one snapshot ([[price, size], ...] per side, best first) without allocating"""
+        i = self.pair_index[pair]
+        slot = self.head[i]
+        _levels_to_array(bids, self.depth, self.bids[i, slot])
+        _levels_to_array(asks, self.depth, self.asks[i, slot])
+        self.timestamps[i, slot] = timestamp
+        self.head[i] = (slot + 1) % self.capacity
+        self.count[i] = min(self.count[i] + 1, self.capacity)
+
+    def ingest_arrays(self, bids: np.ndarray, asks: np.ndarray, timestamp: float):
+        """Write one already-shaped (pairs x depth x 2) snapshot for every pair at once"""
+        rows = np.arange(len(self.pairs))
+        self.bids[rows, self.head] = bids
+        self.asks[rows, self.head] = asks
+        self.timestamps[rows, self.head] = timestamp
+        self.head = (self.head + 1) % self.capacity
+        self.count = np.minimum(self.count + 1, self.capacity)
+
+    def _slots(self, last_n: int) -> np.ndarray:
+        return (self.head[:, None] - last_n + np.arange(last_n)) % self.capacity
+
+    def window(self, last_n: Optional[int] = None):
+        """(pairs x last_n x depth x 2) bids, asks and (pairs x last_n) timestamps, oldest first"""
+        last_n = min(last_n or self.capacity, self.capacity)
+        slots = self._slots(last_n)
+        rows = np.arange(len(self.pairs))[:, None]
+        return self.bids[rows, slots], self.asks[rows, slots], self.timestamps[rows, slots]
+
+
+class OrderBookFeatureEngine:
+    """OrderBookBuffer plus feature series over its window"""
+
+    def __init__(self, pairs: Sequence[str], depth: int = DEFAULT_DEPTH, capacity: int = 1024,
+                 halflife: Optional[float] = 2.0):
+        self.buffer = OrderBookBuffer(pairs, depth, capacity)
+        self.weights = level_weights(depth, halflife)
+
+    def ingest(self, pair: str, bids: Sequence, asks: Sequence, timestamp: float):
+        self.buffer.ingest(pair, bids, asks, timestamp)
+
+    def features(self, last_n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """(pairs x last_n) feature series; slots not yet written are NaN"""
+        bids, asks, timestamps = self.buffer.window(last_n)
+        features = book_features(bids, asks, self.weights)
+        features['timestamp'] = timestamps
+        return features
+
+    def latest(self) -> Dict[str, np.ndarray]:
+        """(pairs,) features of each pair's newest snapshot"""
+        return {name: series[:, -1] for name, series in self.features(1).items()}
+
+
+def record_snapshot(handle, pair: str, bids: Sequence, asks: Sequence, timestamp: float):
+    """Append one snapshot as a JSON line (the replay format)"""
+    handle.write(json.dumps({'pair': pair, 'timestamp': timestamp, 'bids': bids, 'asks': asks}) + '\n')
+
+
+def iter_snapshots(path: str) -> Iterator[Dict]:
+    """Yield recorded snapshots from a JSON-lines file"""
+    with open(path) as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def replay(path: str, pairs: Optional[List[str]] = None, depth: int = DEFAULT_DEPTH,
+           capacity: Optional[int] = None, halflife: Optional[float] = 2.0) -> OrderBookFeatureEngine:
+    """
+    Ingest a recorded snapshot file into a fresh engine
+
+    Args:
+        path: JSON-lines file written by record_snapshot
+        pairs: Pairs to keep (default: every pair in the file)
+        capacity: Ring size (default: large enough to hold the whole file for each pair)
+    """
+    snapshots = list(iter_snapshots(path))
+    if pairs is None:
+        pairs = sorted({snapshot['pair'] for snapshot in snapshots})
+    wanted = set(pairs)
+    snapshots = [snapshot for snapshot in snapshots if snapshot['pair'] in wanted]
+    if capacity is None:
+        per_pair = {}
+        for snapshot in snapshots:
+            per_pair[snapshot['pair']] = per_pair.get(snapshot['pair'], 0) + 1
+        capacity = max(per_pair.values(), default=1)
+
+    engine = OrderBookFeatureEngine(pairs, depth, capacity, halflife)
+    for snapshot in snapshots:
+        engine.ingest(snapshot['pair'], snapshot['bids'], snapshot['asks'], snapshot['timestamp'])
+    return engine
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import tempfile
+    import time
+
+    print("SignalCartel Order-Book Feature Engine")
+    print("=" * 50)
+
+    if len(sys.argv) > 1:
+        path = sys.argv[1]
+    else:
+        rng = np.random.default_rng(42)
+        path = os.path.join(tempfile.gettempdir(), 'signalcartel_orderbook_replay.jsonl')
+        with open(path, 'w') as handle:
+            for t in range(2000):
+                for pair, mid in (('BTCUSD', 65000.0), ('ETHUSD', 3200.0), ('SOLUSD', 150.0)):
+                    tick = mid * 1e-4
+                    bids = [[mid - tick * (i + 1), float(rng.exponential(2))] for i in range(DEFAULT_DEPTH)]
+                    asks = [[mid + tick * (i + 1), float(rng.exponential(2))] for i in range(DEFAULT_DEPTH)]
+                    record_snapshot(handle, pair, bids, asks, float(t))
+
+    start_time = time.perf_counter()
+    engine = replay(path)
+    ingest_elapsed = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    features = engine.features()
+    feature_elapsed = time.perf_counter() - start_time
+
+    n_snapshots = int(engine.buffer.count.sum())
+    print(f"Replayed {n_snapshots} snapshots in {ingest_elapsed:.3f}s "
+          f"({n_snapshots / ingest_elapsed:.0f} snapshots/second)")
+    print(f"Computed {features['imbalance'].shape} feature series in {feature_elapsed * 1e3:.2f}ms")
+    for i, pair in enumerate(engine.buffer.pairs):
+        print(f"  {pair}: pressure {features['pressure'][i, -1]:.3f}, "
+              f"spread {features['spread_bps'][i, -1]:.2f}bps, microprice {features['microprice'][i, -1]:.2f}")
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Successive-Halving Parameter Search for SignalCartel Pine Script Strategies
+Scores RSI/Bollinger/MACD parameter sets on short recent history slices first, prunes
+losers in rounds (successive halving / Hyperband) and writes JSON the TS optimizers can consume
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from gpu_accelerated_indicators import GPUIndicators
+from vectorized_backtest import (bollinger_positions, crossed_above, crossed_below,
+                                 macd_positions, positions_from_signals, run_backtest)
+
+# Candidate grids, keyed by the Pine Script input names used in strategy-registry.ts
+SEARCH_SPACES = {
+    'rsi': {
+        'rsi_length': list(range(6, 29, 2)),
+        'rsi_oversold': list(range(15, 41, 5)),
+        'rsi_overbought': list(range(60, 86, 5))
+    },
+    'bollinger': {
+        'bb_length': list(range(10, 51, 5)),
+        'bb_multiplier': [1.5, 1.75, 2.0, 2.25, 2.5, 3.0]
+    },
+    'macd': {
+        'macd_fast': list(range(6, 17, 2)),
+        'macd_slow': list(range(18, 41, 4)),
+        'macd_signal': list(range(5, 14, 2))
+    }
+}
+
+# Parameters that change the indicator itself; candidates sharing them reuse one batch evaluation
+INDICATOR_KEYS = {
+    'rsi': ('rsi_length',),
+    'bollinger': ('bb_length', 'bb_multiplier'),
+    'macd': ('macd_fast', 'macd_slow', 'macd_signal')
+}
+
+
+def grid_candidates(strategy: str) -> List[Dict]:
+    """Every combination in the strategy's search space"""
+    space = SEARCH_SPACES[strategy]
+    keys = list(space)
+    mesh = np.meshgrid(*[space[k] for k in keys], indexing='ij')
+    candidates = [dict(zip(keys, values)) for values in zip(*[m.ravel().tolist() for m in mesh])]
+    if strategy == 'macd':
+        candidates = [c for c in candidates if c['macd_fast'] < c['macd_slow']]
+    return candidates
+
+
+def sample_candidates(strategy: str, n: int, seed: int = 42) -> List[Dict]:
+    """Random subset of the grid (without replacement)"""
+    candidates = grid_candidates(strategy)
+    if n >= len(candidates):
+        return candidates
+    rng = np.random.default_rng(seed)
+    return [candidates[i] for i in rng.choice(len(candidates), n, replace=False)]
+
+
+def _group_positions(strategy: str, indicators: GPUIndicators, prices: np.ndarray,
+                     group: Tuple, candidates: Sequence[Dict]) -> np.ndarray:
+    """(candidates x pairs x bars) positions for candidates sharing one indicator evaluation"""
+    n_candidates = len(candidates)
+    n_pairs, length = prices.shape
+
+    if strategy == 'rsi':
+        rsi = indicators.rsi_batch(prices, period=group[0]).astype(np.float64)
+        tiled = np.broadcast_to(rsi, (n_candidates, n_pairs, length)).reshape(-1, length)
+        oversold = np.repeat([c['rsi_oversold'] for c in candidates], n_pairs)[:, None]
+        overbought = np.repeat([c['rsi_overbought'] for c in candidates], n_pairs)[:, None]
+        positions = positions_from_signals(crossed_below(tiled, oversold), crossed_above(tiled, overbought))
+        return positions.reshape(n_candidates, n_pairs, length)
+
+    if strategy == 'bollinger':
+        upper, middle, lower = indicators.bollinger_bands_batch(prices, period=group[0], std_multiplier=group[1])
+        positions = bollinger_positions(prices, upper, middle, lower)
+    else:
+        _, _, histogram = indicators.macd_batch(prices, *group)
+        positions = macd_positions(histogram)
+    return np.broadcast_to(positions, (n_candidates, n_pairs, length))
+
+
+def evaluate_candidates(strategy: str, candidates: Sequence[Dict], prices: np.ndarray,
+                        warmup: int = 0, metric: str = 'total_pnl',
+                        backtest_kwargs: Optional[Dict] = None, use_gpu: Optional[bool] = None) -> np.ndarray:
+    """
+    Score candidates on a price slice (mean of the per-pair metric)
+
+    Args:
+        strategy: 'rsi', 'bollinger' or 'macd'
+        candidates: Parameter dicts
+        prices: (pairs x bars) close prices; the first `warmup` bars only prime indicators
+        warmup: Bars excluded from trading
+        metric: Key of BacktestResult.summary() to maximize
+        backtest_kwargs: Commission/slippage/position size overrides for run_backtest
+        use_gpu: Indicator backend (autodetect when None)
+
+    Returns:
+        Score per candidate
+    """
+    indicators = GPUIndicators(use_gpu=use_gpu)
+    n_pairs, length = prices.shape
+    keys = INDICATOR_KEYS[strategy]
+
+    groups: Dict[Tuple, List[int]] = {}
+    for i, candidate in enumerate(candidates):
+        groups.setdefault(tuple(candidate[k] for k in keys), []).append(i)
+
+    scores = np.empty(len(candidates))
+    for group, members in groups.items():
+        positions = np.array(_group_positions(strategy, indicators, prices, group,
+                                              [candidates[i] for i in members]))
+        positions[..., :warmup] = 0
+        result = run_backtest(prices, positions, **(backtest_kwargs or {}))
+        per_pair = result.summary()[metric].reshape(len(members), n_pairs)
+        scores[members] = per_pair.mean(axis=1)
+    return scores
+
+
+def _evaluate_chunk(args) -> np.ndarray:
+    strategy, candidates, prices, warmup, metric, backtest_kwargs = args
+    # Worker processes share the host, so they evaluate on CPU
+    return evaluate_candidates(strategy, candidates, prices, warmup, metric, backtest_kwargs, use_gpu=False)
+
+
+def _evaluate_parallel(strategy: str, candidates: List[Dict], prices: np.ndarray, warmup: int,
+                       metric: str, backtest_kwargs: Optional[Dict], executor: Optional[ProcessPoolExecutor],
+                       n_jobs: int) -> np.ndarray:
+    if executor is None or len(candidates) < 2 * n_jobs:
+        return evaluate_candidates(strategy, candidates, prices, warmup, metric, backtest_kwargs)
+
+    # Keep indicator groups together so each worker computes each indicator once
+    keys = INDICATOR_KEYS[strategy]
+    order = sorted(range(len(candidates)), key=lambda i: tuple(candidates[i][k] for k in keys))
+    chunks = np.array_split(np.array(order), n_jobs)
+    tasks = [(strategy, [candidates[i] for i in chunk], prices, warmup, metric, backtest_kwargs)
+             for chunk in chunks if len(chunk)]
+
+    scores = np.empty(len(candidates))
+    for chunk, chunk_scores in zip([c for c in chunks if len(c)], executor.map(_evaluate_chunk, tasks)):
+        scores[chunk] = chunk_scores
+    return scores
+
+
+def successive_halving(strategy: str, prices: np.ndarray, candidates: Optional[List[Dict]] = None,
+                       min_bars: int = 250, eta: int = 3, warmup: int = 100, metric: str = 'total_pnl',
+                       backtest_kwargs: Optional[Dict] = None, n_jobs: int = 1,
+                       executor: Optional[ProcessPoolExecutor] = None) -> Dict:
+    """
+    Successive halving over history length
+
+    Each round scores the survivors on the most recent `budget` bars, keeps the best
+    1/eta and multiplies the budget by eta. Rounds continue until the budget covers the
+    full history (a lone survivor skips straight to it), so the best score is always a
+    full-history score.
+
+    Args:
+        strategy: 'rsi', 'bollinger' or 'macd'
+        prices: (pairs x bars) close prices, oldest first
+        candidates: Parameter dicts (defaults to the full grid)
+        min_bars: Bars scored in the first round
+        eta: Pruning/growth factor
+        warmup: Extra bars before each slice used only to prime indicators
+        metric: BacktestResult.summary() key to maximize
+        backtest_kwargs: Overrides passed to run_backtest
+        n_jobs: Worker processes for candidate evaluation
+
+    Returns:
+        JSON-serializable result with best inputs, leaderboard and per-round stats
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    total_bars = prices.shape[1]
+    survivors = list(candidates) if candidates is not None else grid_candidates(strategy)
+    budget = min(min_bars, total_bars)
+    rounds = []
+    bar_evaluations = 0
+
+    own_executor = executor is None and n_jobs > 1
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=n_jobs)
+    try:
+        while True:
+            start = max(0, total_bars - budget - warmup)
+            window = prices[:, start:]
+            scores = _evaluate_parallel(strategy, survivors, window, total_bars - budget - start,
+                                        metric, backtest_kwargs, executor, n_jobs)
+            bar_evaluations += len(survivors) * window.shape[1]
+            ranking = np.argsort(-scores, kind='stable')
+            rounds.append({
+                'bars': int(budget),
+                'candidates': len(survivors),
+                'best_score': float(scores[ranking[0]])
+            })
+
+            if budget >= total_bars:
+                break
+            keep = max(1, math.ceil(len(survivors) / eta))
+            survivors = [survivors[i] for i in ranking[:keep]]
+            # A lone survivor has nothing left to race, so it goes straight to the full history
+            budget = total_bars if keep == 1 else min(budget * eta, total_bars)
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    leaderboard = [{'inputs': survivors[i], 'score': float(scores[i])} for i in ranking[:10]]
+    return {
+        'strategy': strategy,
+        'metric': metric,
+        'best': leaderboard[0],
+        'leaderboard': leaderboard,
+        'rounds': rounds,
+        'bar_evaluations': int(bar_evaluations),
+        'full_grid_bar_evaluations': int(rounds[0]['candidates'] * total_bars)
+    }
+
+
+def hyperband(strategy: str, prices: np.ndarray, max_candidates: int = 243, eta: int = 3,
+              min_bars: int = 100, seed: int = 42, **kwargs) -> Dict:
+    """
+    Hyperband: successive-halving brackets trading candidate count against starting budget
+
+    Every bracket ends on the full history, so bracket winners are compared on equal footing.
+
+    Returns:
+        Best bracket result, with all bracket summaries under 'brackets'
+    """
+    total_bars = np.asarray(prices).shape[1]
+    s_max = max(0, int(math.log(max(total_bars / min_bars, 1), eta)))
+    n_jobs = kwargs.get('n_jobs', 1)
+    executor = ProcessPoolExecutor(max_workers=n_jobs) if n_jobs > 1 else None
+
+    brackets = []
+    try:
+        for s in range(s_max, -1, -1):
+            n = min(max_candidates, math.ceil((s_max + 1) / (s + 1) * eta ** s))
+            candidates = sample_candidates(strategy, n, seed=seed + s)
+            result = successive_halving(strategy, prices, candidates, min_bars=math.ceil(total_bars / eta ** s),
+                                        eta=eta, executor=executor, **kwargs)
+            brackets.append(result)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    best = max(brackets, key=lambda r: r['best']['score'])
+    result = dict(best)
+    result['brackets'] = [{'rounds': b['rounds'], 'best': b['best']} for b in brackets]
+    result['bar_evaluations'] = sum(b['bar_evaluations'] for b in brackets)
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(description="Successive-halving search for Pine Script strategy inputs")
+    parser.add_argument('prices', nargs='?', help='JSON file: {"symbols": [...], "prices": [[...], ...]}')
+    parser.add_argument('--strategy', choices=sorted(SEARCH_SPACES), default='rsi')
+    parser.add_argument('--hyperband', action='store_true')
+    parser.add_argument('--eta', type=int, default=3)
+    parser.add_argument('--min-bars', type=int, default=250)
+    parser.add_argument('--jobs', type=int, default=1)
+    parser.add_argument('--commission', type=float, default=0.25)
+    parser.add_argument('--out', help='Write the JSON result here instead of stdout')
+    args = parser.parse_args()
+
+    if args.prices:
+        with open(args.prices, 'r') as f:
+            payload = json.load(f)
+        symbols, prices = payload['symbols'], np.array(payload['prices'], dtype=np.float64)
+    else:
+        # Geometric random walk stand-in, as in benchmark_rsi_performance
+        rng = np.random.default_rng(42)
+        prices = 100 * np.cumprod(1 + rng.normal(0, 0.02, (20, 3000)), axis=1)
+        symbols = [f"PAIR{i}" for i in range(prices.shape[0])]
+
+    start_time = time.perf_counter()
+    backtest_kwargs = {'commission': args.commission}
+    if args.hyperband:
+        result = hyperband(args.strategy, prices, eta=args.eta, n_jobs=args.jobs, backtest_kwargs=backtest_kwargs)
+    else:
+        result = successive_halving(args.strategy, prices, min_bars=args.min_bars, eta=args.eta,
+                                    n_jobs=args.jobs, backtest_kwargs=backtest_kwargs)
+    result['symbols'] = symbols
+    result['elapsed_seconds'] = time.perf_counter() - start_time
+
+    output = json.dumps(result, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
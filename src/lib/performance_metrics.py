@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Streaming Performance Metrics for SignalCartel
+Online Sharpe, Sortino, hit rate, expectancy, max drawdown and profit factor per
+(strategy, pair) - cumulative, over a rolling window of trades and exponentially weighted -
+with constant memory per key, batched updates for many keys at once and mergeable
+partial aggregates from parallel workers
+"""
+import json
+import os
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from trade_statistics import DEFAULT_CHUNK_SIZE, DEFAULT_COMMISSION, normalize_trade
+
+DEFAULT_WINDOW = 100      # trades in the rolling window
+DEFAULT_HALFLIFE = 20.0   # trades for exponential weights to halve
+
+# Per-key aggregates; the drawdown fields are relative to the start of the stream they cover
+STATE_FIELDS = ('count', 'mean', 'm2', 'downside_sq', 'wins', 'gross_profit', 'gross_loss',
+                'cum_pnl', 'peak', 'trough', 'max_drawdown',
+                'ew_weight', 'ew_sum', 'ew_sq', 'ew_downside_sq', 'ew_wins', 'ew_gross_profit', 'ew_gross_loss')
+
+METRIC_NAMES = ('trades', 'hit_rate', 'expectancy', 'sharpe', 'sortino', 'profit_factor', 'max_drawdown',
+                'rolling_trades', 'rolling_hit_rate', 'rolling_expectancy', 'rolling_sharpe', 'rolling_sortino',
+                'rolling_profit_factor', 'rolling_max_drawdown',
+                'ew_hit_rate', 'ew_expectancy', 'ew_sharpe', 'ew_sortino', 'ew_profit_factor')
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """numerator / denominator, 0 where the denominator is not positive"""
+    return np.divide(numerator, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape),
+                     where=denominator > 0)
+
+
+def _profit_factor(gross_profit: np.ndarray, gross_loss: np.ndarray) -> np.ndarray:
+    """Gross profit / gross loss; inf for profits without losses, 0 with neither"""
+    return np.where(gross_loss > 0, _ratio(gross_profit, gross_loss), np.where(gross_profit > 0, np.inf, 0.0))
+
+
+def segment_state(group: np.ndarray, pnls: np.ndarray, n_groups: int, window: int,
+                  decay: float) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """
+    Aggregates of each group's trades within one batch
+
+    Args:
+        group: Group index per trade (0..n_groups-1), trades in time order within each group
+        pnls: Trade PnL
+        n_groups: Number of groups
+        window: Rolling window length
+        decay: Exponential weight per trade of age
+
+    Returns:
+        (STATE_FIELDS arrays per group, (n_groups, window) ring of each group's last trades,
+        oldest first and NaN-padded at the front)
+    """
+    order = np.argsort(group, kind='stable')
+    group, pnls = group[order], np.asarray(pnls, dtype=np.float64)[order]
+    counts = np.bincount(group, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    rank = np.arange(group.size) - starts[group]
+    age = counts[group] - 1 - rank
+
+    state = {'count': counts.astype(np.float64)}
+    total = np.bincount(group, pnls, n_groups)
+    state['mean'] = _ratio(total, state['count'])
+    state['m2'] = np.bincount(group, (pnls - state['mean'][group]) ** 2, n_groups)
+    losses = np.minimum(pnls, 0)
+    state['downside_sq'] = np.bincount(group, losses ** 2, n_groups)
+    state['wins'] = np.bincount(group, pnls > 0, n_groups)
+    state['gross_profit'] = np.bincount(group, np.maximum(pnls, 0), n_groups)
+    state['gross_loss'] = -np.bincount(group, losses, n_groups)
+
+    # Equity curve per group in a (groups x longest run) matrix, NaN past each group's end
+    curve = np.full((n_groups, int(counts.max()) if counts.size and counts.max() else 1), np.nan)
+    running = np.cumsum(pnls)
+    curve[group, rank] = running - np.concatenate([[0.0], running])[starts][group]
+    peak = np.fmax.accumulate(np.fmax(curve, 0), axis=1)
+    state['cum_pnl'] = total
+    state['peak'] = np.maximum(np.nanmax(curve, axis=1, initial=0), 0)
+    state['trough'] = np.minimum(np.nanmin(curve, axis=1, initial=0), 0)
+    state['max_drawdown'] = np.nanmax(peak - curve, axis=1, initial=0)
+
+    weights = decay ** age
+    state['ew_weight'] = np.bincount(group, weights, n_groups)
+    state['ew_sum'] = np.bincount(group, weights * pnls, n_groups)
+    state['ew_sq'] = np.bincount(group, weights * pnls ** 2, n_groups)
+    state['ew_downside_sq'] = np.bincount(group, weights * losses ** 2, n_groups)
+    state['ew_wins'] = np.bincount(group, weights * (pnls > 0), n_groups)
+    state['ew_gross_profit'] = np.bincount(group, weights * np.maximum(pnls, 0), n_groups)
+    state['ew_gross_loss'] = -np.bincount(group, weights * losses, n_groups)
+
+    ring = np.full((n_groups, window), np.nan)
+    column = window - counts[group] + rank
+    recent = column >= 0
+    ring[group[recent], column[recent]] = pnls[recent]
+    return state, ring
+
+
+def _combine(a: Dict[str, np.ndarray], a_ring: np.ndarray, b: Dict[str, np.ndarray], b_ring: np.ndarray,
+             decay: float) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """Aggregates of stream a followed by stream b, row-wise (Chan et al. for the moments)"""
+    count = a['count'] + b['count']
+    delta = b['mean'] - a['mean']
+    state = {
+        'count': count,
+        'mean': a['mean'] + _ratio(delta * b['count'], count),
+        'm2': a['m2'] + b['m2'] + _ratio(delta ** 2 * a['count'] * b['count'], count)
+    }
+    for field in ('downside_sq', 'wins', 'gross_profit', 'gross_loss'):
+        state[field] = a[field] + b[field]
+
+    # b's curve starts where a's ends: a drawdown may run from a's peak into b's trough
+    state['max_drawdown'] = np.maximum(np.maximum(a['max_drawdown'], b['max_drawdown']),
+                                       a['peak'] - (a['cum_pnl'] + b['trough']))
+    state['peak'] = np.maximum(a['peak'], a['cum_pnl'] + b['peak'])
+    state['trough'] = np.minimum(a['trough'], a['cum_pnl'] + b['trough'])
+    state['cum_pnl'] = a['cum_pnl'] + b['cum_pnl']
+
+    # a's weights age by the number of trades in b
+    aging = decay ** b['count']
+    for field in STATE_FIELDS[11:]:
+        state[field] = aging * a[field] + b[field]
+
+    # Last `window` trades of a then b: drop as many of a's oldest cells as b adds
+    window = a_ring.shape[1]
+    added = np.minimum(b['count'], window).astype(np.int64)[:, None]
+    columns = np.arange(window)
+    source = np.where(columns < window - added, columns + added, window + columns)
+    ring = np.take_along_axis(np.concatenate([a_ring, b_ring], axis=1), source, axis=1)
+    return state, ring
+
+
+def rolling_metrics(ring: np.ndarray) -> Dict[str, np.ndarray]:
+    """Window metrics from (keys, window) rings of the most recent trades (NaN = empty)"""
+    filled = ~np.isnan(ring)
+    values = np.where(filled, ring, 0.0)
+    count = filled.sum(axis=1).astype(np.float64)
+    mean = _ratio(values.sum(axis=1), count)
+    variance = _ratio(np.where(filled, (values - mean[:, None]) ** 2, 0.0).sum(axis=1), count)
+    losses = np.minimum(values, 0)
+    downside = np.sqrt(_ratio((losses ** 2).sum(axis=1), count))
+
+    curve = np.cumsum(values, axis=1)
+    peak = np.maximum.accumulate(np.maximum(curve, 0), axis=1)
+    return {
+        'rolling_trades': count,
+        'rolling_hit_rate': _ratio((values > 0).sum(axis=1), count),
+        'rolling_expectancy': mean,
+        'rolling_sharpe': _ratio(mean, np.sqrt(variance)),
+        'rolling_sortino': _ratio(mean, downside),
+        'rolling_profit_factor': _profit_factor(np.maximum(values, 0).sum(axis=1), -losses.sum(axis=1)),
+        'rolling_max_drawdown': (peak - curve).max(axis=1)
+    }
+
+
+class PerformanceBook:
+    """
+    Struct-of-arrays performance aggregates for every (strategy, pair)
+
+    Memory per key is the aggregate fields plus a `window`-trade ring, whatever the stream
+    length. Cumulative and exponentially weighted metrics are exact under merge; merging
+    books assumes the other book's trades come after this one's for any shared key
+    (partition workers by key, or by time and merge in time order).
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW, halflife: float = DEFAULT_HALFLIFE,
+                 default_commission: float = DEFAULT_COMMISSION, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 capacity: int = 64):
+        self.window = window
+        self.halflife = halflife
+        self.decay = 0.5 ** (1.0 / halflife)
+        self.default_commission = default_commission
+        self.chunk_size = chunk_size
+        self.keys: List[Tuple[str, str]] = []
+        self.index: Dict[Tuple[str, str], int] = {}
+        self.state = {field: np.zeros(capacity) for field in STATE_FIELDS}
+        self.ring = np.full((capacity, window), np.nan)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _grow(self, needed: int):
+        capacity = self.ring.shape[0]
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity)
+        for field, values in self.state.items():
+            self.state[field] = np.concatenate([values, np.zeros(capacity - values.size)])
+        self.ring = np.concatenate([self.ring, np.full((capacity - self.ring.shape[0], self.window), np.nan)])
+
+    def key_ids(self, strategies: Sequence[str], pairs: Sequence[str]) -> np.ndarray:
+        """Row index per (strategy, pair), registering new keys"""
+        ids = np.empty(len(strategies), dtype=np.int64)
+        for i, key in enumerate(zip(strategies, pairs)):
+            row = self.index.get(key)
+            if row is None:
+                row = self.index[key] = len(self.keys)
+                self.keys.append(key)
+            ids[i] = row
+        self._grow(len(self.keys))
+        return ids
+
+    def update_ids(self, ids: np.ndarray, pnls: np.ndarray):
+        """
+        Add a batch of trades for rows from key_ids
+
+        Trades must be in time order within each key; any number of keys and trades per key.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if ids.size == 0:
+            return
+        rows, group = np.unique(ids, return_inverse=True)
+        segment, segment_ring = segment_state(group.reshape(-1), pnls, rows.size, self.window, self.decay)
+        current = {field: values[rows] for field, values in self.state.items()}
+        combined, ring = _combine(current, self.ring[rows], segment, segment_ring, self.decay)
+        for field, values in combined.items():
+            self.state[field][rows] = values
+        self.ring[rows] = ring
+
+    def update_batch(self, strategies: Sequence[str], pairs: Sequence[str], pnls: Sequence[float]):
+        """Add a batch of trades for any mix of keys (time order within each key)"""
+        self.update_ids(self.key_ids(strategies, pairs), np.asarray(pnls, dtype=np.float64))
+
+    def update(self, strategy: str, pair: str, pnl: float):
+        """Add one closed trade"""
+        self.update_ids(self.key_ids([strategy], [pair]), np.array([pnl], dtype=np.float64))
+
+    def ingest(self, trades: Iterable[Dict]) -> int:
+        """
+        Stream trade records (as accepted by trade_statistics.normalize_trade) in bounded chunks
+
+        Returns:
+            Number of trades ingested
+        """
+        ingested = 0
+        strategies, pairs, pnls = [], [], []
+        for record in trades:
+            trade = normalize_trade(record, self.default_commission)
+            if trade is None:
+                continue
+            pair, strategy, pnl, _ = trade
+            strategies.append(strategy)
+            pairs.append(pair)
+            pnls.append(pnl)
+            if len(pnls) >= self.chunk_size:
+                self.update_batch(strategies, pairs, pnls)
+                ingested += len(pnls)
+                strategies, pairs, pnls = [], [], []
+        self.update_batch(strategies, pairs, pnls)
+        return ingested + len(pnls)
+
+    def merge(self, other: 'PerformanceBook') -> 'PerformanceBook':
+        """Fold in a book built by another worker over later trades or other keys"""
+        if (other.window, other.halflife) != (self.window, self.halflife):
+            raise ValueError("Books must share window and halflife to merge")
+        if not other.keys:
+            return self
+        strategies, pairs = zip(*other.keys)
+        rows = self.key_ids(strategies, pairs)
+        n = len(other.keys)
+        current = {field: values[rows] for field, values in self.state.items()}
+        incoming = {field: values[:n] for field, values in other.state.items()}
+        combined, ring = _combine(current, self.ring[rows], incoming, other.ring[:n], self.decay)
+        for field, values in combined.items():
+            self.state[field][rows] = values
+        self.ring[rows] = ring
+        return self
+
+    def metrics(self) -> Dict[str, np.ndarray]:
+        """METRIC_NAMES arrays in key order (per-trade Sharpe/Sortino, drawdowns in PnL units)"""
+        n = len(self.keys)
+        state = {field: values[:n] for field, values in self.state.items()}
+        count = state['count']
+        std = np.sqrt(_ratio(state['m2'], count))
+        downside = np.sqrt(_ratio(state['downside_sq'], count))
+
+        weight = state['ew_weight']
+        ew_mean = _ratio(state['ew_sum'], weight)
+        ew_std = np.sqrt(np.maximum(_ratio(state['ew_sq'], weight) - ew_mean ** 2, 0))
+        ew_downside = np.sqrt(_ratio(state['ew_downside_sq'], weight))
+
+        metrics = {
+            'trades': count,
+            'hit_rate': _ratio(state['wins'], count),
+            'expectancy': state['mean'],
+            'sharpe': _ratio(state['mean'], std),
+            'sortino': _ratio(state['mean'], downside),
+            'profit_factor': _profit_factor(state['gross_profit'], state['gross_loss']),
+            'max_drawdown': state['max_drawdown']
+        }
+        metrics.update(rolling_metrics(self.ring[:n]))
+        metrics.update({
+            'ew_hit_rate': _ratio(state['ew_wins'], weight),
+            'ew_expectancy': ew_mean,
+            'ew_sharpe': _ratio(ew_mean, ew_std),
+            'ew_sortino': _ratio(ew_mean, ew_downside),
+            'ew_profit_factor': _profit_factor(state['ew_gross_profit'], state['ew_gross_loss'])
+        })
+        return metrics
+
+    def to_dicts(self) -> Dict[Tuple[str, str], Dict]:
+        """Per-(strategy, pair) metric dicts"""
+        metrics = self.metrics()
+        return {key: {name: float(metrics[name][i]) for name in METRIC_NAMES} for i, key in enumerate(self.keys)}
+
+    def save(self, path: str):
+        """Persist aggregates and each key's window of recent trades"""
+        n = len(self.keys)
+        state = {
+            'window': self.window,
+            'halflife': self.halflife,
+            'default_commission': self.default_commission,
+            'keys': [list(key) for key in self.keys],
+            'state': {field: values[:n].tolist() for field, values in self.state.items()},
+            'recent': [row[~np.isnan(row)].tolist() for row in self.ring[:n]]
+        }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'PerformanceBook':
+        with open(path, 'r') as f:
+            state = json.load(f)
+        book = cls(window=state['window'], halflife=state['halflife'],
+                   default_commission=state.get('default_commission', DEFAULT_COMMISSION))
+        if state['keys']:
+            strategies, pairs = zip(*state['keys'])
+            rows = book.key_ids(strategies, pairs)
+            for field, values in state['state'].items():
+                book.state[field][rows] = values
+            for row, recent in zip(rows, state['recent']):
+                if recent:
+                    book.ring[row, book.window - len(recent):] = recent
+        return book
+
+
+if __name__ == "__main__":
+    import time
+
+    print("SignalCartel Streaming Performance Metrics")
+    print("=" * 50)
+
+    rng = np.random.default_rng(42)
+    strategies = [f"strategy_{i}" for i in range(20)]
+    pairs = [f"PAIR{i}USD" for i in range(25)]
+    n_trades = 500_000
+    strategy_idx = rng.integers(0, len(strategies), n_trades)
+    pair_idx = rng.integers(0, len(pairs), n_trades)
+    # Proof-style trades: $60 position, ~1% moves, 55% accuracy, $0.25 commission
+    pnls = np.where(rng.random(n_trades) < 0.55, 1, -1) * rng.exponential(0.01, n_trades) * 60 - 0.25
+
+    book = PerformanceBook()
+    ids = book.key_ids([strategies[i] for i in strategy_idx], [pairs[i] for i in pair_idx])
+    start_time = time.perf_counter()
+    for chunk in range(0, n_trades, 10_000):
+        book.update_ids(ids[chunk:chunk + 10_000], pnls[chunk:chunk + 10_000])
+    elapsed = time.perf_counter() - start_time
+    print(f"{n_trades:,} trades over {len(book)} keys in {elapsed:.2f}s "
+          f"({n_trades / elapsed:,.0f} trades/s in 10k batches)")
+
+    # Two workers over consecutive halves merge to the same aggregates
+    first, second = PerformanceBook(), PerformanceBook()
+    half = n_trades // 2
+    first.update_ids(first.key_ids([strategies[i] for i in strategy_idx[:half]], [pairs[i] for i in pair_idx[:half]]),
+                     pnls[:half])
+    second.update_ids(second.key_ids([strategies[i] for i in strategy_idx[half:]], [pairs[i] for i in pair_idx[half:]]),
+                      pnls[half:])
+    merged = first.merge(second).to_dicts()
+    reference = book.to_dicts()
+    worst = max(abs(merged[key][name] - reference[key][name]) for key in reference for name in METRIC_NAMES
+                if np.isfinite(reference[key][name]))
+    print(f"Merged worker books match the single pass to {worst:.2e}")
+
+    key = book.keys[0]
+    print(f"{key[0]} / {key[1]}:")
+    for name, value in book.to_dicts()[key].items():
+        print(f"  {name:24}: {value:+.4f}")
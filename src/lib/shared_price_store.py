@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Shared-Memory Ring-Buffer Price Store for SignalCartel
+Fixed-capacity bar rings per (symbol, timeframe) in shared memory: one writer appends
+ticks/bars, any number of reader processes get zero-copy contiguous views of the last N
+bars, with a seqlock version counter for consistent reads
+"""
+import re
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+BAR_FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+FIELD_INDEX = {name: i for i, name in enumerate(BAR_FIELDS)}
+
+# Header slots (int64)
+SEQUENCE = 0   # seqlock: odd while a write is in progress
+COUNT = 1      # bars ever written
+CAPACITY = 2
+N_FIELDS = 3
+HEADER_SLOTS = 8
+
+DEFAULT_CAPACITY = 4096
+
+_TRACK_PARAMETER = sys.version_info >= (3, 13)  # SharedMemory(track=False)
+
+
+def segment_name(prefix: str, symbol: str, timeframe: str) -> str:
+    """Shared-memory segment name for one (symbol, timeframe) ring"""
+    return re.sub(r'[^A-Za-z0-9_]', '_', f"{prefix}_{symbol}_{timeframe}")
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing segment without leaving it with this process's resource tracker"""
+    if _TRACK_PARAMETER:
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Python < 3.13 registers every attach and unlinks the segment when the reader exits,
+    # so hand this one segment back to the tracker straight away
+    segment = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(segment._name, 'shared_memory')
+    return segment
+
+
+class SharedPriceRing:
+    """
+    One (symbol, timeframe) ring of bars in a shared-memory segment
+
+    Bars are written twice, at slot i and i + capacity, so the last N bars are always a
+    contiguous slice and views never need to be stitched across the wrap point.
+    """
+
+    def __init__(self, name: str, capacity: int = DEFAULT_CAPACITY, create: bool = False):
+        """
+        Args:
+            name: Shared-memory segment name
+            capacity: Bars retained (writer only; readers take it from the header)
+            create: True for the writer, which owns and eventually unlinks the segment
+        """
+        self.name = name
+        self.owner = create
+        if create:
+            n_fields = len(BAR_FIELDS)
+            size = HEADER_SLOTS * 8 + 2 * capacity * n_fields * 8
+            try:
+                self.segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+            except FileExistsError:
+                # Stale segment from a writer that did not shut down cleanly
+                stale = shared_memory.SharedMemory(name=name)
+                stale.close()
+                stale.unlink()
+                self.segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+            self.header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=self.segment.buf)
+            self.header[:] = 0
+            self.header[CAPACITY] = capacity
+            self.header[N_FIELDS] = n_fields
+        else:
+            self.segment = _attach(name)
+            self.header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=self.segment.buf)
+
+        self.capacity = int(self.header[CAPACITY])
+        self.n_fields = int(self.header[N_FIELDS])
+        self.data = np.ndarray((2 * self.capacity, self.n_fields), dtype=np.float64,
+                               buffer=self.segment.buf, offset=HEADER_SLOTS * 8)
+
+    # Writer side
+
+    def append(self, bar: Iterable[float]):
+        """Append one bar in BAR_FIELDS order"""
+        header = self.header
+        slot = int(header[COUNT]) % self.capacity
+        header[SEQUENCE] += 1
+        self.data[slot] = bar
+        self.data[slot + self.capacity] = self.data[slot]
+        header[COUNT] += 1
+        header[SEQUENCE] += 1
+
+    def append_tick(self, timestamp: float, price: float, volume: float = 0.0):
+        self.append((timestamp, price, price, price, price, volume))
+
+    def extend(self, bars: np.ndarray):
+        """Append a block of bars (k x n_fields) under one sequence bump"""
+        bars = np.asarray(bars, dtype=np.float64)[-self.capacity:]
+        header = self.header
+        count = int(header[COUNT])
+        slots = (count + np.arange(len(bars))) % self.capacity
+        header[SEQUENCE] += 1
+        self.data[slots] = bars
+        self.data[slots + self.capacity] = bars
+        header[COUNT] = count + len(bars)
+        header[SEQUENCE] += 1
+
+    # Reader side
+
+    @property
+    def version(self) -> int:
+        return int(self.header[SEQUENCE])
+
+    @property
+    def count(self) -> int:
+        return int(self.header[COUNT])
+
+    def _window(self, count: int, last_n: int) -> np.ndarray:
+        last_n = min(last_n, count, self.capacity)
+        end = count % self.capacity + self.capacity
+        return self.data[end - last_n:end]
+
+    def view(self, last_n: int, spin_timeout: float = 1.0) -> Tuple[np.ndarray, int]:
+        """
+        Zero-copy (last_n x n_fields) view of the newest bars, oldest first, plus the version
+
+        Appends never touch existing slots until the ring wraps, so the view stays valid while
+        fewer than capacity - last_n bars are appended; check with is_current(version) or
+        use read() for a guaranteed-consistent copy. Raises TimeoutError if the sequence stays
+        odd (e.g. the writer died mid-write) for spin_timeout seconds.
+        """
+        deadline = time.perf_counter() + spin_timeout
+        while True:
+            version = self.version
+            if not version & 1:
+                window = self._window(self.count, last_n)
+                if self.version == version:
+                    return window, version
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"Could not get a consistent view of {self.name}")
+
+    def is_current(self, version: int, tolerance: Optional[int] = None) -> bool:
+        """True if no write (or fewer than `tolerance` bar writes) happened since `version`"""
+        current = self.version
+        if tolerance is None:
+            return current == version
+        return (current - version) // 2 < tolerance
+
+    def read(self, last_n: int, out: Optional[np.ndarray] = None,
+             spin_timeout: float = 1.0) -> np.ndarray:
+        """Seqlock-consistent copy of the newest bars (into `out` if given)"""
+        deadline = time.perf_counter() + spin_timeout
+        while True:
+            version = self.version
+            if not version & 1:
+                window = self._window(self.count, last_n)
+                result = out[:len(window)] if out is not None else np.empty_like(window)
+                np.copyto(result, window)
+                if self.version == version:
+                    return result
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"Could not get a consistent read of {self.name}")
+
+    def field(self, name: str, last_n: int, spin_timeout: float = 1.0) -> np.ndarray:
+        """Zero-copy (strided) view of one field of the newest bars"""
+        return self.view(last_n, spin_timeout)[0][:, FIELD_INDEX[name]]
+
+    def close(self):
+        self.header = None
+        self.data = None
+        self.segment.close()
+        if self.owner:
+            # A forked reader shares this tracker and dropped the segment from it on attach;
+            # registering again is a no-op otherwise and keeps unlink's unregister balanced
+            if not _TRACK_PARAMETER:
+                resource_tracker.register(self.segment._name, 'shared_memory')
+            self.segment.unlink()
+
+
+class SharedPriceStore:
+    """Rings for many (symbol, timeframe) keys under one segment-name prefix"""
+
+    def __init__(self, prefix: str = 'signalcartel_prices', capacity: int = DEFAULT_CAPACITY,
+                 writer: bool = False):
+        self.prefix = prefix
+        self.capacity = capacity
+        self.writer = writer
+        self.rings: Dict[Tuple[str, str], SharedPriceRing] = {}
+
+    def ring(self, symbol: str, timeframe: str = '1m') -> SharedPriceRing:
+        """Get (creating as writer, attaching as reader) the ring for a key"""
+        key = (symbol, timeframe)
+        if key not in self.rings:
+            self.rings[key] = SharedPriceRing(segment_name(self.prefix, symbol, timeframe),
+                                              self.capacity, create=self.writer)
+        return self.rings[key]
+
+    def append(self, symbol: str, timeframe: str, bar: Iterable[float]):
+        self.ring(symbol, timeframe).append(bar)
+
+    def closes(self, symbol: str, timeframe: str = '1m', last_n: int = 100) -> np.ndarray:
+        """Consistent copy of the last N closes, the shape indicator workers receive"""
+        return self.ring(symbol, timeframe).read(last_n)[:, FIELD_INDEX['close']]
+
+    def close(self):
+        for ring in self.rings.values():
+            ring.close()
+        self.rings.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _reader_process(prefix: str, symbol: str, last_n: int, reads: int, result_queue):
+    store = SharedPriceStore(prefix)
+    ring = store.ring(symbol)
+    torn = 0
+    start_time = time.perf_counter()
+    for _ in range(reads):
+        bars = ring.read(last_n)
+        # Bars are written with timestamp == sequence number, so a consistent window is contiguous
+        if len(bars) > 1 and not np.all(np.diff(bars[:, 0]) == 1):
+            torn += 1
+    elapsed = time.perf_counter() - start_time
+    store.close()
+    result_queue.put((reads / elapsed, torn))
+
+
+if __name__ == "__main__":
+    import multiprocessing as mp
+
+    print("SignalCartel Shared-Memory Price Store")
+    print("=" * 50)
+
+    prefix, symbol, last_n = 'signalcartel_demo', 'BTCUSD', 500
+    with SharedPriceStore(prefix, capacity=4096, writer=True) as store:
+        ring = store.ring(symbol)
+        ring.extend(np.column_stack([np.arange(1000.0)] + [np.full(1000, 65000.0)] * 5))
+
+        queue = mp.Queue()
+        readers = [mp.Process(target=_reader_process, args=(prefix, symbol, last_n, 20000, queue))
+                   for _ in range(3)]
+        for reader in readers:
+            reader.start()
+
+        start_time = time.perf_counter()
+        for t in range(1000, 201000):
+            ring.append_tick(float(t), 65000.0 + (t % 100), 1.0)
+        write_elapsed = time.perf_counter() - start_time
+
+        results = [queue.get() for _ in readers]
+        for reader in readers:
+            reader.join()
+
+    print(f"Writer: {200000 / write_elapsed:.0f} appends/second")
+    for i, (rate, torn) in enumerate(results):
+        print(f"Reader {i}: {rate:.0f} consistent {last_n}-bar reads/second, {torn} torn")
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Incremental Signal Correlation Tracking for SignalCartel
+Exponentially-weighted covariance/correlation across strategy signals and realized
+outcomes, maintained with rank-1 updates in the fusion math's (trades x systems x features) layout
+"""
+from typing import Optional
+
+import numpy as np
+
+# Feature indices of the fusion layout used by mathematical_proof_validation.simulate_ai_signals
+CONFIDENCE = 0
+DIRECTION = 1
+MAGNITUDE = 2
+
+
+def fusion_signal_values(signals: np.ndarray) -> np.ndarray:
+    """(trades x systems x features) -> (trades x systems) signed conviction (confidence * direction)"""
+    return signals[..., CONFIDENCE] * signals[..., DIRECTION]
+
+
+def fusion_outcome_values(actual_outcomes: np.ndarray) -> np.ndarray:
+    """(trades x [direction, magnitude]) -> (trades x 1) signed realized move"""
+    return (actual_outcomes[..., 0] * actual_outcomes[..., 1])[..., None]
+
+
+class SignalCorrelationTracker:
+    """
+    Exponentially-forgetting covariance of [source signals..., outcomes...]
+
+    State is a weighted (weight, mean, scatter) triple, so single-row updates, batch
+    updates and batch initialization from history all give identical results.
+    """
+
+    def __init__(self, n_sources: int, n_outcomes: int = 1, decay: float = 0.995,
+                 halflife: Optional[float] = None):
+        """
+        Args:
+            n_sources: Number of signal sources (strategies/systems)
+            n_outcomes: Number of realized outcome columns
+            decay: Per-observation forgetting factor (1.0 = no forgetting)
+            halflife: Alternative to decay, in observations
+        """
+        self.n_sources = n_sources
+        self.n_outcomes = n_outcomes
+        self.n_vars = n_sources + n_outcomes
+        self.decay = 0.5 ** (1.0 / halflife) if halflife else decay
+
+        self.weight = 0.0
+        self.mean = np.zeros(self.n_vars)
+        self.scatter = np.zeros((self.n_vars, self.n_vars))
+        self.observations = 0
+
+        self._row = np.empty(self.n_vars)
+        self._delta = np.empty(self.n_vars)
+        self._outer = np.empty((self.n_vars, self.n_vars))
+
+    def reset(self):
+        self.weight = 0.0
+        self.mean[:] = 0.0
+        self.scatter[:] = 0.0
+        self.observations = 0
+
+    def update(self, source_values: np.ndarray, outcome_values: np.ndarray):
+        """Rank-1 update with one observation (per tick/trade)"""
+        row, delta = self._row, self._delta
+        row[:self.n_sources] = source_values
+        row[self.n_sources:] = outcome_values
+
+        self.weight = self.decay * self.weight + 1.0
+        self.scatter *= self.decay
+        np.subtract(row, self.mean, out=delta)
+        self.mean += delta / self.weight
+        # scatter += delta (x - new_mean)^T
+        np.subtract(row, self.mean, out=row)
+        np.multiply.outer(delta, row, out=self._outer)
+        self.scatter += self._outer
+        self.observations += 1
+
+    def update_batch(self, source_values: np.ndarray, outcome_values: np.ndarray):
+        """
+        Add a block of observations in time order
+
+        Args:
+            source_values: (k x n_sources) signal values
+            outcome_values: (k x n_outcomes) realized outcomes
+        """
+        block = np.concatenate([np.asarray(source_values, dtype=np.float64).reshape(-1, self.n_sources),
+                                np.asarray(outcome_values, dtype=np.float64).reshape(-1, self.n_outcomes)], axis=1)
+        k = block.shape[0]
+        if k == 0:
+            return
+
+        # Newest row gets weight 1, the one before decay, and so on
+        weights = self.decay ** np.arange(k - 1, -1, -1, dtype=np.float64)
+        batch_weight = weights.sum()
+        batch_mean = weights @ block / batch_weight
+        centred = block - batch_mean
+        batch_scatter = (centred * weights[:, None]).T @ centred
+
+        # Age existing state by k steps, then merge (weighted Chan update)
+        aged = self.decay ** k
+        prior_weight = self.weight * aged
+        self.scatter *= aged
+        total = prior_weight + batch_weight
+        delta = batch_mean - self.mean
+        self.mean += delta * (batch_weight / total)
+        self.scatter += batch_scatter + np.outer(delta, delta) * (prior_weight * batch_weight / total)
+        self.weight = total
+        self.observations += k
+
+    def initialize(self, source_values: np.ndarray, outcome_values: np.ndarray):
+        """Reset and seed from history in one batch"""
+        self.reset()
+        self.update_batch(source_values, outcome_values)
+
+    def update_fusion(self, signals: np.ndarray, actual_outcomes: np.ndarray):
+        """Batch update from (trades x systems x features) signals and (trades x 2) outcomes"""
+        self.update_batch(fusion_signal_values(signals), fusion_outcome_values(actual_outcomes))
+
+    @property
+    def covariance(self) -> np.ndarray:
+        """Full (sources + outcomes) covariance matrix"""
+        if self.weight <= 0:
+            return np.zeros_like(self.scatter)
+        return self.scatter / self.weight
+
+    @property
+    def correlation(self) -> np.ndarray:
+        """Full (sources + outcomes) correlation matrix; zero-variance rows are left at zero"""
+        cov = self.covariance
+        std = np.sqrt(np.maximum(np.diag(cov), 0.0))
+        denom = np.outer(std, std)
+        corr = np.divide(cov, denom, out=np.zeros_like(cov), where=denom > 0)
+        np.fill_diagonal(corr, np.where(std > 0, 1.0, 0.0))
+        return corr
+
+    @property
+    def source_correlation(self) -> np.ndarray:
+        """(sources x sources) correlation between strategy signals"""
+        return self.correlation[:self.n_sources, :self.n_sources]
+
+    @property
+    def source_outcome_correlation(self) -> np.ndarray:
+        """(sources x outcomes) correlation of each signal with realized outcomes"""
+        return self.correlation[:self.n_sources, self.n_sources:]
+
+    def effective_sources(self) -> float:
+        """Participation ratio of the signal correlation spectrum (n if orthogonal, 1 if redundant)"""
+        eigenvalues = np.clip(np.linalg.eigvalsh(self.source_correlation), 0.0, None)
+        total = eigenvalues.sum()
+        return float(total * total / np.sum(eigenvalues * eigenvalues)) if total > 0 else 0.0
+
+    def correlation_aware_weights(self, outcome_index: int = 0, ridge: float = 1e-3) -> np.ndarray:
+        """
+        Non-negative fusion weights solving (Sigma + ridge*I) w = cov(signal, outcome)
+
+        Redundant (correlated) sources share weight instead of each receiving full credit.
+        Falls back to equal weights when no source has positive edge.
+        """
+        cov = self.covariance
+        sigma = cov[:self.n_sources, :self.n_sources]
+        edge = cov[:self.n_sources, self.n_sources + outcome_index]
+        scale = np.trace(sigma) / self.n_sources if self.n_sources else 0.0
+        regularized = sigma + (ridge * scale if scale > 0 else ridge) * np.eye(self.n_sources)
+        weights = np.clip(np.linalg.solve(regularized, edge), 0.0, None)
+        total = weights.sum()
+        return weights / total if total > 0 else np.full(self.n_sources, 1.0 / self.n_sources)
+
+
+if __name__ == "__main__":
+    import time
+
+    print("SignalCartel Signal Correlation Tracker")
+    print("=" * 50)
+
+    rng = np.random.default_rng(42)
+    n_sources, n_history = 50, 20000
+    latent = rng.normal(size=(n_history, 5))
+    loadings = rng.normal(size=(5, n_sources))
+    sources = latent @ loadings + rng.normal(size=(n_history, n_sources))
+    outcomes = latent[:, :1] * 0.5 + rng.normal(size=(n_history, 1))
+
+    tracker = SignalCorrelationTracker(n_sources, halflife=2000)
+    tracker.initialize(sources[:-1000], outcomes[:-1000])
+
+    start_time = time.perf_counter()
+    for t in range(n_history - 1000, n_history):
+        tracker.update(sources[t], outcomes[t])
+    elapsed = (time.perf_counter() - start_time) / 1000
+
+    print(f"Rank-1 update for {n_sources} sources: {elapsed * 1e6:.1f}us")
+    print(f"Effective independent sources: {tracker.effective_sources():.2f} of {n_sources}")
+    print(f"Top weights: {np.sort(tracker.correlation_aware_weights())[-5:].round(3)}")
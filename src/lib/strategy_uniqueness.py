@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Scalable Strategy Uniqueness Analysis for SignalCartel
+Vectorized replacement for calculate_strategy_uniqueness over a feature matrix of
+strategy profiles, sized for registry exports and optimizer sweeps (10^4-10^5 variants)
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Score weights, same as calculate_strategy_uniqueness
+SPECIALTY_WEIGHT = 0.3
+MATH_WEIGHT = 0.25
+PERFORMANCE_WEIGHT = 0.25
+COMPLEXITY_WEIGHT = 0.2
+
+
+class StrategyProfileMatrix:
+    """Column-oriented strategy profiles: categorical codes plus a numeric performance space"""
+
+    def __init__(self, names: Sequence[str], specialties: Sequence[str], math_domains: Sequence[str],
+                 performance: np.ndarray, complexity: np.ndarray):
+        self.names = list(names)
+        self.specialties = np.asarray(specialties, dtype=object)
+        self.math_domains = np.asarray(math_domains, dtype=object)
+        self.performance = np.ascontiguousarray(performance, dtype=np.float64)
+        self.complexity = np.asarray(complexity, dtype=np.float64)
+        if self.performance.ndim != 2 or self.performance.shape[0] != len(self.names):
+            raise ValueError("Performance matrix must be (strategies x features)")
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_strategies(cls, strategies: Sequence) -> 'StrategyProfileMatrix':
+        """Build from AIStrategy objects (performance space = accuracy, magnitude span)"""
+        return cls(
+            [s.name for s in strategies],
+            [s.specialty for s in strategies],
+            [s.math_domain for s in strategies],
+            np.array([[s.accuracy, s.magnitude_range[1] - s.magnitude_range[0]] for s in strategies]),
+            np.array([s.computational_complexity for s in strategies])
+        )
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict], feature_keys: Optional[Sequence[str]] = None) -> 'StrategyProfileMatrix':
+        """
+        Build from JSON-style records (registry exports, optimizer sweep results)
+
+        Args:
+            records: Dicts with name, specialty, math_domain, computational_complexity and
+                either accuracy + magnitude_range or the keys listed in feature_keys
+            feature_keys: Numeric keys forming the performance space
+        """
+        if feature_keys:
+            performance = np.array([[r[k] for k in feature_keys] for r in records], dtype=np.float64)
+        else:
+            performance = np.array([[r['accuracy'], r['magnitude_range'][1] - r['magnitude_range'][0]]
+                                    for r in records], dtype=np.float64)
+        return cls(
+            [r.get('name', r.get('id', str(i))) for i, r in enumerate(records)],
+            [r.get('specialty', '') for r in records],
+            [r.get('math_domain', '') for r in records],
+            performance,
+            np.array([r.get('computational_complexity', 0) for r in records], dtype=np.float64)
+        )
+
+
+def category_uniqueness(categories: np.ndarray) -> np.ndarray:
+    """1 / (number of strategies sharing the category), via one hash-grouped count"""
+    _, inverse, counts = np.unique(categories, return_inverse=True, return_counts=True)
+    return 1.0 / counts[inverse.reshape(-1)]
+
+
+def nearest_neighbour_distance(points: np.ndarray, chunk_size: int = 2048) -> np.ndarray:
+    """
+    Euclidean distance from every point to its nearest other point
+
+    Uses a KD-tree when SciPy is available, otherwise chunked squared-distance expansion.
+    """
+    n = points.shape[0]
+    if n < 2:
+        return np.full(n, np.inf)
+
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:  # Fall back to chunked brute-force distances
+        cKDTree = None
+    if cKDTree is not None:
+        distances, _ = cKDTree(points).query(points, k=2)
+        return distances[:, 1]
+
+    squared_norms = np.einsum('ij,ij->i', points, points)
+    nearest = np.empty(n)
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        d2 = squared_norms[start:stop, None] + squared_norms[None, :] - 2.0 * (points[start:stop] @ points.T)
+        d2[np.arange(stop - start), np.arange(start, stop)] = np.inf  # Exclude self
+        nearest[start:stop] = np.sqrt(np.maximum(d2.min(axis=1), 0.0))
+    return nearest
+
+
+def analyze_uniqueness(profiles: StrategyProfileMatrix) -> Dict[str, np.ndarray]:
+    """
+    Uniqueness components and combined score for every strategy
+
+    Returns:
+        Dict of per-strategy arrays: specialty, math, performance, complexity and total uniqueness
+    """
+    specialty = category_uniqueness(profiles.specialties)
+    math_domain = category_uniqueness(profiles.math_domains)
+    performance = nearest_neighbour_distance(profiles.performance)
+    complexity = np.abs(profiles.complexity - profiles.complexity.mean()) / 10
+
+    total = (specialty * SPECIALTY_WEIGHT + math_domain * MATH_WEIGHT +
+             performance * PERFORMANCE_WEIGHT + complexity * COMPLEXITY_WEIGHT)
+
+    return {
+        'specialty_uniqueness': specialty,
+        'math_uniqueness': math_domain,
+        'performance_uniqueness': performance,
+        'complexity_uniqueness': complexity,
+        'total_uniqueness': total
+    }
+
+
+def uniqueness_metrics(profiles: StrategyProfileMatrix) -> Dict[str, Dict]:
+    """Per-strategy dicts in the shape returned by calculate_strategy_uniqueness"""
+    scores = analyze_uniqueness(profiles)
+    return {
+        name: {
+            **{key: float(values[i]) for key, values in scores.items()},
+            'mathematical_basis': profiles.math_domains[i]
+        }
+        for i, name in enumerate(profiles.names)
+    }
+
+
+def _component_labels(n: int, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """
+    Connected-component labels of an undirected edge list via array union-find
+
+    Every pass hooks the larger root of each edge onto the smaller one, then compresses
+    paths by pointer jumping until every node points at its root.
+    """
+    parent = np.arange(n)
+    while True:
+        root_r, root_c = parent[rows], parent[cols]
+        linked = root_r != root_c
+        if not linked.any():
+            break
+        np.minimum.at(parent, np.maximum(root_r, root_c)[linked], np.minimum(root_r, root_c)[linked])
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+    return np.unique(parent, return_inverse=True)[1].reshape(-1)
+
+
+def correlation_clusters(signals: np.ndarray, threshold: float = 0.9,
+                         max_chunk_bytes: int = 64 * 1024 * 1024) -> np.ndarray:
+    """
+    Group strategies whose signal histories are correlated above a threshold
+
+    Args:
+        signals: (strategies x observations) signal matrix
+        threshold: Minimum Pearson correlation linking two strategies
+        max_chunk_bytes: Budget for the (rows x strategies) correlation block held at once
+
+    Returns:
+        Cluster label per strategy (connected components of the correlation graph)
+    """
+    signals = np.asarray(signals, dtype=np.float64)
+    n, n_obs = signals.shape
+    centred = signals - signals.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(centred, axis=1, keepdims=True)
+    unit = np.divide(centred, norms, out=np.zeros_like(centred), where=norms > 0)
+
+    # One float64 block plus its boolean mask, both reused across chunks
+    chunk_rows = int(max(1, min(n, max_chunk_bytes // (9 * max(n, 1)))))
+    corr_buffer = np.empty((chunk_rows, n))
+    mask_buffer = np.empty((chunk_rows, n), dtype=bool)
+
+    rows: List[np.ndarray] = []
+    cols: List[np.ndarray] = []
+    for start in range(0, n, chunk_rows):
+        stop = min(start + chunk_rows, n)
+        corr = np.matmul(unit[start:stop], unit.T, out=corr_buffer[:stop - start])
+        mask = np.greater_equal(corr, threshold, out=mask_buffer[:stop - start])
+        r, c = np.nonzero(mask)
+        upper = c > r + start  # Each undirected edge once, no self loops
+        rows.append(r[upper] + start)
+        cols.append(c[upper])
+
+    row_idx = np.concatenate(rows) if rows else np.empty(0, dtype=np.intp)
+    col_idx = np.concatenate(cols) if cols else np.empty(0, dtype=np.intp)
+
+    try:
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import connected_components
+    except ImportError:  # Fall back to array union-find
+        return _component_labels(n, row_idx, col_idx)
+    graph = coo_matrix((np.ones(row_idx.size, dtype=np.int8), (row_idx, col_idx)), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+    return labels
+
+
+def diversity_summary(profiles: StrategyProfileMatrix, signals: Optional[np.ndarray] = None,
+                      threshold: float = 0.9) -> Dict:
+    """Universe-level diversity: category counts, distance spread and effective cluster count"""
+    scores = analyze_uniqueness(profiles)
+    summary = {
+        'strategies': len(profiles),
+        'specialties': int(np.unique(profiles.specialties).size),
+        'math_domains': int(np.unique(profiles.math_domains).size),
+        'median_nn_distance': float(np.median(scores['performance_uniqueness'])),
+        'mean_total_uniqueness': float(scores['total_uniqueness'].mean())
+    }
+    if signals is not None:
+        labels = correlation_clusters(signals, threshold)
+        summary['signal_clusters'] = int(labels.max() + 1) if labels.size else 0
+    return summary
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+    import time
+
+    print("SignalCartel Strategy Uniqueness Analysis")
+    print("=" * 50)
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'r') as f:
+            profiles = StrategyProfileMatrix.from_records(json.load(f))
+    else:
+        # Synthetic optimizer sweep
+        rng = np.random.default_rng(42)
+        n = 50000
+        specialties = ['deep_learning', 'microstructure', 'state_prediction', 'profit_optimization',
+                       'multi_dimensional', 'technical_analysis', 'mathematical']
+        profiles = StrategyProfileMatrix(
+            [f"variant_{i}" for i in range(n)],
+            rng.choice(specialties, n),
+            rng.choice([f"domain_{d}" for d in range(20)], n),
+            np.column_stack([rng.uniform(0.55, 0.85, n), rng.uniform(0.005, 0.04, n)]),
+            rng.integers(1, 11, n)
+        )
+
+    start_time = time.perf_counter()
+    summary = diversity_summary(profiles)
+    elapsed = time.perf_counter() - start_time
+
+    for key, value in summary.items():
+        print(f"{key:25}: {value}")
+    print(f"\nAnalyzed {len(profiles)} strategies in {elapsed:.3f}s")
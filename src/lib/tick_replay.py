@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Tick Record/Replay Harness for SignalCartel
+Records tick or bar streams to a compact binary log (JSON header + fixed-width records, read
+back as a memory map) and replays them at 1x, Nx or maximum speed through the indicator engine,
+fusion kernel and signal extraction, reporting per-stage latency percentiles and sustained
+throughput; a bursty geometric random walk stands in for live exchange feeds
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from gpu_accelerated_indicators import (DEFAULT_SIGNAL_RULES, GPUIndicators, extract_signals, sma_period,
+                                      validate_rules)
+from tensor_fusion_kernel import CONFIDENCE, DIRECTION, MAGNITUDE, FusionKernel, SignalBlock
+
+MAGIC = b'SCTLOG01'
+HEADER_ALIGNMENT = 8
+
+# Packed little-endian records: 22 bytes per tick, 46 per bar
+RECORD_DTYPES = {
+    'tick': np.dtype([('timestamp', '<i8'), ('symbol', '<u2'), ('price', '<f8'), ('volume', '<f4')]),
+    'bar': np.dtype([('timestamp', '<i8'), ('symbol', '<u2'), ('open', '<f8'), ('high', '<f8'),
+                     ('low', '<f8'), ('close', '<f8'), ('volume', '<f4')])
+}
+PRICE_FIELD = {'tick': 'price', 'bar': 'close'}
+
+STAGES = ('ingest', 'indicators', 'fusion', 'signals', 'end_to_end')
+# Stand-in strategies fused per symbol, derived from the indicator stage
+STRATEGIES = ('rsi_reversion', 'bollinger_reversion', 'macd_momentum')
+
+DEFAULT_WINDOW = 200
+DEFAULT_STEP_MS = 1000
+DEFAULT_WARMUP_STEPS = 5
+
+
+class TickLogWriter:
+    """
+    Append-only tick/bar log
+
+    The record count is derived from the file size, so a log cut short mid-write
+    (e.g. a recorder killed during a live session) stays readable up to the last full record.
+    """
+
+    def __init__(self, path: str, symbols: Sequence[str], kind: str = 'tick', metadata: Optional[Dict] = None):
+        if kind not in RECORD_DTYPES:
+            raise ValueError(f"Unknown record kind '{kind}', expected one of {sorted(RECORD_DTYPES)}")
+        self.path = path
+        self.kind = kind
+        self.dtype = RECORD_DTYPES[kind]
+        self.symbols = list(symbols)
+        self.symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.count = 0
+
+        header = json.dumps({'kind': kind, 'symbols': self.symbols, 'dtype': self.dtype.descr,
+                             'metadata': metadata or {}}).encode()
+        padding = -(len(MAGIC) + 4 + len(header)) % HEADER_ALIGNMENT
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC + struct.pack('<I', len(header) + padding) + header + b' ' * padding)
+
+    def write(self, records: np.ndarray):
+        """Append a structured array of records (RECORD_DTYPES[kind] fields, any order)"""
+        records = np.asarray(records)
+        if records.dtype != self.dtype:
+            converted = np.empty(records.shape[0], dtype=self.dtype)
+            for name in self.dtype.names:
+                converted[name] = records[name]
+            records = converted
+        self._file.write(records.tobytes())
+        self.count += records.shape[0]
+
+    def write_tick(self, timestamp: int, symbol: str, price: float, volume: float = 0.0):
+        """Append one tick (e.g. from a live feed callback)"""
+        record = np.zeros(1, dtype=self.dtype)
+        record['timestamp'] = timestamp
+        record['symbol'] = self.symbol_index[symbol]
+        record[PRICE_FIELD[self.kind]] = price
+        record['volume'] = volume
+        self.write(record)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_tick_log(path: str, records: np.ndarray, symbols: Sequence[str], kind: str = 'tick',
+                   metadata: Optional[Dict] = None) -> int:
+    """Write a whole record array; returns the file size in bytes"""
+    with TickLogWriter(path, symbols, kind, metadata) as writer:
+        writer.write(records)
+    return os.path.getsize(path)
+
+
+def read_tick_log(path: str) -> Tuple[Dict, np.ndarray]:
+    """
+    Open a log written by TickLogWriter
+
+    Returns:
+        (header dict with kind, symbols and metadata, read-only memory-mapped record array)
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a SignalCartel tick log")
+        (header_length,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(header_length))
+    dtype = RECORD_DTYPES[header['kind']]
+    offset = len(MAGIC) + 4 + header_length
+    count = (os.path.getsize(path) - offset) // dtype.itemsize
+    if count == 0:
+        return header, np.zeros(0, dtype=dtype)
+    return header, np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(count,))
+
+
+def synthetic_ticks(n_symbols: int = 100, duration_s: float = 60.0, rate_hz: float = 5.0,
+                    tick_volatility: float = 0.0005, burst_rate_hz: float = 0.1, burst_ticks: int = 50,
+                    burst_span_ms: int = 200, start_ms: int = 1_700_000_000_000, seed: int = 42) -> np.ndarray:
+    """
+    Geometric random walk tick feed (as in benchmark_rsi_performance) with market-wide bursts
+
+    Each symbol ticks as a Poisson process at rate_hz; bursts arrive at burst_rate_hz and add
+    burst_ticks ticks per symbol within burst_span_ms, the pattern of news or liquidation cascades.
+
+    Returns:
+        Time-ordered RECORD_DTYPES['tick'] array
+    """
+    rng = np.random.default_rng(seed)
+    duration_ms = int(duration_s * 1000)
+
+    counts = rng.poisson(rate_hz * duration_s, n_symbols)
+    symbols = np.repeat(np.arange(n_symbols), counts)
+    times = rng.integers(0, duration_ms, symbols.size)
+
+    burst_starts = rng.integers(0, max(duration_ms - burst_span_ms, 1), rng.poisson(burst_rate_hz * duration_s))
+    if burst_starts.size:
+        burst_symbols = np.tile(np.repeat(np.arange(n_symbols), burst_ticks), burst_starts.size)
+        burst_times = (np.repeat(burst_starts, n_symbols * burst_ticks)
+                       + rng.integers(0, burst_span_ms, burst_symbols.size))
+        symbols = np.concatenate([symbols, burst_symbols])
+        times = np.concatenate([times, burst_times])
+
+    # Random walk along each symbol's own ticks: cumulative log returns restarted per symbol
+    order = np.lexsort((times, symbols))
+    symbols, times = symbols[order], times[order]
+    log_returns = rng.normal(0, tick_volatility, symbols.size)
+    walk = np.cumsum(log_returns)
+    per_symbol = np.bincount(symbols, minlength=n_symbols)
+    starts = np.cumsum(per_symbol) - per_symbol
+    walk -= np.repeat(np.concatenate([[0.0], walk])[starts], per_symbol)
+    base_prices = rng.uniform(50, 200, n_symbols)
+
+    records = np.empty(symbols.size, dtype=RECORD_DTYPES['tick'])
+    records['timestamp'] = start_ms + times
+    records['symbol'] = symbols
+    records['price'] = base_prices[symbols] * np.exp(walk)
+    records['volume'] = rng.lognormal(0, 1, symbols.size)
+    return records[np.argsort(records['timestamp'], kind='stable')]
+
+
+class ReplayPipeline:
+    """
+    The per-tick Python path: rolling price window -> indicators -> fusion -> signal extraction
+
+    Every buffer (window, indicator outputs, signal block, fusion result) is preallocated, so
+    replay timings measure compute rather than allocator behaviour.
+    """
+
+    def __init__(self, n_symbols: int, window: int = DEFAULT_WINDOW, rules: Optional[List[Dict]] = None,
+                 use_gpu: Optional[bool] = None, weights: Sequence[float] = (1.0, 1.0, 1.0)):
+        self.n_symbols = n_symbols
+        self.window = window
+        self.rules = DEFAULT_SIGNAL_RULES if rules is None else rules
+        validate_rules(self.rules)
+        self.indicators = GPUIndicators(use_gpu=use_gpu, workspace=True)
+        self.kernel = FusionKernel(n_symbols, len(STRATEGIES), weights)
+        self.block = SignalBlock(n_symbols, len(STRATEGIES))
+
+        shape = (n_symbols, window)
+        self.prices = np.full(shape, np.nan, dtype=np.float32)
+        self.last_price = np.full(n_symbols, np.nan, dtype=np.float32)
+        self.rsi = np.empty(shape, dtype=np.float32)
+        self.bollinger = tuple(np.empty(shape, dtype=np.float32) for _ in range(3))
+        self.macd = tuple(np.empty(shape, dtype=np.float32) for _ in range(3))
+
+        names = {name for rule in self.rules for name in (rule['series'], rule.get('reference', ''))}
+        # Series name -> period; 'sma20' and 'sma_20' share one buffer
+        self.sma_series = {name: sma_period(name) for name in names if sma_period(name) is not None}
+        self.sma = {period: np.empty(shape, dtype=np.float32) for period in sorted(set(self.sma_series.values()))}
+        # Crossovers compare the newest bar with the one before (plus any confirmation bars)
+        self.lookback = max(int(rule.get('confirm_bars', 1)) for rule in self.rules) + 1
+        self._scratch = np.empty(n_symbols, dtype=np.float32)
+
+    def ingest(self, symbols: np.ndarray, prices: np.ndarray):
+        """Latest price per symbol from a step's ticks, then advance every symbol's window one bar"""
+        if symbols.size:
+            # Last tick wins: unique over the reversed step keeps each symbol's final occurrence
+            unique, first = np.unique(symbols[::-1], return_index=True)
+            self.last_price[unique] = prices[::-1][first]
+        np.copyto(self.prices[:, :-1], self.prices[:, 1:])
+        self.prices[:, -1] = self.last_price
+        # Symbols not seen yet carry a flat history once they first tick
+        unseen = np.isnan(self.prices[:, 0]) & ~np.isnan(self.last_price)
+        if unseen.any():
+            self.prices[unseen] = self.last_price[unseen, None]
+
+    def compute_indicators(self):
+        indicators = self.indicators
+        indicators.rsi_batch(self.prices, out=self.rsi)
+        indicators.bollinger_bands_batch(self.prices, out=self.bollinger)
+        indicators.macd_batch(self.prices, out=self.macd)
+        for period, out in self.sma.items():
+            indicators.sma_batch(self.prices, period=period, out=out)
+
+    def fuse(self):
+        """Fill the signal block from the newest indicator values and fuse every symbol"""
+        data, scratch = self.block.data, self._scratch
+        close = self.prices[:, -1]
+        rsi = self.rsi[:, -1]
+        upper, middle, lower = (band[:, -1] for band in self.bollinger)
+        histogram = self.macd[2][:, -1]
+
+        # Band half-width relative to price is every strategy's expected move
+        np.subtract(upper, lower, out=scratch)
+        np.divide(scratch, 2 * np.abs(middle) + 1e-10, out=data[MAGNITUDE, :, 0])
+        data[MAGNITUDE, :, 1] = data[MAGNITUDE, :, 0]
+        data[MAGNITUDE, :, 2] = data[MAGNITUDE, :, 0]
+
+        # RSI mean reversion: long below 50, confidence grows towards 0 / 100
+        np.subtract(50, rsi, out=scratch)
+        np.sign(scratch, out=data[DIRECTION, :, 0])
+        np.abs(scratch, out=scratch)
+        np.divide(scratch, 50, out=data[CONFIDENCE, :, 0])
+
+        # Bollinger mean reversion on %B
+        np.subtract(close, lower, out=scratch)
+        np.divide(scratch, upper - lower + 1e-10, out=scratch)
+        np.subtract(0.5, scratch, out=scratch)
+        np.sign(scratch, out=data[DIRECTION, :, 1])
+        np.abs(scratch, out=scratch)
+        np.multiply(scratch, 2, out=scratch)
+        np.minimum(scratch, 1, out=data[CONFIDENCE, :, 1])
+
+        # MACD momentum: histogram sign, confidence from its size relative to the band width
+        np.sign(histogram, out=data[DIRECTION, :, 2])
+        np.abs(histogram, out=scratch)
+        np.divide(scratch, upper - lower + 1e-10, out=scratch)
+        np.minimum(scratch, 1, out=data[CONFIDENCE, :, 2])
+
+        np.nan_to_num(data, copy=False)
+        return self.kernel.fuse(self.block)
+
+    def extract(self) -> Dict[str, np.ndarray]:
+        """Signal events on the newest bar, evaluated over just the bars the rules need"""
+        tail = slice(self.window - self.lookback, self.window)
+        series = {'close': self.prices[:, tail], 'rsi': self.rsi[:, tail]}
+        series.update(zip(('bb_upper', 'bb_middle', 'bb_lower'), (band[:, tail] for band in self.bollinger)))
+        series.update(zip(('macd', 'macd_signal', 'macd_histogram'), (line[:, tail] for line in self.macd)))
+        series.update((name, self.sma[period][:, tail]) for name, period in self.sma_series.items())
+        events = extract_signals(series, self.rules)
+        newest = events['bar'] == self.lookback - 1
+        return {name: values[newest] if isinstance(values, np.ndarray) else values
+                for name, values in events.items()}
+
+
+def latency_summary(samples: np.ndarray) -> Dict:
+    """Latency percentiles in milliseconds"""
+    if samples.size == 0:
+        return {'count': 0}
+    p50, p90, p99, p999 = np.percentile(samples, [50, 90, 99, 99.9]) * 1000
+    return {
+        'count': int(samples.size),
+        'mean_ms': float(samples.mean() * 1000),
+        'p50_ms': float(p50),
+        'p90_ms': float(p90),
+        'p99_ms': float(p99),
+        'p999_ms': float(p999),
+        'max_ms': float(samples.max() * 1000)
+    }
+
+
+def replay(records: np.ndarray, pipeline: ReplayPipeline, speed: Optional[float] = None,
+           kind: str = 'tick', step_ms: int = DEFAULT_STEP_MS, warmup_steps: int = DEFAULT_WARMUP_STEPS,
+           max_steps: Optional[int] = None) -> Dict:
+    """
+    Replay a time-ordered record stream through the pipeline
+
+    Records are grouped into bars of step_ms log time. At a finite speed each bar is released
+    when its last tick would have arrived (log time / speed after the start) and end_to_end
+    latency runs from that release, so it includes any queueing once the pipeline falls behind;
+    speed=None replays as fast as the pipeline runs.
+
+    Args:
+        records: RECORD_DTYPES[kind] array, e.g. from read_tick_log or synthetic_ticks
+        pipeline: ReplayPipeline sized for the log's symbols
+        speed: Replay speed multiple (1.0 = real time), None for maximum
+        kind: 'tick' or 'bar'
+        step_ms: Bar interval the stream is sampled into
+        warmup_steps: Leading steps excluded from the statistics
+        max_steps: Stop after this many steps
+
+    Returns:
+        Report dict: per-stage latency percentiles, ticks and steps per second, lag statistics
+        and signal event count
+    """
+    timestamps = np.asarray(records['timestamp'])
+    prices = np.asarray(records[PRICE_FIELD[kind]], dtype=np.float32)
+    symbols = np.asarray(records['symbol'], dtype=np.int64)
+    if timestamps.size == 0:
+        raise ValueError("No records to replay")
+
+    # Step boundaries over the log's time range (empty bars are skipped)
+    start_ts = int(timestamps[0])
+    step_ids = (timestamps - start_ts) // step_ms
+    boundaries = np.flatnonzero(np.diff(step_ids)) + 1
+    bounds = np.concatenate([[0], boundaries, [timestamps.size]])
+    n_steps = bounds.size - 1 if max_steps is None else min(bounds.size - 1, max_steps)
+
+    timings = np.zeros((n_steps, len(STAGES)))
+    lag = np.zeros(n_steps)
+    events = 0
+    wall_start = time.perf_counter()
+
+    for step in range(n_steps):
+        lo, hi = bounds[step], bounds[step + 1]
+        if speed is not None:
+            release = wall_start + (step_ids[lo] + 1) * step_ms / 1000 / speed
+            delay = release - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        else:
+            release = time.perf_counter()
+
+        t0 = time.perf_counter()
+        pipeline.ingest(symbols[lo:hi], prices[lo:hi])
+        t1 = time.perf_counter()
+        pipeline.compute_indicators()
+        t2 = time.perf_counter()
+        pipeline.fuse()
+        t3 = time.perf_counter()
+        events += pipeline.extract()['symbol'].size
+        t4 = time.perf_counter()
+
+        timings[step] = (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t4 - release)
+        lag[step] = t0 - release
+
+    wall_time = time.perf_counter() - wall_start
+    measured = slice(min(warmup_steps, max(n_steps - 1, 0)), n_steps)
+    ticks = int(bounds[n_steps])
+    measured_ticks = int(bounds[n_steps] - bounds[measured.start])
+    busy = timings[measured, :4].sum()
+    log_span = (int(timestamps[ticks - 1]) - start_ts) / 1000
+
+    return {
+        'speed': speed,
+        'step_ms': step_ms,
+        'symbols': pipeline.n_symbols,
+        'ticks': ticks,
+        'steps': n_steps,
+        'log_span_s': log_span,
+        'wall_time_s': wall_time,
+        'achieved_speed': log_span / wall_time if wall_time > 0 else float('inf'),
+        # Sustained rates the pipeline can absorb: work over compute time, excluding sleeps
+        'throughput_ticks_per_s': measured_ticks / busy if busy > 0 else float('inf'),
+        'throughput_steps_per_s': (n_steps - measured.start) / busy if busy > 0 else float('inf'),
+        'max_lag_ms': float(lag[measured].max() * 1000) if n_steps else 0.0,
+        'behind_steps': int(np.count_nonzero(lag[measured] > 0.001)),
+        'signal_events': events,
+        'stages': {name: latency_summary(timings[measured, i]) for i, name in enumerate(STAGES)}
+    }
+
+
+def print_report(report: Dict):
+    speed = 'max' if report['speed'] is None else f"{report['speed']:g}x"
+    print(f"Replayed {report['ticks']:,} ticks / {report['steps']:,} bars of {report['symbols']} symbols "
+          f"at {speed} in {report['wall_time_s']:.2f}s ({report['achieved_speed']:.1f}x log time)")
+    print(f"Sustained throughput: {report['throughput_ticks_per_s']:,.0f} ticks/s, "
+          f"{report['throughput_steps_per_s']:,.0f} bars/s")
+    print(f"Max lag {report['max_lag_ms']:.2f}ms, {report['behind_steps']} bar(s) released late, "
+          f"{report['signal_events']} signal events")
+    print(f"{'Stage':<12}{'p50':>10}{'p90':>10}{'p99':>10}{'p99.9':>10}{'max':>10}  (ms)")
+    for name, stats in report['stages'].items():
+        if stats['count']:
+            print(f"{name:<12}{stats['p50_ms']:>10.3f}{stats['p90_ms']:>10.3f}{stats['p99_ms']:>10.3f}"
+                  f"{stats['p999_ms']:>10.3f}{stats['max_ms']:>10.3f}")
+
+
+def _parse_speed(value: str) -> Optional[float]:
+    return None if value == 'max' else float(value.rstrip('x'))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="SignalCartel tick record/replay harness")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help="Write a synthetic tick log")
+    record.add_argument('path')
+    record.add_argument('--symbols', type=int, default=100)
+    record.add_argument('--duration', type=float, default=600.0, help="Log length in seconds")
+    record.add_argument('--rate', type=float, default=5.0, help="Ticks per second per symbol")
+    record.add_argument('--burst-rate', type=float, default=0.1, help="Market-wide bursts per second")
+    record.add_argument('--burst-ticks', type=int, default=50, help="Ticks per symbol in each burst")
+    record.add_argument('--seed', type=int, default=42)
+
+    for name, help_text in (('replay', "Replay a recorded log"), ('synthetic', "Replay a synthetic feed directly")):
+        command = commands.add_parser(name, help=help_text)
+        if name == 'replay':
+            command.add_argument('path')
+        else:
+            command.add_argument('--symbols', type=int, default=100)
+            command.add_argument('--duration', type=float, default=120.0)
+            command.add_argument('--rate', type=float, default=5.0)
+            command.add_argument('--seed', type=int, default=42)
+        command.add_argument('--speed', type=_parse_speed, default=None, help="1, N (e.g. 10x) or max")
+        command.add_argument('--step-ms', type=int, default=DEFAULT_STEP_MS)
+        command.add_argument('--window', type=int, default=DEFAULT_WINDOW)
+        command.add_argument('--max-steps', type=int, default=None)
+        command.add_argument('--cpu', action='store_true', help="Force the NumPy backend")
+        command.add_argument('--output', default=None, help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    print("SignalCartel Tick Replay")
+    print("=" * 50)
+
+    if args.command == 'record':
+        records = synthetic_ticks(args.symbols, args.duration, args.rate, burst_rate_hz=args.burst_rate,
+                                  burst_ticks=args.burst_ticks, seed=args.seed)
+        symbols = [f"SYM{i:04d}" for i in range(args.symbols)]
+        size = write_tick_log(args.path, records, symbols, metadata={'source': 'synthetic', 'seed': args.seed})
+        print(f"Recorded {records.size:,} ticks ({size / 1e6:.1f} MB) to {args.path}")
+        return 0
+
+    if args.command == 'replay':
+        header, records = read_tick_log(args.path)
+        kind, n_symbols = header['kind'], len(header['symbols'])
+    else:
+        records = synthetic_ticks(args.symbols, args.duration, args.rate, seed=args.seed)
+        kind, n_symbols = 'tick', args.symbols
+
+    pipeline = ReplayPipeline(n_symbols, window=args.window, use_gpu=False if args.cpu else None)
+    report = replay(records, pipeline, speed=args.speed, kind=kind, step_ms=args.step_ms, max_steps=args.max_steps)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Streaming Trade Statistics for SignalCartel
+Ingests closed trades (ManagedPosition/ManagedTrade exports, CSV/JSONL logs or a
+SQLite stand-in) through mergeable Welford aggregators keyed by (pair, strategy).
+Realized PnL is treated as net of commission; commission is tracked alongside it.
+"""
+import csv
+import json
+import math
+import os
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_COMMISSION = 0.25  # ~$0.25 per trade, same assumption as the proof scripts
+DEFAULT_CHUNK_SIZE = 50000
+
+# Field aliases accepted from exports and logs (first match wins)
+PAIR_FIELDS = ('symbol', 'pair')
+STRATEGY_FIELDS = ('strategy', 'strategyName')
+PNL_FIELDS = ('realizedPnL', 'pnl', 'realized_pnl', 'netPnL')
+COMMISSION_FIELDS = ('commission', 'fee', 'fees')
+
+
+class RunningStats:
+    """Constant-memory Welford accumulator for one (pair, strategy) stream"""
+
+    __slots__ = ('count', 'mean', 'm2', 'wins', 'commission_total', 'min_pnl', 'max_pnl')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.wins = 0
+        self.commission_total = 0.0
+        self.min_pnl = math.inf
+        self.max_pnl = -math.inf
+
+    def update(self, pnl: float, commission: float = 0.0):
+        """Add a single closed trade"""
+        self.count += 1
+        delta = pnl - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (pnl - self.mean)
+        if pnl > 0:
+            self.wins += 1
+        self.commission_total += commission
+        self.min_pnl = min(self.min_pnl, pnl)
+        self.max_pnl = max(self.max_pnl, pnl)
+
+    def update_batch(self, pnls: np.ndarray, commissions: Optional[np.ndarray] = None):
+        """Add a chunk of trades with whole-array ops, then merge"""
+        pnls = np.asarray(pnls, dtype=np.float64)
+        if pnls.size == 0:
+            return
+        chunk = RunningStats()
+        chunk.count = int(pnls.size)
+        chunk.mean = float(pnls.mean())
+        chunk.m2 = float(np.sum((pnls - chunk.mean) ** 2))
+        chunk.wins = int(np.count_nonzero(pnls > 0))
+        chunk.commission_total = float(np.sum(commissions)) if commissions is not None else 0.0
+        chunk.min_pnl = float(pnls.min())
+        chunk.max_pnl = float(pnls.max())
+        self.merge(chunk)
+
+    def merge(self, other: 'RunningStats') -> 'RunningStats':
+        """Combine with another accumulator (Chan et al. parallel variance)"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            for field in self.__slots__:
+                setattr(self, field, getattr(other, field))
+            return self
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.wins += other.wins
+        self.commission_total += other.commission_total
+        self.min_pnl = min(self.min_pnl, other.min_pnl)
+        self.max_pnl = max(self.max_pnl, other.max_pnl)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Population variance (matches np.std used by the proofs)"""
+        return self.m2 / self.count if self.count > 0 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.count if self.count > 0 else 0.0
+
+    @property
+    def commission_per_trade(self) -> float:
+        return self.commission_total / self.count if self.count > 0 else 0.0
+
+    @property
+    def gross_mean(self) -> float:
+        """Mean PnL before commission"""
+        return self.mean + self.commission_per_trade
+
+    @property
+    def commission_drag(self) -> float:
+        """Fraction of gross PnL (before commission) consumed by commission"""
+        gross = self.mean * self.count + self.commission_total
+        return self.commission_total / abs(gross) if gross != 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'trades': self.count,
+            'mean_pnl': self.mean,
+            'std_pnl': self.std,
+            'win_rate': self.win_rate,
+            'commission_per_trade': self.commission_per_trade,
+            'commission_drag': self.commission_drag
+        }
+
+    def to_state(self) -> List:
+        return [self.count, self.mean, self.m2, self.wins, self.commission_total,
+                self.min_pnl if self.count else None, self.max_pnl if self.count else None]
+
+    @classmethod
+    def from_state(cls, state: List) -> 'RunningStats':
+        stats = cls()
+        stats.count, stats.mean, stats.m2, stats.wins, stats.commission_total = state[:5]
+        if stats.count:
+            stats.min_pnl, stats.max_pnl = state[5], state[6]
+        return stats
+
+
+class TradeStatisticsBook:
+    """Per-(pair, strategy) accumulators plus the cursors needed to resume ingestion"""
+
+    def __init__(self, default_commission: float = DEFAULT_COMMISSION,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.default_commission = default_commission
+        self.chunk_size = chunk_size
+        self.stats: Dict[Tuple[str, str], RunningStats] = {}
+        self.cursors: Dict[str, object] = {}
+
+    def _get(self, key: Tuple[str, str]) -> RunningStats:
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = RunningStats()
+        return stats
+
+    def add_trade(self, pair: str, strategy: str, pnl: float, commission: Optional[float] = None):
+        """Add one closed trade"""
+        self._get((pair, strategy)).update(
+            pnl, self.default_commission if commission is None else commission)
+
+    def ingest(self, trades: Iterable[Dict]) -> int:
+        """
+        Stream trade records through the aggregators in bounded chunks
+
+        Args:
+            trades: Iterable of dict-like records (export rows, log lines, DB rows)
+
+        Returns:
+            Number of trades ingested
+        """
+        ingested = 0
+        pending: Dict[Tuple[str, str], Tuple[List[float], List[float]]] = {}
+        buffered = 0
+
+        for record in trades:
+            trade = normalize_trade(record, self.default_commission)
+            if trade is None:
+                continue
+            pair, strategy, pnl, commission = trade
+            bucket = pending.get((pair, strategy))
+            if bucket is None:
+                bucket = pending[(pair, strategy)] = ([], [])
+            bucket[0].append(pnl)
+            bucket[1].append(commission)
+            buffered += 1
+            if buffered >= self.chunk_size:
+                ingested += self._flush(pending)
+                buffered = 0
+
+        return ingested + self._flush(pending)
+
+    def _flush(self, pending: Dict) -> int:
+        flushed = 0
+        for key, (pnls, commissions) in pending.items():
+            self._get(key).update_batch(np.asarray(pnls), np.asarray(commissions))
+            flushed += len(pnls)
+        pending.clear()
+        return flushed
+
+    def merge(self, other: 'TradeStatisticsBook') -> 'TradeStatisticsBook':
+        """Fold in a book built by another worker"""
+        for key, stats in other.stats.items():
+            self._get(key).merge(stats)
+        return self
+
+    def _grouped(self, index: int) -> Dict[str, RunningStats]:
+        grouped: Dict[str, RunningStats] = {}
+        for key, stats in self.stats.items():
+            grouped.setdefault(key[index], RunningStats()).merge(stats)
+        return grouped
+
+    def by_pair(self) -> Dict[str, RunningStats]:
+        return self._grouped(0)
+
+    def by_strategy(self) -> Dict[str, RunningStats]:
+        return self._grouped(1)
+
+    def total(self) -> RunningStats:
+        total = RunningStats()
+        for stats in self.stats.values():
+            total.merge(stats)
+        return total
+
+    def to_real_data(self) -> Dict:
+        """
+        Per-pair statistics in the shape of REAL_DATA / real_trades
+
+        As in those literals, mean_pnl is gross (before commission; the proofs subtract
+        commission_per_trade themselves); the net mean is kept under net_mean_pnl.
+        """
+        data: Dict = {}
+        for pair, stats in sorted(self.by_pair().items()):
+            entry = stats.to_dict()
+            entry['net_mean_pnl'] = stats.mean
+            entry['mean_pnl'] = stats.gross_mean
+            data[pair] = entry
+        data['commission_per_trade'] = self.total().commission_per_trade
+        return data
+
+    def to_real_trading_data(self, account_balance: Optional[float] = None) -> Dict:
+        """Aggregate statistics in the shape of REAL_TRADING_DATA"""
+        total = self.total()
+        commission = total.commission_per_trade
+        return {
+            'total_trades': total.count,
+            'win_rate': total.win_rate,
+            'avg_pnl_per_trade': total.gross_mean,
+            'commission_per_trade': commission,
+            'net_pnl_per_trade': total.mean,
+            'account_balance': account_balance
+        }
+
+    def save(self, path: str):
+        """Persist aggregates and cursors so the next run only reads new trades"""
+        state = {
+            'default_commission': self.default_commission,
+            'stats': [[pair, strategy, stats.to_state()] for (pair, strategy), stats in self.stats.items()],
+            'cursors': self.cursors
+        }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'TradeStatisticsBook':
+        with open(path, 'r') as f:
+            state = json.load(f)
+        book = cls(default_commission=state.get('default_commission', DEFAULT_COMMISSION))
+        for pair, strategy, stats_state in state['stats']:
+            book.stats[(pair, strategy)] = RunningStats.from_state(stats_state)
+        book.cursors = state.get('cursors', {})
+        return book
+
+
+def _first(record: Dict, fields: Tuple[str, ...]):
+    for field in fields:
+        value = record.get(field)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def normalize_trade(record: Dict, default_commission: float = DEFAULT_COMMISSION) -> Optional[Tuple[str, str, float, float]]:
+    """Map an export/log/DB record to (pair, strategy, pnl, commission); None for open or entry rows"""
+    if record.get('isEntry') in (True, 1, 'true', 'True'):
+        return None
+    status = record.get('status')
+    if status not in (None, '', 'closed'):
+        return None
+
+    pnl = _first(record, PNL_FIELDS)
+    pair = _first(record, PAIR_FIELDS)
+    if pnl is None or pair is None:
+        return None
+
+    commission = _first(record, COMMISSION_FIELDS)
+    return (
+        str(pair),
+        str(_first(record, STRATEGY_FIELDS) or 'unknown'),
+        float(pnl),
+        default_commission if commission is None else float(commission)
+    )
+
+
+def iter_jsonl_trades(path: str, cursors: Optional[Dict] = None) -> Iterator[Dict]:
+    """Yield records appended to a JSONL log since the last stored byte offset"""
+    cursor_key = 'jsonl:' + os.path.abspath(path)
+    offset = cursors.get(cursor_key, 0) if cursors is not None else 0
+    if offset > os.path.getsize(path):
+        offset = 0  # Log was rotated/truncated
+
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while True:
+            line = f.readline()
+            if not line:
+                break
+            if not line.endswith(b'\n'):
+                break  # Partial write, pick it up next time
+            offset = f.tell()
+            if cursors is not None:
+                cursors[cursor_key] = offset
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def iter_csv_trades(path: str, cursors: Optional[Dict] = None) -> Iterator[Dict]:
+    """Yield CSV rows (with header) past the last stored row count"""
+    cursor_key = 'csv:' + os.path.abspath(path)
+    skip = cursors.get(cursor_key, 0) if cursors is not None else 0
+
+    with open(path, 'r', newline='') as f:
+        for row_number, row in enumerate(csv.DictReader(f), start=1):
+            if row_number <= skip:
+                continue
+            if cursors is not None:
+                cursors[cursor_key] = row_number
+            yield row
+
+
+def iter_db_trades(connection, cursors: Optional[Dict] = None, batch_size: int = 5000) -> Iterator[Dict]:
+    """
+    Yield closed ManagedPosition rows not seen before the stored exitTime watermark
+
+    The watermark is inclusive and remembers the ids already read at that exitTime, so rows
+    sharing the last-seen exitTime but committed after the previous run are still picked up.
+
+    Args:
+        connection: DB-API connection with qmark parameters (the sqlite3 stand-in)
+        cursors: Cursor dict from a TradeStatisticsBook (updated in place)
+        batch_size: Rows fetched per round trip
+    """
+    cursor_key = 'db:ManagedPosition'
+    watermark = cursors.get(cursor_key) if cursors is not None else None
+
+    query = ('SELECT "id", "symbol", "strategy", "realizedPnL", "exitTime" FROM "ManagedPosition" '
+             'WHERE "status" = \'closed\' AND "realizedPnL" IS NOT NULL')
+    params: Tuple = ()
+    seen_time, seen_ids, ids = None, set(), []
+    if isinstance(watermark, dict):
+        seen_time, ids = watermark['exit_time'], list(watermark['ids'])
+        seen_ids = set(ids)
+        cursors[cursor_key] = {'exit_time': seen_time, 'ids': ids}
+        query += ' AND "exitTime" >= ?'
+        params = (seen_time,)
+    elif watermark is not None:
+        # Legacy exclusive watermark from state files written before ids were tracked
+        query += ' AND "exitTime" > ?'
+        params = (watermark,)
+    query += ' ORDER BY "exitTime", "id"'
+
+    db_cursor = connection.cursor()
+    db_cursor.execute(query, params)
+    while True:
+        rows = db_cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        for row_id, symbol, strategy, pnl, exit_time in rows:
+            if exit_time == seen_time and row_id in seen_ids:
+                continue
+            if exit_time != seen_time:
+                seen_time, seen_ids, ids = exit_time, set(), []
+                if cursors is not None:
+                    # The cursor shares this list, so further ids at this exitTime cost one append
+                    cursors[cursor_key] = {'exit_time': seen_time, 'ids': ids}
+            ids.append(row_id)
+            yield {'symbol': symbol, 'strategy': strategy, 'realizedPnL': pnl}
+
+
+def default_state_path(source: str) -> str:
+    """Snapshot path next to a trade source (URL scheme such as sqlite:/// stripped)"""
+    return source.replace('sqlite:///', '', 1) + '.stats.json'
+
+
+def load_trade_statistics(source: str, state_path: Optional[str] = None,
+                          default_commission: float = DEFAULT_COMMISSION) -> TradeStatisticsBook:
+    """
+    Build (or incrementally refresh) a statistics book from a trade source
+
+    Args:
+        source: .jsonl/.csv trade log, or a SQLite database (.db/.sqlite or sqlite:///path)
+        state_path: Optional JSON snapshot; when present only new trades are read
+        default_commission: Commission assumed when a record carries none
+
+    Returns:
+        TradeStatisticsBook with per-(pair, strategy) aggregates
+    """
+    if state_path and os.path.exists(state_path):
+        book = TradeStatisticsBook.load(state_path)
+    else:
+        book = TradeStatisticsBook(default_commission=default_commission)
+
+    if source.startswith('sqlite:///') or source.endswith(('.db', '.sqlite', '.sqlite3')):
+        connection = sqlite3.connect(source.replace('sqlite:///', '', 1))
+        try:
+            book.ingest(iter_db_trades(connection, book.cursors))
+        finally:
+            connection.close()
+    elif source.endswith('.csv'):
+        book.ingest(iter_csv_trades(source, book.cursors))
+    else:
+        book.ingest(iter_jsonl_trades(source, book.cursors))
+
+    if state_path:
+        book.save(state_path)
+    return book
+
+
+def load_live_statistics(source: str, state_path: Optional[str] = None,
+                         default_commission: float = DEFAULT_COMMISSION) -> TradeStatisticsBook:
+    """load_trade_statistics with the snapshot kept at default_state_path(source)"""
+    return load_trade_statistics(source, state_path or default_state_path(source), default_commission)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: trade_statistics.py <trades.jsonl|trades.csv|trades.db> [state.json]")
+        sys.exit(1)
+
+    book = load_trade_statistics(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+
+    print("SignalCartel Trade Statistics")
+    print("=" * 50)
+    for (pair, strategy), stats in sorted(book.stats.items()):
+        print(f"{pair:10} {strategy:30}: {stats.count:7d} trades, mean ${stats.mean:+.4f}, "
+              f"std ${stats.std:.4f}, win {stats.win_rate:.1%}, drag {stats.commission_drag:.1%}")
+    total = book.total()
+    print(f"\nTotal: {total.count} trades, mean ${total.mean:+.4f}, win rate {total.win_rate:.1%}")
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Vectorized Backtest Engine for SignalCartel
+Turns (symbols x length) prices plus position/signal arrays, or threshold rules over
+GPUIndicators output (RSI, Bollinger Bands, MACD), into trades, net PnL, equity and drawdowns
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+DEFAULT_POSITION_SIZE = 60.0  # $60 position, as in the proof scripts
+DEFAULT_COMMISSION = 0.25     # ~$0.25 per round trip
+
+
+def forward_fill_events(events: np.ndarray, initial: float = 0.0) -> np.ndarray:
+    """Carry the last non-NaN event value forward along each row"""
+    events = np.asarray(events, dtype=np.float64)
+    rows, length = events.shape
+    has_event = ~np.isnan(events)
+    last_idx = np.where(has_event, np.arange(length), -1)
+    np.maximum.accumulate(last_idx, axis=1, out=last_idx)
+    filled = np.take_along_axis(events, np.maximum(last_idx, 0), axis=1)
+    filled[last_idx < 0] = initial
+    return filled
+
+
+def positions_from_signals(entries: np.ndarray, exits: np.ndarray,
+                           short_entries: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Build -1/0/+1 position arrays from boolean entry/exit events
+
+    An event sets the position from that bar on and it is held until the next event.
+    Exits flatten any position and take precedence over entries on the same bar.
+    """
+    events = np.full(entries.shape, np.nan)
+    events[entries] = 1.0
+    if short_entries is not None:
+        events[short_entries] = -1.0
+    events[exits] = 0.0
+    return forward_fill_events(events).astype(np.int8)
+
+
+def crossed_below(series: np.ndarray, level) -> np.ndarray:
+    """True on bars where series moves from >= level to < level"""
+    level = np.broadcast_to(level, series.shape)
+    out = np.zeros(series.shape, dtype=bool)
+    out[:, 1:] = (series[:, 1:] < level[:, 1:]) & (series[:, :-1] >= level[:, :-1])
+    return out
+
+
+def crossed_above(series: np.ndarray, level) -> np.ndarray:
+    """True on bars where series moves from <= level to > level"""
+    level = np.broadcast_to(level, series.shape)
+    out = np.zeros(series.shape, dtype=bool)
+    out[:, 1:] = (series[:, 1:] > level[:, 1:]) & (series[:, :-1] <= level[:, :-1])
+    return out
+
+
+def rsi_threshold_positions(rsi: np.ndarray, oversold: float = 30, overbought: float = 70,
+                            allow_short: bool = False) -> np.ndarray:
+    """Long on a cross below oversold, flat (or short) on a cross above overbought"""
+    entries = crossed_below(rsi, oversold)
+    exits = crossed_above(rsi, overbought)
+    if allow_short:
+        return positions_from_signals(entries, np.zeros_like(entries), short_entries=exits)
+    return positions_from_signals(entries, exits)
+
+
+def bollinger_positions(prices: np.ndarray, upper: np.ndarray, middle: np.ndarray,
+                        lower: np.ndarray) -> np.ndarray:
+    """Long on a close below the lower band, exit on a cross back above the middle band or a close above the upper band"""
+    entries = crossed_below(prices, lower)
+    exits = crossed_above(prices, middle) | (prices > upper)
+    return positions_from_signals(entries, exits)
+
+
+def macd_positions(histogram: np.ndarray, allow_short: bool = False) -> np.ndarray:
+    """Long when the MACD histogram turns positive, flat (or short) when it turns negative"""
+    entries = crossed_above(histogram, 0.0)
+    exits = crossed_below(histogram, 0.0)
+    if allow_short:
+        return positions_from_signals(entries, np.zeros_like(entries), short_entries=exits)
+    return positions_from_signals(entries, exits)
+
+
+class BacktestResult:
+    """
+    Flat trade arrays plus per-row equity/drawdown curves
+
+    pnl is net of costs for closed trades and the mark-to-market gross for trades still
+    open on the last bar, so final equity = initial capital + realized + unrealized PnL.
+    """
+
+    def __init__(self, trade_row, entry_bar, exit_bar, direction, entry_price, exit_price,
+                 pnl, is_open, equity, drawdown, n_rows):
+        self.trade_row = trade_row
+        self.entry_bar = entry_bar
+        self.exit_bar = exit_bar
+        self.direction = direction
+        self.entry_price = entry_price
+        self.exit_price = exit_price
+        self.pnl = pnl
+        self.is_open = is_open
+        self.holding_period = exit_bar - entry_bar
+        self.equity = equity
+        self.drawdown = drawdown
+        self.n_rows = n_rows
+
+    def summary(self) -> Dict[str, np.ndarray]:
+        """
+        Per-row trade statistics (row = symbol or strategy x pair combination)
+
+        Trade counts and PnL statistics cover closed trades only; open positions are
+        reported separately as open_trades and unrealized_pnl.
+        """
+        n = self.n_rows
+        closed = ~self.is_open
+        rows = self.trade_row[closed]
+        pnl = self.pnl[closed]
+        counts = np.bincount(rows, minlength=n)
+        wins = np.bincount(rows, weights=pnl > 0, minlength=n)
+        total = np.bincount(rows, weights=pnl, minlength=n)
+        squares = np.bincount(rows, weights=pnl * pnl, minlength=n)
+        holding = np.bincount(rows, weights=self.holding_period[closed], minlength=n)
+
+        safe_counts = np.maximum(counts, 1)
+        mean = total / safe_counts
+        std = np.sqrt(np.maximum(squares / safe_counts - mean * mean, 0.0))
+        return {
+            'trades': counts,
+            'win_rate': wins / safe_counts,
+            'total_pnl': total,
+            'mean_pnl': mean,
+            'std_pnl': std,
+            'sharpe_ratio': np.divide(mean, std, out=np.zeros_like(mean), where=std > 0),
+            'avg_holding_period': holding / safe_counts,
+            'open_trades': np.bincount(self.trade_row[self.is_open], minlength=n),
+            'unrealized_pnl': np.bincount(self.trade_row[self.is_open], weights=self.pnl[self.is_open], minlength=n),
+            'max_drawdown': self.drawdown.min(axis=1),
+            'final_equity': self.equity[:, -1]
+        }
+
+
+def run_backtest(prices: np.ndarray, positions: np.ndarray,
+                 position_size: float = DEFAULT_POSITION_SIZE,
+                 commission: float = DEFAULT_COMMISSION,
+                 fee_rate: float = 0.0, slippage: float = 0.0,
+                 initial_capital: float = 0.0) -> BacktestResult:
+    """
+    Backtest fixed-notional positions over a batch of price series
+
+    Args:
+        prices: (rows x length) close prices; broadcast against positions, so one price
+            matrix can serve many strategy variants
+        positions: (rows x length) -1/0/+1 target position decided at each bar's close
+        position_size: Dollar notional per trade
+        commission: Fixed dollar commission per round trip
+        fee_rate: Proportional fee per side (fraction of notional)
+        slippage: Adverse price move per side (fraction of price)
+        initial_capital: Starting equity for the equity curve
+
+    Returns:
+        BacktestResult with per-trade arrays, equity curves and drawdowns
+    """
+    prices, positions = np.broadcast_arrays(np.asarray(prices, dtype=np.float64), np.asarray(positions))
+    length = prices.shape[-1]
+    prices = prices.reshape(-1, length)
+    positions = np.sign(positions.reshape(-1, length)).astype(np.int8)
+    n_rows = prices.shape[0]
+
+    # Runs of constant non-zero position are trades
+    padded = np.zeros((n_rows, length + 2), dtype=np.int8)
+    padded[:, 1:-1] = positions
+    changes = padded[:, 1:] != padded[:, :-1]
+    start_rows, start_bars = np.nonzero(changes[:, :-1] & (positions != 0))
+    _, end_bars = np.nonzero(changes[:, 1:] & (positions != 0))
+
+    direction = positions[start_rows, start_bars].astype(np.float64)
+    exit_bars = np.minimum(end_bars + 1, length - 1)
+    is_open = end_bars == length - 1
+    entry_price = prices[start_rows, start_bars]
+    exit_price = prices[start_rows, exit_bars]
+
+    entry_fill = entry_price * (1 + direction * slippage)
+    exit_fill = exit_price * (1 - direction * slippage)
+    gross = position_size * direction * (exit_price / entry_price - 1)
+    pnl = (position_size * direction * (exit_fill / entry_fill - 1)
+           - commission - 2 * fee_rate * position_size)
+    # Trades still open on the last bar are marked to market, the same value the equity
+    # curve holds: costs are booked only once a trade closes
+    pnl[is_open] = gross[is_open]
+
+    # Bar-level PnL: quantity fixed at entry, costs booked on the exit bar
+    entry_marker = np.full((n_rows, length), -1, dtype=np.int64)
+    entry_marker[start_rows, start_bars] = start_bars
+    np.maximum.accumulate(entry_marker, axis=1, out=entry_marker)
+    entry_ff = np.take_along_axis(prices, np.maximum(entry_marker, 0), axis=1)
+    quantity = np.where(positions != 0, position_size / entry_ff, 0.0) * positions
+
+    bar_pnl = np.zeros((n_rows, length))
+    bar_pnl[:, 1:] = quantity[:, :-1] * np.diff(prices, axis=1)
+    closed = ~is_open
+    np.add.at(bar_pnl, (start_rows[closed], exit_bars[closed]), (pnl - gross)[closed])
+
+    equity = initial_capital + np.cumsum(bar_pnl, axis=1)
+    peak = np.maximum.accumulate(np.maximum(equity, initial_capital), axis=1)
+    drawdown = equity - peak
+
+    return BacktestResult(start_rows, start_bars, exit_bars, direction.astype(np.int8),
+                          entry_price, exit_price, pnl, is_open, equity, drawdown, n_rows)
+
+
+if __name__ == "__main__":
+    import time
+
+    print("SignalCartel Vectorized Backtest Benchmark")
+    print("=" * 50)
+
+    rng = np.random.default_rng(42)
+    n_rows, length = 2000, 1000
+    returns = rng.normal(0, 0.02, (n_rows, length))
+    prices = 100 * np.cumprod(1 + returns, axis=1)
+
+    # Simple momentum stand-in for indicator rules: long when above the 20-bar mean
+    kernel = np.ones(20) / 20
+    sma = np.array([np.convolve(row, kernel, mode='full')[:length] for row in prices])
+    sma[:, :19] = np.nan
+    positions = positions_from_signals(crossed_above(prices, sma), crossed_below(prices, sma))
+
+    start_time = time.perf_counter()
+    result = run_backtest(prices, positions)
+    elapsed = time.perf_counter() - start_time
+    summary = result.summary()
+
+    print(f"Backtested {n_rows} combinations x {length} bars in {elapsed:.3f}s "
+          f"({n_rows / elapsed:.0f} combinations/second)")
+    print(f"Trades: {summary['trades'].sum()}, mean win rate {summary['win_rate'].mean():.1%}, "
+          f"mean PnL/closed trade ${result.pnl[~result.is_open].mean():+.4f}, "
+          f"{summary['open_trades'].sum()} open")
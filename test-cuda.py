@@ -1,100 +1,86 @@
 #!/usr/bin/env python3
 """
 Test CUDA installation and GPU capabilities for SignalCartel
+Probes the available indicator backends (NumPy, threaded NumPy, Numba, CuPy) without
+requiring any of the optional ones, then autotunes and saves the backend profile
 """
-import torch
-import cupy as cp
-import numpy as np
+import os
+import sys
 import time
 
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'lib'))
+from backend_autotuner import autotune, available_backends, probe_hardware
+
 def test_pytorch_cuda():
     print("=== PyTorch CUDA Test ===")
+    try:
+        import torch  # imported only when this probe runs
+    except ImportError:
+        print("PyTorch not installed (optional)")
+        return False
     print(f"PyTorch version: {torch.__version__}")
     print(f"CUDA available: {torch.cuda.is_available()}")
-    
+
     if torch.cuda.is_available():
         print(f"CUDA version: {torch.version.cuda}")
         print(f"cuDNN version: {torch.backends.cudnn.version()}")
         print(f"Device count: {torch.cuda.device_count()}")
         print(f"Device name: {torch.cuda.get_device_name(0)}")
         print(f"Device memory: {torch.cuda.get_device_properties(0).total_memory / 1024**3:.1f} GB")
-        
+
         # Simple tensor test
         x = torch.randn(1000, 1000).cuda()
         y = torch.randn(1000, 1000).cuda()
-        start = time.time()
-        z = torch.matmul(x, y)
+        torch.matmul(x, y)
         torch.cuda.synchronize()
-        gpu_time = time.time() - start
+        start = time.perf_counter()
+        torch.matmul(x, y)
+        torch.cuda.synchronize()
+        gpu_time = time.perf_counter() - start
         print(f"GPU matrix multiplication (1000x1000): {gpu_time:.4f}s")
-        
+
         return True
     else:
         print("CUDA not available for PyTorch")
         return False
 
-def test_cupy():
-    print("\n=== CuPy Test ===")
-    print(f"CuPy version: {cp.__version__}")
-    
-    try:
-        # Simple array test
-        x_gpu = cp.random.randn(1000, 1000, dtype=cp.float32)
-        y_gpu = cp.random.randn(1000, 1000, dtype=cp.float32)
-        
-        start = time.time()
-        z_gpu = cp.dot(x_gpu, y_gpu)
-        cp.cuda.Stream.null.synchronize()
-        gpu_time = time.time() - start
-        
-        print(f"CuPy matrix multiplication (1000x1000): {gpu_time:.4f}s")
-        print(f"GPU memory info: {cp.cuda.MemoryPool().used_bytes() / 1024**2:.1f} MB used")
-        
-        return True
-    except Exception as e:
-        print(f"CuPy test failed: {e}")
-        return False
+def test_hardware():
+    print("\n=== Hardware Probe ===")
+    for key, value in probe_hardware().items():
+        print(f"{key}: {value}")
+    backends = available_backends()
+    print(f"Indicator backends: {', '.join(backends)}")
+    return backends
+
+def test_backend_autotune():
+    print("\n=== Indicator Backend Autotune ===")
+    profile = autotune(verbose=True)
+    profile.save()
 
-def test_performance_comparison():
-    print("\n=== Performance Comparison ===")
-    size = 2000
-    
-    # CPU test with NumPy
-    x_cpu = np.random.randn(size, size).astype(np.float32)
-    y_cpu = np.random.randn(size, size).astype(np.float32)
-    
-    start = time.time()
-    z_cpu = np.dot(x_cpu, y_cpu)
-    cpu_time = time.time() - start
-    print(f"CPU (NumPy) time ({size}x{size}): {cpu_time:.4f}s")
-    
-    # GPU test with CuPy
-    x_gpu = cp.asarray(x_cpu)
-    y_gpu = cp.asarray(y_cpu)
-    
-    start = time.time()
-    z_gpu = cp.dot(x_gpu, y_gpu)
-    cp.cuda.Stream.null.synchronize()
-    gpu_time = time.time() - start
-    print(f"GPU (CuPy) time ({size}x{size}): {gpu_time:.4f}s")
-    
-    speedup = cpu_time / gpu_time if gpu_time > 0 else 0
-    print(f"Speedup: {speedup:.2f}x")
-    
-    return speedup
+    # Speedup of the best backend over plain NumPy at the largest measured shape
+    speedups = []
+    for kernel, measurements in profile.results.items():
+        largest = max(measurements, key=lambda m: m['batch_size'] * m['length'])
+        timings = largest['timings']
+        speedups.append(timings['numpy'] / timings[largest['best']])
+        print(f"{kernel}: {largest['best']} wins at {largest['batch_size']}x{largest['length']} "
+              f"({speedups[-1]:.2f}x vs NumPy)")
+    return float(np.mean(speedups))
 
 if __name__ == "__main__":
     print("SignalCartel CUDA Installation Test")
     print("=" * 50)
-    
-    pytorch_ok = test_pytorch_cuda()
-    cupy_ok = test_cupy()
-    
-    if pytorch_ok and cupy_ok:
-        speedup = test_performance_comparison()
+
+    test_pytorch_cuda()  # Optional, informational only
+    backends = test_hardware()
+    speedup = test_backend_autotune()
+
+    if 'cupy' in backends:
         print(f"\n✅ CUDA setup successful!")
         print(f"🚀 Ready for GPU-accelerated trading strategies")
-        print(f"📈 Expected performance boost: {speedup:.1f}x for large computations")
     else:
-        print(f"\n❌ CUDA setup incomplete")
-        print(f"🔧 Check NVIDIA driver and CUDA installation")
\ No newline at end of file
+        print(f"\n⚠️ No CUDA backend available - indicators run on {', '.join(backends)}")
+        print(f"🔧 Install CuPy and check NVIDIA driver/CUDA for GPU acceleration")
+    print(f"📈 Expected performance boost from tuned dispatch: {speedup:.1f}x for large computations")
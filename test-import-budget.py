@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Cold-start budget for the SignalCartel indicator entry point
+Imports gpu_accelerated_indicators in a fresh interpreter and checks wall time, resident
+memory, and that no heavy optional backend (CuPy, Numba, torch, SciPy, ...) came along with it
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+LIB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'lib')
+
+# Modules that must only load on first use
+LAZY_MODULES = ('cupy', 'numba', 'torch', 'scipy', 'matplotlib', 'pyarrow', 'urllib.request')
+
+PROBE = r'''
+import json, resource, sys, time
+sys.path.insert(0, sys.argv[1])
+baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+import gpu_accelerated_indicators
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    'import_ms': elapsed * 1000,
+    'rss_mb': rss / 1024,
+    'import_rss_mb': (rss - baseline_rss) / 1024,
+    'loaded': [name for name in sys.argv[2:] if name in sys.modules]
+}))
+'''
+
+
+def measure(runs: int):
+    """Best-of-N cold import in fresh interpreters (first run also warms the bytecode cache)"""
+    samples = []
+    for _ in range(runs + 1):
+        output = subprocess.run([sys.executable, '-c', PROBE, LIB_DIR, *LAZY_MODULES],
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    samples = samples[1:]
+    best = min(samples, key=lambda sample: sample['import_ms'])
+    best['rss_mb'] = max(sample['rss_mb'] for sample in samples)
+    best['loaded'] = sorted({name for sample in samples for name in sample['loaded']})
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the indicator import-time budget")
+    parser.add_argument('--max-import-ms', type=float,
+                        default=float(os.environ.get('SIGNALCARTEL_IMPORT_BUDGET_MS', 400)))
+    parser.add_argument('--max-rss-mb', type=float,
+                        default=float(os.environ.get('SIGNALCARTEL_IMPORT_BUDGET_MB', 80)))
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    print("=== Indicator Import Budget ===")
+    result = measure(args.runs)
+    print(f"Cold import: {result['import_ms']:.1f} ms (budget {args.max_import_ms:.0f} ms)")
+    print(f"Resident memory: {result['rss_mb']:.1f} MB, {result['import_rss_mb']:.1f} MB from the import "
+          f"(budget {args.max_rss_mb:.0f} MB)")
+
+    failures = []
+    if result['import_ms'] > args.max_import_ms:
+        failures.append(f"import took {result['import_ms']:.1f} ms")
+    if result['rss_mb'] > args.max_rss_mb:
+        failures.append(f"resident memory {result['rss_mb']:.1f} MB")
+    if result['loaded']:
+        failures.append(f"eagerly imported {', '.join(result['loaded'])}")
+
+    if failures:
+        print("❌ Over budget: " + "; ".join(failures))
+        sys.exit(1)
+    print("✅ Within budget, no optional backends loaded")
+
+
+if __name__ == "__main__":
+    main()